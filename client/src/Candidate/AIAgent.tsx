@@ -41,6 +41,16 @@ interface SSEEvent {
   current_step?: string;
   message: string;
   matched_count?: number;
+  // Present on "job_scored" events emitted while jobs are being matched
+  job_id?: string;
+  title?: string;
+  score?: number | null;
+  reasons?: string[];
+  passed?: boolean;
+  scored?: number;
+  total?: number;
+  matched?: number;
+  eta_seconds?: number;
 }
 
 // Configuration for the streaming endpoint
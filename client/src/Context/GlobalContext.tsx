@@ -5,6 +5,7 @@ import type {
   CompanyApplicationInterface,
   ContractApplication,
   ContractJob,
+  IndexedApplication,
   Job,
   User,
 } from "@/types";
@@ -55,6 +56,7 @@ import { JobStatus, JobType, LocationType } from "@/lib/utils";
 // ];
 
 const CONTRACT_ADDRESS = "0x519a9057Bfe3e6bab6EDb7128b7Dba44d2adC083";
+const API_BASE_URL = import.meta.env.VITE_API_URL || "http://localhost:8000";
 
 export function GlobalContextProvider({ children }: { children: ReactNode }) {
   const [_, setUser] = useState<User | null>(null);
@@ -278,22 +280,27 @@ export function GlobalContextProvider({ children }: { children: ReactNode }) {
     if (!user) return;
     (async function () {
       try {
-        const applications = await jobPublicClient.readContract({
-          address: CONTRACT_ADDRESS as Hex,
-          abi: contractAbi,
-          functionName: "getAllApplications",
-          args: [],
-        });
-
-        console.log("Fetched applications:", applications);
-
-        const filteredApplications = (
-          applications as ContractApplication[]
-        ).filter(
-          (app) =>
-            // @ts-ignore
-            app.candidateId == user.google?.email || app.candidateId == user.id
-        ); // only applications for this candidate
+        // Served by the backend from its indexed contract mirror, so only this
+        // candidate's applications are transferred
+        const candidateIds = [
+          // @ts-ignore
+          ...new Set([user.google?.email, user.id].filter(Boolean)),
+        ] as string[];
+        const responses = await Promise.all(
+          candidateIds.map(async (candidateId) => {
+            const response = await fetch(
+              `${API_BASE_URL}/candidate/${encodeURIComponent(candidateId)}/applications`
+            );
+            if (!response.ok) {
+              throw new Error(`Failed to fetch applications: ${response.status}`);
+            }
+            const data = await response.json();
+            return data.applications as IndexedApplication[];
+          })
+        );
+        const filteredApplications = responses.flat();
+
+        console.log("Fetched applications:", filteredApplications);
 
         // fetched application : {
         //     "applicationId": "1",
@@ -305,7 +312,7 @@ export function GlobalContextProvider({ children }: { children: ReactNode }) {
 
         const detailedApplications: Application[] = [];
 
-        for (const app of filteredApplications as ContractApplication[]) {
+        for (const app of filteredApplications) {
           const jobData = await jobPublicClient.readContract({
             address: CONTRACT_ADDRESS as Hex,
             abi: contractAbi,
@@ -320,13 +327,6 @@ export function GlobalContextProvider({ children }: { children: ReactNode }) {
             args: [app.candidateId],
           });
 
-          const applicationStatusMap: Record<number, Application["status"]> = {
-            0: "pending",
-            1: "reviewed",
-            2: "accepted",
-            3: "rejected",
-          };
-
           const parsedJob: Job = {
             id: (jobData as ContractJob).jobId,
             companyId: (jobData as ContractJob).companyId,
@@ -364,7 +364,7 @@ export function GlobalContextProvider({ children }: { children: ReactNode }) {
             candidateId: app.candidateId,
             jobId: app.jobId,
 
-            status: applicationStatusMap[app.status],
+            status: app.status.toLowerCase() as Application["status"],
             appliedAt: app.applicationDate,
           };
 
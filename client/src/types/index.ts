@@ -131,6 +131,15 @@ export interface ContractApplication {
   status: number; // enum index
 }
 
+// Application as served by the backend's indexed contract mirror
+export interface IndexedApplication {
+  applicationId: string;
+  jobId: string;
+  candidateId: string;
+  applicationDate: string;
+  status: "PENDING" | "REVIEWED" | "ACCEPTED" | "REJECTED";
+}
+
 export interface CompanyApplicationInterface {
   id: string;
   jobId: string;
@@ -1,16 +1,111 @@
+import os
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
 from langchain_community.document_loaders import PyMuPDFLoader
 from langchain_core.tools import tool
+from pydantic import BaseModel
+
+# "thread" or "process" pool used for direct extraction
+PDF_EXTRACT_EXECUTOR = os.getenv("PDF_EXTRACT_EXECUTOR", "thread")
+PDF_EXTRACT_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", "2"))
+
+_executor: Optional[Executor] = None
+
+
+class PDFPage(BaseModel):
+    page_number: int
+    text: str
+    char_count: int
+    metadata: Dict[str, Any]
+
+class ExtractedPDF(BaseModel):
+    file_path: str
+    text: str
+    total_pages: int
+    pages: List[PDFPage]
+
+
+def iter_pdf_pages(file_path: str) -> Iterator[PDFPage]:
+    """Yield pages one at a time as the parser reads them"""
+    loader = PyMuPDFLoader(file_path)
+    for index, document in enumerate(loader.lazy_load()):
+        yield PDFPage(
+            page_number=document.metadata.get("page", index) + 1,
+            text=document.page_content,
+            char_count=len(document.page_content),
+            metadata=document.metadata
+        )
+
+def extract_pdf(file_path: str) -> ExtractedPDF:
+    """Extract text and page-level metadata from a PDF file"""
+    pages = list(iter_pdf_pages(file_path))
+    return ExtractedPDF(
+        file_path=file_path,
+        text="\n".join(page.text for page in pages),
+        total_pages=len(pages),
+        pages=pages
+    )
+
+def _get_executor() -> Executor:
+    global _executor
+    if _executor is None:
+        if PDF_EXTRACT_EXECUTOR == "process":
+            _executor = ProcessPoolExecutor(max_workers=PDF_EXTRACT_WORKERS)
+        else:
+            _executor = ThreadPoolExecutor(max_workers=PDF_EXTRACT_WORKERS, thread_name_prefix="pdf-extract")
+    return _executor
+
+async def stream_pdf_pages(file_path: str) -> AsyncIterator[PDFPage]:
+    """Yield pages as the shared pool parses them, without blocking the event loop
+
+    With the thread pool each page is parsed by its own pool task. A generator
+    cannot be sent to another process, so the process pool parses the whole file
+    in one task and its pages are yielded afterwards.
+    """
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    if isinstance(executor, ProcessPoolExecutor):
+        extracted = await loop.run_in_executor(executor, extract_pdf, file_path)
+        for page in extracted.pages:
+            yield page
+        return
+
+    pages = iter_pdf_pages(file_path)
+    try:
+        while True:
+            page = await loop.run_in_executor(executor, next, pages, None)
+            if page is None:
+                break
+            yield page
+    finally:
+        pages.close()
+
+async def extract_pdf_async(file_path: str) -> ExtractedPDF:
+    """Collect stream_pdf_pages into an ExtractedPDF"""
+    pages = [page async for page in stream_pdf_pages(file_path)]
+    return ExtractedPDF(
+        file_path=file_path,
+        text="\n".join(page.text for page in pages),
+        total_pages=len(pages),
+        pages=pages
+    )
+
+def shutdown_executor():
+    """Stop the shared pool; called when the app shuts down"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+        _executor = None
 
 @tool
 def load_pdf(file_path: str) -> str:
     """Load and extract text from a PDF file.
-    
+
     Args:
         file_path: Path to the PDF file to load
-        
+
     Returns:
         Extracted text content from the PDF
     """
-    loader = PyMuPDFLoader(file_path)
-    documents = loader.load()
-    return "\n".join([doc.page_content for doc in documents])
\ No newline at end of file
+    return extract_pdf(file_path).text
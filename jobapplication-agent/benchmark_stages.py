@@ -0,0 +1,475 @@
+"""Latency, allocations and call counts of each job search stage as the job count grows.
+
+For every job count, deploys TalentAIApplications and Multicall3 to a fresh dev chain
+(see dev_chain.py), seeds that many jobs, syncs a local contract store, and then runs
+the LangGraph nodes in order (load_profile, fetch_jobs, match_jobs,
+generate_applications, apply_jobs) against a deterministic fake chat model. It also
+runs the ContractClient reads with cold caches against both the store and the chain:
+
+    python benchmark_stages.py --jobs 10 100 1000 10000
+    python benchmark_stages.py --jobs 10 100 --save-baseline
+    python benchmark_stages.py --jobs 10 100 --compare
+
+Where the solc download host is unreachable, set DEV_CHAIN_SOLC_BINARY to a local solc.
+
+Each stage runs ``--repeat`` times for latency (median and first, cold run) and once
+more under tracemalloc for allocations. Calls are counted per stage: LLM requests,
+RPC round trips (``_call``), contract views and every public ContractClient method.
+``--compare`` reports stages that are slower, allocate more or make more calls than
+the baseline file, and exits with status 1 when any do.
+
+Seeding posts jobs in Multicall3 batches, but 10k jobs on eth-tester still take a few
+minutes. The match cache is turned off, and the nodes' print output goes to /dev/null.
+"""
+import os
+import re
+import sys
+import json
+import time
+import random
+import asyncio
+import hashlib
+import argparse
+import logging
+import platform
+import functools
+import statistics
+import contextlib
+import tracemalloc
+from collections import Counter
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from eth_account import Account
+from langchain_core.messages import AIMessage
+import dev_chain
+import main
+from main import JobSearchState
+from contract_factory import ContractClient, RECEIPT_TIMEOUT
+from contract_indexer import ContractIndexer, ContractStore
+from llm_scheduler import LLMScheduler, _message_text
+from prompt_budget import count_tokens, tokenizer_name
+from tx_submitter import TransactionSubmitter
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_stages_baseline.json")
+
+STAGES = [
+    ("load_profile", main.load_candidate_profile),
+    ("fetch_jobs", main.fetch_jobs),
+    ("match_jobs", main.match_jobs),
+    ("generate_applications", main.generate_applications),
+    ("apply_jobs", main.apply_to_jobs_node),
+]
+
+CLIENT_METHODS = [
+    "_call", "_view", "batch_view", "query_jobs", "get_all_jobs", "get_candidate", "get_all_candidates",
+    "get_applications_for_candidate", "get_applications_for_job", "count_by_status",
+    "get_candidates", "get_jobs", "get_companies", "submit_application", "submit_applications",
+]
+SUBMITTER_METHODS = ["submit_application", "submit_batch", "wait_all"]
+
+SKILLS = [
+    "Python", "FastAPI", "Django", "Flask", "SQL", "PostgreSQL", "Redis", "Kafka", "Docker", "Kubernetes",
+    "AWS", "GCP", "Azure", "Terraform", "React", "TypeScript", "Node.js", "GraphQL", "Solidity", "Rust",
+    "Go", "Java", "Spring", "Scala", "Spark", "Airflow", "Pandas", "PyTorch", "TensorFlow", "Machine Learning",
+    "NLP", "Computer Vision", "LLM", "MLOps", "CI/CD", "Linux", "Security", "Web3", "Ethereum", "Swift",
+]
+CANDIDATE_SKILLS = ["Python", "FastAPI", "SQL", "Docker", "AWS", "Machine Learning"]
+RESUME = """Summary
+Backend engineer with six years of experience building Python services and data pipelines.
+
+Experience
+Senior Engineer, Example Corp: designed FastAPI services on AWS, moved batch jobs to Docker and
+Kubernetes, and cut query latency with SQL tuning and Redis caching.
+Engineer, Sample Labs: trained and deployed machine learning models for ranking.
+
+Education
+BS Computer Science
+
+Skills
+Python, FastAPI, SQL, Docker, AWS, Machine Learning
+"""
+
+# Differences from the baseline below these are treated as noise whatever the tolerance
+SECONDS_FLOOR = 0.005
+ALLOC_FLOOR_KIB = 64.0
+
+
+class CallCounter:
+    """Counts and times calls to selected async methods of objects, by name"""
+
+    def __init__(self):
+        self.counts: Counter = Counter()
+        self.seconds: Counter = Counter()
+
+    def instrument(self, obj: Any, names: List[str], prefix: str = ""):
+        for name in names:
+            original = getattr(obj, name, None)
+            if original is not None:
+                setattr(obj, name, self._wrap(prefix + name, original))
+
+    def _wrap(self, name: str, method: Callable[..., Awaitable[Any]]):
+        @functools.wraps(method)
+        async def counted(*args, **kwargs):
+            self.counts[name] += 1
+            started = time.perf_counter()
+            try:
+                return await method(*args, **kwargs)
+            finally:
+                self.seconds[name] += time.perf_counter() - started
+        return counted
+
+    def snapshot(self) -> Counter:
+        return Counter(self.counts)
+
+
+class FakeChatModel:
+    """Deterministic stand-in for the chat model: scores derive from a hash of each job"""
+
+    _JOB_ID_RE = re.compile(r"\[jobId: ([^\]]+)\]")
+    _TITLE_RE = re.compile(r"- Title: (.*)")
+
+    def __init__(self, counter: CallCounter, latency: float = 0.0):
+        self.counter = counter
+        self.latency = latency
+
+    @staticmethod
+    def _evaluation(key: str) -> Dict[str, Any]:
+        digest = hashlib.sha256(key.encode()).digest()
+        return {
+            "score": round(digest[0] / 255, 2),
+            "reasons": [f"Skills overlap with {key}"],
+            "improvements": ["Add measurable outcomes"],
+        }
+
+    async def ainvoke(self, messages: Any, **kwargs) -> AIMessage:
+        self.counter.counts["llm"] += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        prompt = _message_text(messages)
+        job_ids = self._JOB_ID_RE.findall(prompt)
+        if job_ids:
+            content = json.dumps({"evaluations": [{"jobId": job_id, **self._evaluation(job_id)} for job_id in job_ids]})
+        else:
+            titles = self._TITLE_RE.findall(prompt)
+            content = json.dumps(self._evaluation(titles[0].strip() if titles else prompt))
+        input_tokens, output_tokens = count_tokens(prompt), count_tokens(content)
+        self.counter.counts["llm_input_tokens"] += input_tokens
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": input_tokens,
+                "output_tokens": output_tokens,
+                "total_tokens": input_tokens + output_tokens,
+            }
+        )
+
+
+async def seed_jobs(w3, client: ContractClient, count: int, batch_size: int = 40) -> List[str]:
+    """Post ``count`` jobs with varied skills in Multicall3 aggregate3 transactions"""
+    sender = {"from": (await w3.eth.accounts)[0]}
+    for company in ("company0", "company1"):
+        await client.contract.functions.registerCompany(
+            company, "", company, [f"hr@{company}.dev"], "Benchmark company", [], "80"
+        ).transact(sender)
+
+    job_ids = []
+    for start in range(0, count, batch_size):
+        calls = []
+        for i in range(start, min(start + batch_size, count)):
+            rng = random.Random(i)
+            skills = rng.sample(SKILLS, 4)
+            job_id = f"job{i:05d}"
+            data = client.contract.functions.postJob(
+                job_id, f"company{i % 2}", f"{skills[0]} Engineer {i}",
+                f"Build and run services with {', '.join(skills)}. Work closely with product and data teams. "
+                f"Own features end to end, from design reviews to on-call.",
+                skills[:2], skills, i % 3, ["90000", "120000"], i % 5
+            )._encode_transaction_data()
+            calls.append((client.contract.address, False, data))
+            job_ids.append(job_id)
+        await client.multicall.functions.aggregate3(calls).transact(sender)
+    return job_ids
+
+
+async def register_candidates(w3, client: ContractClient, count: int) -> List[str]:
+    """Candidates with the same profile, one per benchmark pass (applications must be unique)"""
+    sender = {"from": (await w3.eth.accounts)[0]}
+    candidate_ids = []
+    for i in range(count):
+        candidate_id = f"bench{i}"
+        await client.contract.functions.registerCandidate(
+            candidate_id, f"Benchmark Candidate {i}", ["Backend engineer"], [f"{candidate_id}@example.com"],
+            ["BS Computer Science"], CANDIDATE_SKILLS, [], "70"
+        ).transact(sender)
+        candidate_ids.append(candidate_id)
+    return candidate_ids
+
+
+async def setup_chain(jobs: int, candidates: int) -> Tuple[ContractClient, ContractStore, Dict[str, Any]]:
+    """Fresh chain with the contracts deployed and seeded, a funded wallet and a synced store"""
+    w3 = dev_chain.connect()
+    talent_address = await dev_chain.deploy(w3, "TalentAIApplications")
+    multicall_address = await dev_chain.deploy(w3, "Multicall3")
+    client = ContractClient(w3=w3, contract_address=talent_address, multicall_address=multicall_address)
+
+    started = time.perf_counter()
+    job_ids = await seed_jobs(w3, client, jobs)
+    candidate_ids = await register_candidates(w3, client, candidates)
+    seed_seconds = time.perf_counter() - started
+
+    wallet = Account.create()
+    await dev_chain.fund(w3, wallet.address)
+    client.tx_submitter = TransactionSubmitter(client, private_key=wallet.key.hex(), receipt_timeout=RECEIPT_TIMEOUT)
+
+    store = ContractStore(":memory:", contract_address=talent_address)
+    indexer = ContractIndexer(client, store, start_block=1)
+    started = time.perf_counter()
+    await indexer.sync_once()
+    sync_seconds = time.perf_counter() - started
+    client.attach_store(store)
+    return client, store, {
+        "job_ids": job_ids,
+        "candidate_ids": candidate_ids,
+        "seed_seconds": seed_seconds,
+        "indexer_bootstrap_seconds": sync_seconds,
+    }
+
+
+async def measure(run: Callable[[], Awaitable[Any]], counter: CallCounter, trace: bool) -> Dict[str, Any]:
+    """One timed call of ``run``: seconds, call deltas and (under tracemalloc) allocations"""
+    before = counter.snapshot()
+    if trace:
+        tracemalloc.reset_peak()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    result = await run()
+    seconds = time.perf_counter() - started
+    sample = {"seconds": seconds, "calls": dict(counter.snapshot() - before), "result": result}
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        sample["alloc_peak_kib"] = (peak - start_bytes) / 1024
+        sample["alloc_net_kib"] = (current - start_bytes) / 1024
+    return sample
+
+
+def summarize(samples: List[Dict[str, Any]], traced: Dict[str, Any], items: Optional[int] = None) -> Dict[str, Any]:
+    seconds = [sample["seconds"] for sample in samples]
+    summary = {
+        "seconds": statistics.median(seconds),
+        "seconds_first": seconds[0],
+        "seconds_max": max(seconds),
+        "alloc_peak_kib": round(traced["alloc_peak_kib"], 1),
+        "alloc_net_kib": round(traced["alloc_net_kib"], 1),
+        # Call counts are deterministic, so the last timed pass stands for all of them
+        "calls": samples[-1]["calls"],
+    }
+    if items is not None:
+        summary["items"] = items
+    return summary
+
+
+async def run_pipeline(candidate_id: str, counter: CallCounter, trace: bool, threshold: float) -> Dict[str, Dict[str, Any]]:
+    """Run the workflow nodes in order for one candidate, measuring each"""
+    state = JobSearchState(
+        candidate_id=candidate_id,
+        compatibility_threshold=threshold,
+        preferences={},
+        current_step="start",
+        resume_text=RESUME
+    )
+    samples = {}
+    for name, node in STAGES:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            sample = await measure(lambda: node(state), counter, trace)
+        if state.get("error_message"):
+            raise RuntimeError(f"{name} failed: {state['error_message']}")
+        samples[name] = sample
+    samples["fetch_jobs"]["items"] = len(state.get("available_jobs") or [])
+    samples["match_jobs"]["items"] = len(state.get("matched_jobs") or [])
+    samples["apply_jobs"]["items"] = (state.get("applications_summary") or {}).get("successful", 0)
+    return samples
+
+
+def client_calls(client: ContractClient, ids: Dict[str, Any]) -> List[Tuple[str, Callable[[], Awaitable[Any]]]]:
+    candidate_id, job_id = ids["candidate_ids"][0], ids["job_ids"][0]
+    return [
+        ("get_all_jobs", lambda: client.get_all_jobs()),
+        ("query_jobs", lambda: client.query_jobs(limit=100)),
+        ("get_jobs[100]", lambda: client.get_jobs(ids["job_ids"][:100])),
+        ("get_candidate", lambda: client.get_candidate(candidate_id)),
+        ("get_all_candidates", lambda: client.get_all_candidates()),
+        ("get_candidates", lambda: client.get_candidates(ids["candidate_ids"])),
+        ("get_applications_for_candidate", lambda: client.get_applications_for_candidate(candidate_id)),
+        ("get_applications_for_job", lambda: client.get_applications_for_job(job_id)),
+        ("count_by_status", lambda: client.count_by_status(candidate_id=candidate_id)),
+    ]
+
+
+def result_size(result: Any) -> Optional[int]:
+    if isinstance(result, (list, dict)):
+        return len(result)
+    items = getattr(result, "items", None)
+    return len(items) if isinstance(items, dict) else None
+
+
+async def bench_jobs(jobs: int, repeat: int, threshold: float, llm_latency: float) -> Dict[str, Any]:
+    passes = repeat + 1
+    client, store, ids = await setup_chain(jobs, passes)
+    counter = CallCounter()
+    counter.instrument(client, CLIENT_METHODS)
+    counter.instrument(client.tx_submitter, SUBMITTER_METHODS, prefix="tx.")
+    main.contract_client = client
+    main.MATCH_CACHE_ENABLED = False
+    # A private scheduler with limits far above the fake model's rate, so it only adds its own overhead
+    main.model = LLMScheduler(rpm_limit=10 ** 9, tpm_limit=10 ** 12).wrap(FakeChatModel(counter, llm_latency))
+
+    try:
+        # Each pass applies as a different candidate, since application IDs must be unique
+        stage_samples: Dict[str, List[Dict[str, Any]]] = {name: [] for name, _ in STAGES}
+        for i in range(repeat):
+            for name, sample in (await run_pipeline(ids["candidate_ids"][i], counter, False, threshold)).items():
+                stage_samples[name].append(sample)
+        tracemalloc.start()
+        try:
+            traced = await run_pipeline(ids["candidate_ids"][repeat], counter, True, threshold)
+        finally:
+            tracemalloc.stop()
+        stages = {
+            name: summarize(samples, traced[name], samples[-1].get("items"))
+            for name, samples in stage_samples.items()
+        }
+
+        methods = {}
+        for source in ("store", "chain"):
+            client.store = store if source == "store" else None
+            for name, call in client_calls(client, ids):
+                samples = []
+                for trace in [False] * repeat + [True]:
+                    # Cold caches, so each sample pays for the full read
+                    client.view_cache.invalidate()
+                    client.store_cache.invalidate()
+                    if trace:
+                        tracemalloc.start()
+                    try:
+                        samples.append(await measure(call, counter, trace))
+                    finally:
+                        if trace:
+                            tracemalloc.stop()
+                methods[f"{name}[{source}]"] = summarize(samples[:-1], samples[-1], result_size(samples[-1]["result"]))
+        client.store = store
+    finally:
+        await client.aclose()
+
+    return {
+        "setup": {
+            "seed_seconds": round(ids["seed_seconds"], 3),
+            "indexer_bootstrap_seconds": round(ids["indexer_bootstrap_seconds"], 3),
+        },
+        "stages": stages,
+        "client": methods,
+    }
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Human-readable regressions of ``results`` against ``baseline``"""
+    regressions = []
+    for jobs, current in results.items():
+        previous = baseline.get(jobs)
+        if previous is None:
+            continue
+        for section in ("stages", "client"):
+            for name, entry in current[section].items():
+                old = previous.get(section, {}).get(name)
+                if old is None:
+                    continue
+                label = f"{jobs} jobs / {name}"
+                if entry["seconds"] > old["seconds"] * (1 + tolerance) and entry["seconds"] - old["seconds"] > SECONDS_FLOOR:
+                    regressions.append(f"{label}: {old['seconds'] * 1000:.1f}ms -> {entry['seconds'] * 1000:.1f}ms")
+                if (
+                    entry["alloc_peak_kib"] > old["alloc_peak_kib"] * (1 + tolerance)
+                    and entry["alloc_peak_kib"] - old["alloc_peak_kib"] > ALLOC_FLOOR_KIB
+                ):
+                    regressions.append(
+                        f"{label}: peak allocations {old['alloc_peak_kib']:.0f}KiB -> {entry['alloc_peak_kib']:.0f}KiB"
+                    )
+                for call, count in entry["calls"].items():
+                    if call.endswith("tokens"):
+                        continue
+                    if count > old["calls"].get(call, 0):
+                        regressions.append(f"{label}: {call} calls {old['calls'].get(call, 0)} -> {count}")
+    return regressions
+
+
+def print_report(jobs: str, result: Dict[str, Any]):
+    setup = result["setup"]
+    print(f"\n== {jobs} jobs (seeded in {setup['seed_seconds']:.1f}s, indexer bootstrap {setup['indexer_bootstrap_seconds']:.2f}s)")
+    print(f"{'stage':<42}{'median ms':>10}{'first ms':>10}{'peak KiB':>10}{'items':>7}  calls")
+    for section in ("stages", "client"):
+        for name, entry in result[section].items():
+            calls = " ".join(f"{call}={count}" for call, count in sorted(entry["calls"].items()) if count)
+            print(
+                f"{name:<42}{entry['seconds'] * 1000:>10.1f}{entry['seconds_first'] * 1000:>10.1f}"
+                f"{entry['alloc_peak_kib']:>10.0f}{entry.get('items', ''):>7}  {calls}"
+            )
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10, 100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=3, help="Timed passes per stage (plus one traced pass)")
+    parser.add_argument("--threshold", type=float, default=0.7, help="Compatibility threshold for the search")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Seconds the fake model waits per request")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Write these results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Report regressions against the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative growth over the baseline")
+    parser.add_argument("--output", default=None, help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = {}
+    for jobs in args.jobs:
+        results[str(jobs)] = asyncio.run(bench_jobs(jobs, max(1, args.repeat), args.threshold, args.llm_latency))
+        print_report(str(jobs), results[str(jobs)])
+
+    report = {
+        "meta": {
+            "created_at": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tokenizer": tokenizer_name(),
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    status = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"\nNo baseline at {args.baseline}; run with --save-baseline first")
+        else:
+            with open(args.baseline) as f:
+                regressions = compare(results, json.load(f)["results"], args.tolerance)
+            print(f"\n{len(regressions)} regressions against {args.baseline}")
+            for line in regressions:
+                print(f"  {line}")
+            status = 1 if regressions else 0
+
+    if args.save_baseline:
+        baseline = {"meta": report["meta"], "results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline["results"] = json.load(f).get("results", {})
+        # Job counts not run this time keep their previous numbers
+        baseline["results"].update(results)
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main_cli()
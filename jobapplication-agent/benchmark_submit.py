@@ -0,0 +1,117 @@
+"""Gas and latency of per-application versus batched application submission.
+
+Deploys TalentAIApplications and Multicall3 to a dev chain (see dev_chain.py), seeds
+enough jobs, then submits the same number of applications through both paths:
+
+    python benchmark_submit.py --applications 30 --batch-size 25 --output benchmark_submit_results.json
+
+eth-tester mines every transaction instantly, so latencies are most meaningful
+against anvil with a block time, e.g. ``anvil --block-time 2`` and
+``DEV_CHAIN_RPC=http://127.0.0.1:8545``.
+"""
+import os
+import json
+import time
+import asyncio
+import argparse
+import logging
+from datetime import datetime
+from typing import Dict, List
+from eth_account import Account
+import dev_chain
+from contract_factory import ContractClient, RECEIPT_TIMEOUT
+from tx_submitter import SubmittedTransaction, TransactionSubmitter
+
+
+def summarize(mode: str, transactions: List[SubmittedTransaction], elapsed: float) -> Dict[str, float]:
+    gas_by_tx = {tx.tx_hash: tx.gas_used or 0 for tx in transactions if tx.tx_hash}
+    confirmed = sum(tx.status == "confirmed" for tx in transactions)
+    total_gas = sum(gas_by_tx.values())
+    return {
+        "mode": mode,
+        "applications": len(transactions),
+        "confirmed": confirmed,
+        "transactions": len(gas_by_tx),
+        "total_gas": total_gas,
+        "gas_per_application": total_gas / confirmed if confirmed else 0,
+        "seconds": elapsed,
+    }
+
+
+async def run(applications: int, batch_size: int) -> List[Dict[str, float]]:
+    w3 = dev_chain.connect()
+    talent_address = await dev_chain.deploy(w3, "TalentAIApplications")
+    multicall_address = await dev_chain.deploy(w3, "Multicall3")
+    client = ContractClient(w3=w3, contract_address=talent_address, multicall_address=multicall_address)
+    created = await dev_chain.seed_platform(w3, client.contract, jobs=applications, candidates=1)
+
+    wallet = Account.create()
+    await dev_chain.fund(w3, wallet.address)
+    client.tx_submitter = TransactionSubmitter(client, private_key=wallet.key.hex(), receipt_timeout=RECEIPT_TIMEOUT)
+    submitter = client.tx_submitter
+    candidate_id = created["candidates"][0]
+
+    def items(prefix: str) -> List[Dict[str, str]]:
+        return [
+            {
+                "application_id": f"{prefix}_{job_id}",
+                "job_id": job_id,
+                "candidate_id": candidate_id,
+                "application_date": datetime.now().isoformat()
+            }
+            for job_id in created["jobs"]
+        ]
+
+    results = []
+    try:
+        start = time.perf_counter()
+        sent = [
+            await submitter.submit_application(
+                item["application_id"], item["job_id"], item["candidate_id"], item["application_date"]
+            )
+            for item in items("single")
+        ]
+        settled = await submitter.wait_all(sent)
+        results.append(summarize("per-application", settled, time.perf_counter() - start))
+
+        start = time.perf_counter()
+        sent = await client.submit_applications(items("batch"), batch_size=batch_size)
+        settled = await submitter.wait_all(sent)
+        results.append(summarize(f"batch (size {batch_size})", settled, time.perf_counter() - start))
+    finally:
+        await client.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--applications", type=int, default=30)
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--output", default=None, help="Also write the results as JSON to this path")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    results = asyncio.run(run(args.applications, args.batch_size))
+    print(f"{'mode':<20}{'confirmed':>10}{'txs':>6}{'total gas':>12}{'gas/app':>10}{'seconds':>9}")
+    for row in results:
+        print(
+            f"{row['mode']:<20}{row['confirmed']:>10}{row['transactions']:>6}"
+            f"{row['total_gas']:>12}{row['gas_per_application']:>10.0f}{row['seconds']:>9.2f}"
+        )
+    if args.output:
+        report = {
+            "meta": {
+                "created_at": datetime.now().isoformat(),
+                "chain": os.getenv("DEV_CHAIN_RPC") or "eth-tester",
+                "solc": dev_chain.SOLC_VERSION,
+                "applications": args.applications,
+                "batch_size": args.batch_size,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
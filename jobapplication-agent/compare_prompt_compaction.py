@@ -0,0 +1,82 @@
+"""Input tokens and score agreement of full versus compacted match prompts.
+
+Scores one candidate against the same jobs twice, first with full job descriptions
+and the first 800 resume characters and then with compacted prompts (cached job
+summaries and relevant resume sections). It reports input tokens per job and how
+far the scores moved:
+
+    python compare_prompt_compaction.py CANDIDATE_ID --resume resume.pdf --jobs 20
+
+Uses the configured contract and OpenAI key. Match caching is turned off for the run.
+"""
+import asyncio
+import argparse
+import logging
+from typing import Dict
+import main
+from main import contract_client, match_jobs, extract_resume_text
+from prompt_budget import prompt_stats
+
+
+async def scores_for(state: Dict, compaction: bool) -> Dict[str, float]:
+    prompt_stats.reset()
+    run_state = dict(state, preferences={**state["preferences"], "prompt_compaction": compaction})
+    result = await match_jobs(run_state)
+    if result.get("error_message"):
+        raise RuntimeError(result["error_message"])
+    return {matched.job.jobId: matched.compatibility_score for matched in result["matched_jobs"]}
+
+
+async def run(candidate_id: str, resume_path: str, jobs: int, mode: str, threshold: float):
+    main.MATCH_CACHE_ENABLED = False
+    await contract_client.connect()
+    try:
+        candidate = await contract_client.get_candidate(candidate_id)
+        available = (await contract_client.get_all_jobs())[:jobs]
+        resume_text = (await extract_resume_text(resume_path))[0] if resume_path else ""
+    finally:
+        await contract_client.aclose()
+
+    # Threshold 0 keeps every scored job in matched_jobs so both runs can be compared
+    state = {
+        "candidate_profile": candidate,
+        "available_jobs": available,
+        "compatibility_threshold": 0.0,
+        "resume_text": resume_text,
+        "preferences": {"match_mode": mode},
+    }
+    full = await scores_for(state, False)
+    full_tokens = prompt_stats.stats()
+    compact = await scores_for(state, True)
+    compact_tokens = prompt_stats.stats()
+
+    shared = sorted(set(full) & set(compact))
+    deltas = [abs(full[job_id] - compact[job_id]) for job_id in shared]
+    agree = sum((full[job_id] >= threshold) == (compact[job_id] >= threshold) for job_id in shared)
+
+    print(f"{'prompts':<12}{'tokens/job':>12}{'tokens/prompt':>15}")
+    for label, stats in (("full", full_tokens), ("compact", compact_tokens)):
+        totals = stats.get(mode, {})
+        print(f"{label:<12}{totals.get('input_tokens_per_job', 0):>12.0f}{totals.get('input_tokens_per_prompt', 0):>15.0f}")
+    if shared:
+        print(f"\nJobs compared:          {len(shared)}")
+        print(f"Mean |score delta|:     {sum(deltas) / len(deltas):.3f}")
+        print(f"Max |score delta|:      {max(deltas):.3f}")
+        print(f"Same side of {threshold:.2f}:      {agree}/{len(shared)}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("candidate_id")
+    parser.add_argument("--resume", default=None, help="Resume PDF path or URL")
+    parser.add_argument("--jobs", type=int, default=20)
+    parser.add_argument("--mode", choices=["single", "batch"], default="single")
+    parser.add_argument("--threshold", type=float, default=0.7)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    asyncio.run(run(args.candidate_id, args.resume, args.jobs, args.mode, args.threshold))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -1,13 +1,75 @@
 import os
-from typing import List, Optional, Dict, Any
-from web3 import Web3
-from eth_account import Account
+import time
+import bisect
+import asyncio
+from typing import Awaitable, List, Optional, Dict, Any, TypeVar
+import aiohttp
+from eth_abi import decode as abi_decode
+from web3 import AsyncWeb3, Web3
+from web3.providers.rpc import AsyncHTTPProvider
 import json
 import logging
-from models import Job, Candidate, Application, Location, JobType, ApplicationStatus, JobStatus
+from pydantic import BaseModel
+from tx_submitter import SubmittedTransaction, TransactionSubmitter
+from view_cache import BlockViewCache
+from metrics import rpc_seconds
+from models import Job, Candidate, Company, Application, Location, JobType, ApplicationStatus, JobStatus
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+RPC_URL = os.getenv("FLOW_TESTNET_RPC", "https://testnet.evm.nodes.onflow.org")
+# Keep-alive connections shared by every RPC call from this process
+RPC_POOL_SIZE = int(os.getenv("RPC_POOL_SIZE", "20"))
+RPC_KEEPALIVE_SECONDS = float(os.getenv("RPC_KEEPALIVE_SECONDS", "30"))
+# Upper bound for a single RPC call (receipt waits use their own timeout)
+RPC_CALL_TIMEOUT = float(os.getenv("RPC_CALL_TIMEOUT", "15"))
+RECEIPT_TIMEOUT = float(os.getenv("RECEIPT_TIMEOUT", "120"))
+
+# Batched entity lookups: "multicall" packs calls into one Multicall3 eth_call,
+# "jsonrpc" sends them as a JSON-RPC batch request
+RPC_BATCH_MODE = os.getenv("RPC_BATCH_MODE", "multicall")
+RPC_BATCH_SIZE = int(os.getenv("RPC_BATCH_SIZE", "100"))
+MULTICALL3_ADDRESS = os.getenv("MULTICALL3_ADDRESS", "0xcA11bde05977b3631167028862bE2a173976CA11")
+
+# Applications packed into one aggregate3 transaction by submit_applications
+TX_BATCH_SIZE = int(os.getenv("TX_BATCH_SIZE", "25"))
+
+# Selector of Error(string), the payload of require()/revert() with a message
+ERROR_SELECTOR = bytes.fromhex("08c379a0")
+
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
 # Contract ABI - you'll need to copy this from your client/src/lib/contractAbi.ts
 # Option 1: Load from a JSON file (recommended)
 with open('contract_abi.json', 'r') as f:
@@ -22,13 +84,54 @@ with open('contract_abi.json', 'r') as f:
 # Then import it:
 # from contract_abi import CONTRACT_ABI
 
+def _abi_type(param: Dict[str, Any]) -> str:
+    """Canonical ABI type string, expanding tuple components"""
+    if param["type"].startswith("tuple"):
+        inner = ",".join(_abi_type(component) for component in param["components"])
+        return f"({inner}){param['type'][len('tuple'):]}"
+    return param["type"]
+
+def abi_output_types(function_name: str) -> List[str]:
+    for entry in CONTRACT_ABI:
+        if entry["type"] == "function" and entry["name"] == function_name:
+            return [_abi_type(output) for output in entry["outputs"]]
+    raise ValueError(f"Function {function_name} not found in contract ABI")
+
+def event_topic(event_name: str) -> bytes:
+    """keccak256 of the canonical event signature, taken from the contract ABI"""
+    for entry in CONTRACT_ABI:
+        if entry["type"] == "event" and entry["name"] == event_name:
+            types = ",".join(item["type"] for item in entry["inputs"])
+            return bytes(Web3.keccak(text=f"{event_name}({types})"))
+    raise ValueError(f"Event {event_name} not found in contract ABI")
+
+def decode_revert_reason(return_data: bytes) -> str:
+    """Message of a require()/revert() from raw return data"""
+    if return_data[:4] == ERROR_SELECTOR:
+        try:
+            return abi_decode(["string"], return_data[4:])[0]
+        except Exception:
+            pass
+    return "call reverted"
+
+class BatchLookup(BaseModel):
+    """Result of a batched lookup: entities found by ID, plus per-ID errors"""
+    items: Dict[str, Any] = {}
+    errors: Dict[str, str] = {}
+
 class ContractClient:
-    def __init__(self):
-        # Use Flow Testnet RPC (from your frontend config)
-        self.w3 = Web3(Web3.HTTPProvider(os.getenv("FLOW_TESTNET_RPC", "https://testnet.evm.nodes.onflow.org")))
+    def __init__(
+        self,
+        w3: Optional[AsyncWeb3] = None,
+        contract_address: Optional[str] = None,
+        multicall_address: str = MULTICALL3_ADDRESS
+    ):
+        # Use Flow Testnet RPC (from your frontend config); the pooled session is attached in connect()
+        self.w3 = w3 or AsyncWeb3(AsyncHTTPProvider(RPC_URL))
+        self._session: Optional[aiohttp.ClientSession] = None
         
         # Contract address from your frontend
-        self.contract_address = os.getenv("CONTRACT_ADDRESS", "0x519a9057Bfe3e6bab6EDb7128b7Dba44d2adC083")
+        self.contract_address = contract_address or os.getenv("CONTRACT_ADDRESS", "0x519a9057Bfe3e6bab6EDb7128b7Dba44d2adC083")
         
         # Create contract instance
         self.contract = self.w3.eth.contract(
@@ -36,8 +139,84 @@ class ContractClient:
             abi=CONTRACT_ABI
         )
         
+        self.multicall = self.w3.eth.contract(
+            address=Web3.to_checksum_address(multicall_address),
+            abi=MULTICALL3_ABI
+        )
+        
+        # Local mirror of contract state, attached once the indexer has synced
+        self.store = None
+        
+        # View results are shared by every caller within the same block; local store
+        # reads are shared until the indexer moves the watermark
+        self.view_cache = BlockViewCache()
+        self.store_cache = BlockViewCache(max_entries=16)
+        
+        # Wallet transactions are pipelined with a local nonce and tracked by a receipt poller
+        self.tx_submitter = TransactionSubmitter(self, receipt_timeout=RECEIPT_TIMEOUT)
+        
         logger.info(f"Connected to contract at {self.contract_address}")
     
+    async def connect(self, pool_size: int = RPC_POOL_SIZE, call_timeout: float = RPC_CALL_TIMEOUT):
+        """Attach a shared keep-alive connection pool to the HTTP provider"""
+        if self._session is not None or not isinstance(self.w3.provider, AsyncHTTPProvider):
+            return
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=pool_size, keepalive_timeout=RPC_KEEPALIVE_SECONDS),
+            timeout=aiohttp.ClientTimeout(total=call_timeout)
+        )
+        await self.w3.provider.cache_async_session(self._session)
+        logger.info(f"RPC connection pool ready ({pool_size} connections, {call_timeout}s timeout)")
+    
+    async def aclose(self):
+        """Stop the receipt poller and close the pooled RPC session"""
+        await self.tx_submitter.aclose()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    async def _call(
+        self,
+        awaitable: Awaitable[T],
+        timeout: float = RPC_CALL_TIMEOUT,
+        method: str = "other",
+        function: str = ""
+    ) -> T:
+        """Await one RPC call with a per-call timeout, timed under its RPC method and contract function"""
+        started = time.perf_counter()
+        outcome = "error"
+        try:
+            result = await asyncio.wait_for(awaitable, timeout=timeout)
+            outcome = "ok"
+            return result
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            raise
+        finally:
+            rpc_seconds.observe(time.perf_counter() - started, method, function, outcome)
+    
+    def attach_store(self, store):
+        """Serve reads from a local ContractStore whenever it is ready"""
+        self.store = store
+    
+    def _store_ready(self) -> bool:
+        return self.store is not None and self.store.is_ready()
+    
+    async def _view(self, function_name: str, *args) -> Any:
+        """eth_call of a view function at the current block, through the block-scoped cache"""
+        block = await self.view_cache.head(lambda: self._call(self.w3.eth.block_number, method="eth_blockNumber"))
+        getter = getattr(self.contract.functions, function_name)
+        return await self.view_cache.get(
+            function_name, args, block,
+            lambda: self._call(getter(*args).call(block_identifier=block), method="eth_call", function=function_name)
+        )
+    
+    async def _store_view(self, name: str, load) -> Any:
+        """Result of a local store read, cached until the indexer advances the watermark"""
+        async def loader():
+            return await asyncio.to_thread(load)
+        return await self.store_cache.get(name, (), self.store.get_watermark(), loader)
+    
     def _map_location(self, location_enum: int) -> Location:
         """Map contract location enum to Location enum"""
         location_map = {0: Location.REMOTE, 1: Location.HYBRID, 2: Location.ONSITE}
@@ -69,42 +248,107 @@ class ContractClient:
         }
         return status_map.get(status_enum, ApplicationStatus.PENDING)
     
+    def _job_from_tuple(self, job_tuple) -> Job:
+        return Job(
+            jobId=job_tuple[0],
+            companyId=job_tuple[1], 
+            title=job_tuple[2],
+            description=job_tuple[3],
+            requirements=list(job_tuple[4]),
+            skills=list(job_tuple[5]),
+            location=self._map_location(job_tuple[6]),
+            salaryRange=list(job_tuple[7]),
+            jobType=self._map_job_type(job_tuple[8]),
+            status=self._map_job_status(job_tuple[9])
+        )
+    
+    def _candidate_from_tuple(self, candidate_data) -> Candidate:
+        return Candidate(
+            candidateId=candidate_data[0],
+            name=candidate_data[1],
+            description=list(candidate_data[2]),
+            contacts=list(candidate_data[3]),
+            education=list(candidate_data[4]),
+            skills=list(candidate_data[5]),
+            resumePath=list(candidate_data[6]),
+            profileScore=candidate_data[7]
+        )
+    
+    def _company_from_tuple(self, company_data) -> Company:
+        return Company(
+            companyId=company_data[0],
+            image=company_data[1],
+            name=company_data[2],
+            contacts=list(company_data[3]),
+            description=company_data[4],
+            misc=list(company_data[5]),
+            companyScore=company_data[6]
+        )
+    
+    def _application_from_tuple(self, app_tuple) -> Application:
+        return Application(
+            applicationId=app_tuple[0],
+            jobId=app_tuple[1],
+            candidateId=app_tuple[2],
+            applicationDate=app_tuple[3],
+            status=self._map_application_status(app_tuple[4])
+        )
+    
+    def _apply_job_filters(self, jobs: List[Job], filters: Optional[Dict[str, Any]]) -> List[Job]:
+        if not filters:
+            return jobs
+        filtered = []
+        for job in jobs:
+            if filters.get("location") and job.location.value.lower() != filters["location"].lower():
+                continue
+            if filters.get("job_type") and job.jobType.value.lower() != filters["job_type"].lower():
+                continue
+            if filters.get("exclude_company") and job.companyId == filters["exclude_company"]:
+                continue
+            if filters.get("company_id") and job.companyId != filters["company_id"]:
+                continue
+            if filters.get("status") and job.status.value.lower() != filters["status"].lower():
+                continue
+            if filters.get("skills"):
+                wanted = {skill.lower() for skill in filters["skills"]}
+                if not wanted.intersection(skill.lower() for skill in job.skills):
+                    continue
+            filtered.append(job)
+        return filtered
+    
+    async def query_jobs(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        after_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[str]:
+        """One page of jobs as JSON strings, ordered by job ID and starting after ``after_id``"""
+        if self._store_ready():
+            return await asyncio.to_thread(self.store.query_jobs, filters, after_id, limit)
+        
+        jobs = sorted(await self.fetch_all_jobs(filters), key=lambda job: job.jobId)
+        start = bisect.bisect_right([job.jobId for job in jobs], after_id) if after_id is not None else 0
+        return [job.model_dump_json() for job in jobs[start:start + limit]]
+    
+    async def fetch_all_jobs(self, filters: Dict[str, Any] = None) -> List[Job]:
+        """Fetch all jobs from the local store or the smart contract, raising on failure"""
+        if self._store_ready():
+            jobs = self._apply_job_filters(list(await self._store_view("jobs", self.store.get_jobs)), filters)
+            logger.info(f"Fetched {len(jobs)} jobs from local contract store")
+            return jobs
+        
+        # Call the smart contract
+        jobs_data = await self._view("getAllJobs")
+        
+        jobs = self._apply_job_filters([self._job_from_tuple(job_tuple) for job_tuple in jobs_data], filters)
+        
+        logger.info(f"Fetched {len(jobs)} jobs from contract")
+        return jobs
+    
     async def get_all_jobs(self, filters: Dict[str, Any] = None) -> List[Job]:
         """Fetch all jobs from the smart contract"""
         try:
-            # Call the smart contract
-            print(self.contract.functions)
-            jobs_data = self.contract.functions.getAllJobs().call()
-            
-            jobs = []
-            for job_tuple in jobs_data:
-                job = Job(
-                    jobId=job_tuple[0],
-                    companyId=job_tuple[1], 
-                    title=job_tuple[2],
-                    description=job_tuple[3],
-                    requirements=list(job_tuple[4]),
-                    skills=list(job_tuple[5]),
-                    location=self._map_location(job_tuple[6]),
-                    salaryRange=list(job_tuple[7]),
-                    jobType=self._map_job_type(job_tuple[8]),
-                    status=self._map_job_status(job_tuple[9])
-                )
-                
-                # Apply filters if provided
-                if filters:
-                    if filters.get("location") and job.location.value.lower() != filters["location"].lower():
-                        continue
-                    if filters.get("job_type") and job.jobType.value.lower() != filters["job_type"].lower():
-                        continue
-                    if filters.get("exclude_company") and job.companyId == filters["exclude_company"]:
-                        continue
-                
-                jobs.append(job)
-            
-            logger.info(f"Fetched {len(jobs)} jobs from contract")
-            return jobs
-            
+            return await self.fetch_all_jobs(filters)
         except Exception as e:
             logger.error(f"Error fetching jobs from contract: {e}")
             return []
@@ -112,18 +356,15 @@ class ContractClient:
     async def get_candidate(self, candidate_id: str) -> Optional[Candidate]:
         """Fetch candidate data from the smart contract"""
         try:
-            candidate_data = self.contract.functions.getCandidate(candidate_id).call()
+            if self._store_ready():
+                candidate = await asyncio.to_thread(self.store.get_candidate, candidate_id)
+                if candidate:
+                    logger.info(f"Fetched candidate {candidate_id} from local contract store")
+                    return candidate
             
-            candidate = Candidate(
-                candidateId=candidate_data[0],
-                name=candidate_data[1],
-                description=list(candidate_data[2]),
-                contacts=list(candidate_data[3]),
-                education=list(candidate_data[4]),
-                skills=list(candidate_data[5]),
-                resumePath=list(candidate_data[6]),
-                profileScore=candidate_data[7]
-            )
+            candidate_data = await self._view("getCandidate", candidate_id)
+            
+            candidate = self._candidate_from_tuple(candidate_data)
             
             logger.info(f"Fetched candidate {candidate_id} from contract")
             return candidate
@@ -131,23 +372,56 @@ class ContractClient:
         except Exception as e:
             logger.error(f"Error fetching candidate {candidate_id} from contract: {e}")
             return None
+
+    async def get_all_candidates(self) -> List[Candidate]:
+        """Fetch all registered candidates from the smart contract"""
+        try:
+            if self._store_ready():
+                candidates = list(await self._store_view("candidates", self.store.get_candidates))
+                logger.info(f"Fetched {len(candidates)} candidates from local contract store")
+                return candidates
+
+            candidates_data = await self._view("getAllCandidates")
+
+            candidates = [self._candidate_from_tuple(candidate_tuple) for candidate_tuple in candidates_data]
+
+            logger.info(f"Fetched {len(candidates)} candidates from contract")
+            return candidates
+
+        except Exception as e:
+            logger.error(f"Error fetching candidates from contract: {e}")
+            return []
+
+    async def _applications_where(self, candidate_id: Optional[str] = None, job_id: Optional[str] = None) -> List[Application]:
+        """Download every application and filter in Python; used until the local store is ready"""
+        all_applications = await self._view("getAllApplications")
+        return [
+            self._application_from_tuple(app_tuple)
+            for app_tuple in all_applications
+            if (candidate_id is None or app_tuple[2] == candidate_id) and (job_id is None or app_tuple[1] == job_id)
+        ]
+    
+    async def get_application(self, application_id: str) -> Optional[Application]:
+        """Read one application straight from the chain; None if it was never submitted"""
+        lookup = await self.batch_view("getApplication", [application_id], self._application_from_tuple)
+        error = lookup.errors.get(application_id)
+        if error and error != "not found":
+            raise RuntimeError(f"Could not read application {application_id}: {error}")
+        return lookup.items.get(application_id)
     
-    async def get_applications_for_candidate(self, candidate_id: str) -> List[Application]:
+    async def get_applications_for_candidate(self, candidate_id: str, status: Optional[ApplicationStatus] = None) -> List[Application]:
         """Fetch all applications for a specific candidate"""
         try:
-            all_applications = self.contract.functions.getAllApplications().call()
+            if self._store_ready():
+                applications = await asyncio.to_thread(
+                    self.store.get_applications_for_candidate, candidate_id, status.value if status else None
+                )
+                logger.info(f"Fetched {len(applications)} applications for candidate {candidate_id} from local contract store")
+                return applications
             
-            applications = []
-            for app_tuple in all_applications:
-                if app_tuple[2] == candidate_id:  # candidateId matches
-                    application = Application(
-                        applicationId=app_tuple[0],
-                        jobId=app_tuple[1],
-                        candidateId=app_tuple[2],
-                        applicationDate=app_tuple[3],
-                        status=self._map_application_status(app_tuple[4])
-                    )
-                    applications.append(application)
+            applications = await self._applications_where(candidate_id=candidate_id)
+            if status:
+                applications = [app for app in applications if app.status == status]
             
             logger.info(f"Fetched {len(applications)} applications for candidate {candidate_id}")
             return applications
@@ -156,132 +430,269 @@ class ContractClient:
             logger.error(f"Error fetching applications for candidate {candidate_id}: {e}")
             return []
     
-    async def submit_application(self, application_id: str, job_id: str, candidate_id: str, application_date: str) -> bool:
-        """Submit an application to the smart contract using hardcoded wallet"""
+    async def get_applications_for_job(self, job_id: str, status: Optional[ApplicationStatus] = None) -> List[Application]:
+        """Fetch all applications received by a job"""
         try:
-            # Get hardcoded wallet from environment variables
-            private_key = os.getenv("PRIVATE_KEY")
-            if not private_key:
-                logger.error("PRIVATE_KEY not found in environment variables")
-                return False
-            
-            # Ensure proper private key format
-            if private_key.startswith('0x'):
-                private_key = private_key[2:]
-            private_key = '0x' + private_key
-            
-            # Create account from private key
-            account = Account.from_key(private_key)
-            logger.info(f"Using wallet address: {account.address}")
-            
-            # Check if wallet has sufficient balance
-            balance = self.w3.eth.get_balance(account.address)
-            balance_in_flow = self.w3.from_wei(balance, 'ether')
-            logger.info(f"Wallet balance: {balance_in_flow} FLOW")
+            if self._store_ready():
+                applications = await asyncio.to_thread(
+                    self.store.get_applications_for_job, job_id, status.value if status else None
+                )
+                logger.info(f"Fetched {len(applications)} applications for job {job_id} from local contract store")
+                return applications
             
-            if balance == 0:
-                logger.error("Wallet has no balance for gas fees")
-                return False
+            applications = await self._applications_where(job_id=job_id)
+            if status:
+                applications = [app for app in applications if app.status == status]
             
-            # Build the transaction for submitApplication function
-            function_call = self.contract.functions.submitApplication(
-                application_id,    # _applicationId
-                job_id,           # _jobId  
-                candidate_id,     # _candidateId
-                application_date  # _applicationDate
-            )
+            logger.info(f"Fetched {len(applications)} applications for job {job_id}")
+            return applications
             
-            # Get current nonce
-            nonce = self.w3.eth.get_transaction_count(account.address)
-            logger.info(f"Current nonce: {nonce}")
+        except Exception as e:
+            logger.error(f"Error fetching applications for job {job_id}: {e}")
+            return []
+    
+    async def count_by_status(self, candidate_id: Optional[str] = None, job_id: Optional[str] = None) -> Dict[str, int]:
+        """Application counts per status, optionally scoped to a candidate and/or job"""
+        try:
+            if self._store_ready():
+                counts = await asyncio.to_thread(self.store.count_by_status, candidate_id, job_id)
+            else:
+                counts = {}
+                for app in await self._applications_where(candidate_id=candidate_id, job_id=job_id):
+                    counts[app.status.value] = counts.get(app.status.value, 0) + 1
+            return {status.value: counts.get(status.value, 0) for status in ApplicationStatus}
             
-            # Estimate gas
+        except Exception as e:
+            logger.error(f"Error counting applications by status: {e}")
+            return {}
+    
+    async def _multicall_chunk(self, function_name: str, ids: List[str], block_identifier) -> Dict[str, Any]:
+        """One eth_call to Multicall3.aggregate3 for a chunk of view calls"""
+        getter = getattr(self.contract.functions, function_name)
+        calls = [(self.contract.address, True, getter(entity_id)._encode_transaction_data()) for entity_id in ids]
+        results = await self._call(
+            self.multicall.functions.aggregate3(calls).call(block_identifier=block_identifier),
+            method="multicall", function=function_name
+        )
+        output_types = abi_output_types(function_name)
+        outcome: Dict[str, Any] = {}
+        for entity_id, (success, return_data) in zip(ids, results):
+            if not success:
+                outcome[entity_id] = Exception("call reverted")
+                continue
             try:
-                gas_estimate = function_call.estimate_gas({'from': account.address})
-                logger.info(f"Estimated gas: {gas_estimate}")
-            except Exception as gas_error:
-                logger.error(f"Gas estimation failed: {gas_error}")
-                # Use a reasonable default if estimation fails
-                gas_estimate = 300000
-            
-            # Get current gas price
-            gas_price = self.w3.eth.gas_price
-            gas_price_gwei = self.w3.from_wei(gas_price, 'gwei')
-            logger.info(f"Gas price: {gas_price_gwei} gwei")
-            
-            # Calculate transaction cost
-            tx_cost = gas_estimate * gas_price
-            tx_cost_flow = self.w3.from_wei(tx_cost, 'ether')
-            
-            if balance < tx_cost:
-                logger.error(f"Insufficient balance for transaction. Need: {tx_cost_flow} FLOW, Have: {balance_in_flow} FLOW")
+                outcome[entity_id] = self.w3.codec.decode(output_types, return_data)[0]
+            except Exception as decode_error:
+                outcome[entity_id] = decode_error
+        return outcome
+    
+    async def _jsonrpc_batch_chunk(self, function_name: str, ids: List[str], block_identifier) -> Dict[str, Any]:
+        """One JSON-RPC batch request carrying an eth_call per ID"""
+        getter = getattr(self.contract.functions, function_name)
+        async with self.w3.batch_requests() as batch:
+            for entity_id in ids:
+                batch.add(getter(entity_id).call(block_identifier=block_identifier))
+            results = await self._call(batch.async_execute(), method="batch", function=function_name)
+        return dict(zip(ids, results))
+    
+    async def _individual_chunk(self, function_name: str, ids: List[str], block_identifier) -> Dict[str, Any]:
+        """Last resort: one eth_call per ID, isolating failures"""
+        getter = getattr(self.contract.functions, function_name)
+        results = await asyncio.gather(
+            *(
+                self._call(getter(entity_id).call(block_identifier=block_identifier), method="eth_call", function=function_name)
+                for entity_id in ids
+            ),
+            return_exceptions=True
+        )
+        return dict(zip(ids, results))
+    
+    async def _batch_chunk(self, function_name: str, ids: List[str], block_identifier) -> Dict[str, Any]:
+        if RPC_BATCH_MODE == "multicall":
+            try:
+                return await self._multicall_chunk(function_name, ids, block_identifier)
+            except Exception as e:
+                logger.warning(f"Multicall {function_name} batch failed, falling back to JSON-RPC batch: {e}")
+        try:
+            return await self._jsonrpc_batch_chunk(function_name, ids, block_identifier)
+        except Exception as e:
+            logger.warning(f"JSON-RPC {function_name} batch failed, falling back to individual calls: {e}")
+            return await self._individual_chunk(function_name, ids, block_identifier)
+    
+    async def batch_view(
+        self,
+        function_name: str,
+        ids: List[str],
+        parse,
+        block_identifier="latest"
+    ) -> BatchLookup:
+        """Run a single-ID view function for many IDs in chunked batches"""
+        unique_ids = list(dict.fromkeys(ids))
+        chunks = [unique_ids[i:i + RPC_BATCH_SIZE] for i in range(0, len(unique_ids), RPC_BATCH_SIZE)]
+        outcomes = await asyncio.gather(
+            *(self._batch_chunk(function_name, chunk, block_identifier) for chunk in chunks)
+        )
+        
+        lookup = BatchLookup()
+        for outcome in outcomes:
+            for entity_id, data in outcome.items():
+                if isinstance(data, Exception):
+                    lookup.errors[entity_id] = str(data) or type(data).__name__
+                elif not data or not data[0]:
+                    lookup.errors[entity_id] = "not found"
+                else:
+                    lookup.items[entity_id] = parse(data)
+        
+        logger.info(
+            f"Batched {function_name} for {len(unique_ids)} IDs in {len(chunks)} requests: "
+            f"{len(lookup.items)} found, {len(lookup.errors)} failed"
+        )
+        return lookup
+    
+    async def _lookup_many(self, ids: List[str], function_name: str, parse, store_get) -> BatchLookup:
+        """Serve what the local store has, and batch the rest over RPC"""
+        lookup = BatchLookup()
+        missing = list(dict.fromkeys(ids))
+        if self._store_ready():
+            stored = await asyncio.to_thread(lambda: {entity_id: store_get(entity_id) for entity_id in missing})
+            lookup.items.update({entity_id: entity for entity_id, entity in stored.items() if entity is not None})
+            missing = [entity_id for entity_id in missing if stored[entity_id] is None]
+        if missing:
+            fetched = await self.batch_view(function_name, missing, parse)
+            lookup.items.update(fetched.items)
+            lookup.errors.update(fetched.errors)
+        return lookup
+    
+    async def get_candidates(self, candidate_ids: List[str]) -> BatchLookup:
+        """Fetch many candidates in batched round trips"""
+        return await self._lookup_many(
+            candidate_ids, "getCandidate", self._candidate_from_tuple,
+            lambda i: self.store.get_candidate(i)
+        )
+    
+    async def get_jobs(self, job_ids: List[str]) -> BatchLookup:
+        """Fetch many jobs in batched round trips"""
+        return await self._lookup_many(
+            job_ids, "getJob", self._job_from_tuple,
+            lambda i: self.store.get_job(i)
+        )
+    
+    async def get_companies(self, company_ids: List[str]) -> BatchLookup:
+        """Fetch many companies in batched round trips"""
+        return await self._lookup_many(
+            company_ids, "getCompany", self._company_from_tuple,
+            lambda i: self.store.get_company(i)
+        )
+    
+    async def submit_application(self, application_id: str, job_id: str, candidate_id: str, application_date: str) -> bool:
+        """Submit an application through the pipelined submitter and wait for its receipt"""
+        try:
+            tx = await self.tx_submitter.submit_application(application_id, job_id, candidate_id, application_date)
+            if tx.status == "failed":
+                logger.error(f"❌ Application {application_id} not sent: {tx.error}")
                 return False
             
-            # Build transaction
-            transaction = function_call.build_transaction({
-                'from': account.address,
-                'nonce': nonce,
-                'gas': gas_estimate + 50000,  # Add buffer to gas estimate
-                'gasPrice': gas_price,
-            })
-            
-            logger.info(f"Transaction built - Gas: {transaction['gas']}, Gas Price: {gas_price_gwei} gwei")
             logger.info(f"Submitting application: {application_id} for job: {job_id} by candidate: {candidate_id}")
+            tx = await self.tx_submitter.wait(tx)
             
-            # Sign the transaction
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key=private_key)
-            
-            # Send the transaction
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.raw_transaction)
-            tx_hash_hex = tx_hash.hex()
+            if tx.status == "confirmed":
+                logger.info(f"✅ Application submitted successfully!")
+                logger.info(f"   Application ID: {application_id}")
+                logger.info(f"   Block: {tx.block_number}")
+                logger.info(f"   Gas used: {tx.gas_used}")
+                logger.info(f"   Transaction hash: {tx.tx_hash}")
+                return True
             
-            logger.info(f"Transaction sent with hash: {tx_hash_hex}")
-            
-            # Wait for transaction confirmation
-            try:
-                logger.info("Waiting for transaction confirmation...")
-                receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=120)
-                
-                if receipt.status == 1:
-                    logger.info(f"✅ Application submitted successfully!")
-                    logger.info(f"   Application ID: {application_id}")
-                    logger.info(f"   Job ID: {job_id}")
-                    logger.info(f"   Candidate ID: {candidate_id}")
-                    logger.info(f"   Block: {receipt.blockNumber}")
-                    logger.info(f"   Gas used: {receipt.gasUsed}")
-                    logger.info(f"   Transaction hash: {tx_hash_hex}")
-                    
-                    # Check for events (optional)
-                    try:
-                        # Look for ApplicationSubmitted event
-                        events = self.contract.events.ApplicationSubmitted().processReceipt(receipt)
-                        if events:
-                            logger.info(f"   Event emitted: ApplicationSubmitted")
-                            for event in events:
-                                logger.info(f"   Event args: {event.args}")
-                    except Exception as event_error:
-                        logger.warning(f"Could not process events: {event_error}")
-                    
-                    return True
-                else:
-                    logger.error(f"❌ Transaction failed with status: {receipt.status}")
-                    logger.error(f"   Transaction hash: {tx_hash_hex}")
-                    return False
-                    
-            except Exception as receipt_error:
-                logger.error(f"Error waiting for transaction receipt: {receipt_error}")
-                logger.error(f"Transaction hash: {tx_hash_hex} (check manually on blockchain explorer)")
-                # Transaction might still be pending, but we'll consider it failed for now
-                return False
-                
-        except ValueError as ve:
-            if "insufficient funds" in str(ve).lower():
-                logger.error(f"Insufficient funds for transaction: {ve}")
-            else:
-                logger.error(f"Value error submitting application: {ve}")
+            logger.error(f"❌ Transaction {tx.tx_hash} {tx.status}: {tx.error}")
             return False
+            
         except Exception as e:
             logger.error(f"Error submitting application: {e}")
             return False
+
+    def _confirmed_applications(self, application_ids: List[str]):
+        """Receipt -> application IDs whose ApplicationSubmitted event it contains"""
+        by_topic = {bytes(Web3.keccak(text=application_id)): application_id for application_id in application_ids}
+        submitted_topic = event_topic("ApplicationSubmitted")
+        
+        def confirm(receipt) -> set:
+            confirmed = set()
+            for log in receipt["logs"]:
+                if log["address"].lower() != self.contract.address.lower() or len(log["topics"]) < 2:
+                    continue
+                if bytes(log["topics"][0]) == submitted_topic and bytes(log["topics"][1]) in by_topic:
+                    confirmed.add(by_topic[bytes(log["topics"][1])])
+            return confirmed
+        return confirm
+    
+    async def _submit_application_chunk(self, chunk: List[Dict[str, str]]) -> List[SubmittedTransaction]:
+        calls = [
+            (
+                self.contract.address,
+                True,
+                self.contract.functions.submitApplication(
+                    item["application_id"], item["job_id"], item["candidate_id"], item["application_date"]
+                )._encode_transaction_data()
+            )
+            for item in chunk
+        ]
+        submitter = self.tx_submitter
+        
+        # Dry run first so calls that would revert are reported without paying gas for them
+        try:
+            sender = submitter.sender()
+            preflight = await self._call(
+                self.multicall.functions.aggregate3(calls).call({"from": sender} if sender else {}),
+                method="multicall", function="submitApplication"
+            )
+        except Exception as e:
+            logger.warning(f"Multicall preflight failed ({e}), sending {len(chunk)} applications individually")
+            return [
+                await submitter.submit_application(
+                    item["application_id"], item["job_id"], item["candidate_id"], item["application_date"]
+                )
+                for item in chunk
+            ]
+        
+        results: Dict[str, SubmittedTransaction] = {}
+        kept_items, kept_calls = [], []
+        for item, call, (success, return_data) in zip(chunk, calls, preflight):
+            if success:
+                kept_items.append(item)
+                kept_calls.append(call)
+                continue
+            results[item["application_id"]] = submitter.reject(
+                item["application_id"], decode_revert_reason(return_data),
+                {"job_id": item["job_id"], "candidate_id": item["candidate_id"]}
+            )
+        
+        if kept_calls:
+            sent = await submitter.submit_batch(
+                self.multicall.functions.aggregate3(kept_calls),
+                [
+                    (item["application_id"], {"job_id": item["job_id"], "candidate_id": item["candidate_id"]})
+                    for item in kept_items
+                ],
+                self._confirmed_applications([item["application_id"] for item in kept_items])
+            )
+            results.update({tx.application_id: tx for tx in sent})
+        return [results[item["application_id"]] for item in chunk]
+    
+    async def submit_applications(
+        self,
+        applications: List[Dict[str, str]],
+        batch_size: int = TX_BATCH_SIZE
+    ) -> List[SubmittedTransaction]:
+        """Send many applications as Multicall3 aggregate3 transactions, one per chunk
+        
+        Each item needs application_id, job_id, candidate_id and application_date. Inner
+        calls may fail independently; every application settles on its own
+        ApplicationSubmitted event. Returns once the transactions are sent.
+        """
+        transactions: List[SubmittedTransaction] = []
+        for start in range(0, len(applications), batch_size):
+            transactions.extend(await self._submit_application_chunk(applications[start:start + batch_size]))
+        return transactions
+
 # Global contract client instance
 contract_client = ContractClient()
\ No newline at end of file
@@ -0,0 +1,599 @@
+import os
+import asyncio
+import sqlite3
+import logging
+import threading
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Set, Tuple
+from web3 import AsyncWeb3, Web3
+from models import Job, Candidate, Company, Application
+from contract_factory import ContractClient, contract_client, event_topic
+
+logger = logging.getLogger(__name__)
+
+CONTRACT_INDEXER_ENABLED = os.getenv("CONTRACT_INDEXER_ENABLED", "true").lower() == "true"
+CONTRACT_STORE_PATH = os.getenv("CONTRACT_STORE_PATH", ".cache/contract_store.sqlite3")
+# Blocks per eth_getLogs request
+INDEXER_BLOCK_RANGE = int(os.getenv("INDEXER_BLOCK_RANGE", "1000"))
+# How far back a chain reorganisation is tolerated before the mirror is rebuilt
+INDEXER_REORG_DEPTH = int(os.getenv("INDEXER_REORG_DEPTH", "64"))
+# Blocks behind head the indexer stays, to avoid ingesting very fresh blocks
+INDEXER_CONFIRMATIONS = int(os.getenv("INDEXER_CONFIRMATIONS", "0"))
+INDEXER_POLL_SECONDS = float(os.getenv("INDEXER_POLL_SECONDS", "5"))
+# When set, replay events from this block instead of bootstrapping from a getAll* snapshot
+INDEXER_START_BLOCK = os.getenv("INDEXER_START_BLOCK")
+# Blocks between full re-reads of candidates and companies; 0 disables them
+INDEXER_PROFILE_REFRESH_BLOCKS = int(os.getenv("INDEXER_PROFILE_REFRESH_BLOCKS", "100"))
+
+# event name -> (table, contract function that emits it, argument holding the plain-text ID)
+EVENT_SOURCES = {
+    "JobPosted": ("jobs", "postJob", "_jobId"),
+    "CandidateRegistered": ("candidates", "registerCandidate", "_candidateId"),
+    "CompanyRegistered": ("companies", "registerCompany", "_companyId"),
+    "ApplicationSubmitted": ("applications", "submitApplication", "_applicationId"),
+    "ApplicationStatusUpdated": ("applications", "updateApplicationStatus", "_applicationId"),
+}
+
+# table -> (single-entity getter, snapshot getter)
+TABLE_GETTERS = {
+    "jobs": ("getJob", "getAllJobs"),
+    "candidates": ("getCandidate", "getAllCandidates"),
+    "companies": ("getCompany", "getAllCompanies"),
+    "applications": ("getApplication", "getAllApplications"),
+}
+
+# Tables whose rows change without an event (profile score updates), so they are re-read periodically
+PROFILE_TABLES = ("candidates", "companies")
+
+TABLE_MODELS = {
+    "jobs": Job,
+    "candidates": Candidate,
+    "companies": Company,
+    "applications": Application,
+}
+
+
+def entity_id(table: str, entity) -> str:
+    return {
+        "jobs": lambda e: e.jobId,
+        "candidates": lambda e: e.candidateId,
+        "companies": lambda e: e.companyId,
+        "applications": lambda e: e.applicationId,
+    }[table](entity)
+
+
+class ContractStore:
+    """SQLite mirror of contract entities plus the indexer's block watermark"""
+
+    def __init__(self, path: str = CONTRACT_STORE_PATH, contract_address: Optional[str] = None):
+        self.path = path
+        self._lock = threading.Lock()
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        for table in ("jobs", "candidates", "companies"):
+            self._conn.execute(f"""
+                CREATE TABLE IF NOT EXISTS {table} (
+                    id TEXT PRIMARY KEY,
+                    data TEXT NOT NULL,
+                    block_number INTEGER NOT NULL
+                )
+            """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS applications (
+                id TEXT PRIMARY KEY,
+                job_id TEXT NOT NULL,
+                candidate_id TEXT NOT NULL,
+                status TEXT NOT NULL,
+                data TEXT NOT NULL,
+                block_number INTEGER NOT NULL
+            )
+        """)
+        # Secondary indexes for per-candidate and per-job lookups; status is the second
+        # column so status filters and per-status counts are answered from the index
+        self._conn.execute("DROP INDEX IF EXISTS applications_candidate")
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS applications_candidate_status ON applications (candidate_id, status)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS applications_job_status ON applications (job_id, status)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS applications_status ON applications (status)")
+        # Expression indexes for /jobs filters; they work on stores created before them too
+        for field in ("companyId", "location", "jobType", "status"):
+            self._conn.execute(
+                f"CREATE INDEX IF NOT EXISTS jobs_{field} ON jobs (json_extract(data, '$.{field}'), id)"
+            )
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS checkpoints (
+                block_number INTEGER PRIMARY KEY,
+                block_hash TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self._conn.commit()
+
+        # A store built for another contract is useless; start over
+        if contract_address:
+            stored_address = self._get_meta("contract_address")
+            if stored_address and stored_address.lower() != contract_address.lower():
+                logger.warning(f"Contract store was built for {stored_address}; resetting for {contract_address}")
+                self.reset()
+            self._set_meta("contract_address", contract_address)
+            self._conn.commit()
+
+        # Mirrors the committed watermark so readers on the event loop need not touch SQLite
+        watermark = self._get_meta("watermark")
+        self._watermark: Optional[int] = int(watermark) if watermark is not None else None
+
+    def _get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: str):
+        self._conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+    def is_ready(self) -> bool:
+        return self.get_watermark() is not None
+
+    def get_watermark(self) -> Optional[int]:
+        return self._watermark
+
+    def checkpoints(self) -> List[Tuple[int, str]]:
+        """Recorded (block number, block hash) pairs, newest first"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT block_number, block_hash FROM checkpoints ORDER BY block_number DESC"
+            ).fetchall()
+
+    def reset(self):
+        with self._lock:
+            for table in ("jobs", "candidates", "companies", "applications", "checkpoints"):
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.execute("DELETE FROM meta WHERE key = 'watermark'")
+            self._conn.commit()
+            self._watermark = None
+
+    def _upsert(self, table: str, entity, block_number: int):
+        if table == "applications":
+            self._conn.execute(
+                "INSERT OR REPLACE INTO applications (id, job_id, candidate_id, status, data, block_number) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (entity.applicationId, entity.jobId, entity.candidateId, entity.status.value,
+                 entity.model_dump_json(), block_number)
+            )
+        else:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {table} (id, data, block_number) VALUES (?, ?, ?)",
+                (entity_id(table, entity), entity.model_dump_json(), block_number)
+            )
+
+    def apply(
+        self,
+        block_number: int,
+        block_hash: str,
+        upserts: Dict[str, List[Any]],
+        deletes: Dict[str, List[str]],
+        reorg_depth: int = INDEXER_REORG_DEPTH
+    ):
+        """Write one ingested block range atomically and advance the watermark"""
+        with self._lock:
+            with self._conn:
+                for table, entities in upserts.items():
+                    for entity in entities:
+                        self._upsert(table, entity, block_number)
+                for table, ids in deletes.items():
+                    self._conn.executemany(f"DELETE FROM {table} WHERE id = ?", [(i,) for i in ids])
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO checkpoints (block_number, block_hash) VALUES (?, ?)",
+                    (block_number, block_hash)
+                )
+                # Keep checkpoints inside the reorg window plus one anchor below it
+                anchor = self._conn.execute(
+                    "SELECT MAX(block_number) FROM checkpoints WHERE block_number < ?",
+                    (block_number - reorg_depth,)
+                ).fetchone()[0]
+                if anchor is not None:
+                    self._conn.execute("DELETE FROM checkpoints WHERE block_number < ?", (anchor,))
+                self._set_meta("watermark", str(block_number))
+            self._watermark = block_number
+
+    def replace_all(self, block_number: int, block_hash: str, snapshot: Dict[str, List[Any]]):
+        """Replace every table with a full snapshot taken at ``block_number``"""
+        with self._lock:
+            with self._conn:
+                for table in ("jobs", "candidates", "companies", "applications", "checkpoints"):
+                    self._conn.execute(f"DELETE FROM {table}")
+                for table, entities in snapshot.items():
+                    for entity in entities:
+                        self._upsert(table, entity, block_number)
+                self._conn.execute(
+                    "INSERT INTO checkpoints (block_number, block_hash) VALUES (?, ?)",
+                    (block_number, block_hash)
+                )
+                self._set_meta("watermark", str(block_number))
+            self._watermark = block_number
+
+    def touched_after(self, block_number: int) -> Dict[str, List[str]]:
+        """IDs of rows last written by blocks above ``block_number``"""
+        with self._lock:
+            return {
+                table: [
+                    row[0] for row in self._conn.execute(
+                        f"SELECT id FROM {table} WHERE block_number > ?", (block_number,)
+                    )
+                ]
+                for table in TABLE_GETTERS
+            }
+
+    def rewind(self, block_number: int):
+        """Forget checkpoints above ``block_number`` and move the watermark back to it"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM checkpoints WHERE block_number > ?", (block_number,))
+                self._set_meta("watermark", str(block_number))
+            self._watermark = block_number
+
+    def _load(self, table: str, query: str, params: tuple = ()) -> List[Any]:
+        model = TABLE_MODELS[table]
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [model.model_validate_json(row[0]) for row in rows]
+
+    def get_jobs(self) -> List[Job]:
+        return self._load("jobs", "SELECT data FROM jobs ORDER BY rowid")
+
+    def query_jobs(
+        self,
+        filters: Optional[Dict[str, Any]] = None,
+        after_id: Optional[str] = None,
+        limit: int = 100
+    ) -> List[str]:
+        """Raw JSON of jobs matching ``filters``, ordered by job ID, starting after ``after_id``
+
+        Supported filters: company_id, location, job_type, status (exact, case-insensitive
+        for enums) and skills (any of the given skills, case-insensitive).
+        """
+        filters = filters or {}
+        clauses, params = [], []
+        for key, field in (("company_id", "companyId"), ("location", "location"),
+                           ("job_type", "jobType"), ("status", "status")):
+            value = filters.get(key)
+            if value:
+                clauses.append(f"json_extract(data, '$.{field}') = ?")
+                params.append(value if key == "company_id" else value.upper())
+        skills = [skill.lower() for skill in filters.get("skills") or []]
+        if skills:
+            placeholders = ", ".join("?" for _ in skills)
+            clauses.append(
+                f"EXISTS (SELECT 1 FROM json_each(data, '$.skills') WHERE lower(json_each.value) IN ({placeholders}))"
+            )
+            params.extend(skills)
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        where = " WHERE " + " AND ".join(clauses) if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT data FROM jobs{where} ORDER BY id LIMIT ?", (*params, limit)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def get_job(self, job_id: str) -> Optional[Job]:
+        found = self._load("jobs", "SELECT data FROM jobs WHERE id = ?", (job_id,))
+        return found[0] if found else None
+
+    def get_candidates(self) -> List[Candidate]:
+        return self._load("candidates", "SELECT data FROM candidates ORDER BY rowid")
+
+    def get_candidate(self, candidate_id: str) -> Optional[Candidate]:
+        found = self._load("candidates", "SELECT data FROM candidates WHERE id = ?", (candidate_id,))
+        return found[0] if found else None
+
+    def get_companies(self) -> List[Company]:
+        return self._load("companies", "SELECT data FROM companies ORDER BY rowid")
+
+    def get_company(self, company_id: str) -> Optional[Company]:
+        found = self._load("companies", "SELECT data FROM companies WHERE id = ?", (company_id,))
+        return found[0] if found else None
+
+    def get_applications(self) -> List[Application]:
+        return self._load("applications", "SELECT data FROM applications ORDER BY rowid")
+
+    def _application_filters(
+        self,
+        candidate_id: Optional[str] = None,
+        job_id: Optional[str] = None,
+        status: Optional[str] = None
+    ) -> Tuple[str, tuple]:
+        clauses, params = [], []
+        for column, value in (("candidate_id", candidate_id), ("job_id", job_id), ("status", status)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), tuple(params)
+
+    def get_applications_for_candidate(self, candidate_id: str, status: Optional[str] = None) -> List[Application]:
+        where, params = self._application_filters(candidate_id=candidate_id, status=status)
+        return self._load("applications", f"SELECT data FROM applications{where} ORDER BY rowid", params)
+
+    def get_applications_for_job(self, job_id: str, status: Optional[str] = None) -> List[Application]:
+        where, params = self._application_filters(job_id=job_id, status=status)
+        return self._load("applications", f"SELECT data FROM applications{where} ORDER BY rowid", params)
+
+    def count_by_status(self, candidate_id: Optional[str] = None, job_id: Optional[str] = None) -> Dict[str, int]:
+        """Application counts per status, optionally for one candidate and/or job"""
+        where, params = self._application_filters(candidate_id=candidate_id, job_id=job_id)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT status, COUNT(*) FROM applications{where} GROUP BY status", params
+            ).fetchall()
+        return dict(rows)
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                table: self._conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                for table in TABLE_GETTERS
+            }
+
+
+class ContractIndexer:
+    """Mirrors contract state into a ContractStore by following contract events
+
+    Events carry their IDs as indexed (hashed) strings, so the plain-text IDs are
+    recovered from the emitting transaction's calldata and matched against the
+    topic hash. The current entity is then read once per ID per block range.
+    Profile score updates emit no event, so candidates and companies are also
+    re-read in full every ``profile_refresh_blocks`` blocks.
+    """
+
+    def __init__(
+        self,
+        client: ContractClient,
+        store: ContractStore,
+        block_range: int = INDEXER_BLOCK_RANGE,
+        reorg_depth: int = INDEXER_REORG_DEPTH,
+        confirmations: int = INDEXER_CONFIRMATIONS,
+        start_block: Optional[int] = None,
+        profile_refresh_blocks: int = INDEXER_PROFILE_REFRESH_BLOCKS
+    ):
+        self.client = client
+        self.store = store
+        self.block_range = block_range
+        self.reorg_depth = reorg_depth
+        self.confirmations = confirmations
+        self.start_block = start_block
+        self.profile_refresh_blocks = profile_refresh_blocks
+        # Block of the last full read of PROFILE_TABLES; None until the first one
+        self._profiles_read_at: Optional[int] = None
+        self._topics = {event_topic(name): name for name in EVENT_SOURCES}
+
+    @property
+    def w3(self) -> AsyncWeb3:
+        return self.client.w3
+
+    @property
+    def contract(self):
+        return self.client.contract
+
+    async def _block_hash(self, block_number: int) -> str:
+        block = await self.client._call(self.w3.eth.get_block(block_number), method="eth_getBlockByNumber")
+        return block["hash"].hex()
+
+    def _parse(self, table: str, data) -> Any:
+        return {
+            "jobs": self.client._job_from_tuple,
+            "candidates": self.client._candidate_from_tuple,
+            "companies": self.client._company_from_tuple,
+            "applications": self.client._application_from_tuple,
+        }[table](data)
+
+    async def _fetch_entities(self, table: str, ids, block_identifier) -> Tuple[List[Any], List[str]]:
+        """Batch-read many entities; returns (found entities, IDs that no longer exist)"""
+        ids = list(ids)
+        if not ids:
+            return [], []
+        lookup = await self.client.batch_view(
+            TABLE_GETTERS[table][0], ids, lambda data: self._parse(table, data), block_identifier
+        )
+        failed = {key: error for key, error in lookup.errors.items() if error != "not found"}
+        if failed:
+            # Leave the watermark where it is so the range is retried on the next sync
+            raise RuntimeError(f"Could not read {len(failed)} {table} entries, e.g. {next(iter(failed.items()))}")
+        missing = [entity_key for entity_key in ids if entity_key not in lookup.items]
+        return list(lookup.items.values()), missing
+
+    async def _snapshot_table(self, table: str, block_identifier) -> List[Any]:
+        all_getter = TABLE_GETTERS[table][1]
+        rows = await self.client._call(
+            getattr(self.contract.functions, all_getter)().call(block_identifier=block_identifier),
+            method="eth_call", function=all_getter
+        )
+        return [self._parse(table, row) for row in rows]
+
+    async def _snapshot(self, block_identifier) -> Dict[str, List[Any]]:
+        tables = list(TABLE_GETTERS)
+        results = await asyncio.gather(*(self._snapshot_table(table, block_identifier) for table in tables))
+        return dict(zip(tables, results))
+
+    async def bootstrap(self, head: int):
+        """Seed the store, either from a full snapshot or an empty state at ``start_block``"""
+        if self.start_block is not None:
+            anchor = max(self.start_block - 1, 0)
+            self.store.replace_all(anchor, await self._block_hash(anchor), {})
+            self._refresh_caches(None)
+            logger.info(f"Contract indexer replaying events from block {self.start_block}")
+            return
+        snapshot = await self._snapshot(head)
+        self.store.replace_all(head, await self._block_hash(head), snapshot)
+        self._profiles_read_at = head
+        self._refresh_caches(None)
+        logger.info(f"Contract store bootstrapped at block {head}: { {t: len(v) for t, v in snapshot.items()} }")
+
+    async def _calls_in_transaction(self, tx_hash) -> List[Tuple[str, Dict[str, Any]]]:
+        """Contract calls made by a transaction, as (function name, arguments)"""
+        tx = await self.client._call(self.w3.eth.get_transaction(tx_hash), method="eth_getTransactionByHash")
+        try:
+            function, args = self.contract.decode_function_input(tx["input"])
+            return [(function.fn_name, args)]
+        except Exception:
+            pass
+        # Batched submissions go through Multicall3.aggregate3; unpack the calls aimed at our contract
+        try:
+            _, batch_args = self.client.multicall.decode_function_input(tx["input"])
+        except Exception:
+            return []
+        calls = []
+        for call in batch_args["calls"]:
+            if call["target"].lower() != self.contract.address.lower():
+                continue
+            try:
+                function, args = self.contract.decode_function_input(call["callData"])
+            except Exception:
+                continue
+            calls.append((function.fn_name, args))
+        return calls
+
+    async def _resolve_ids(self, logs: List[Dict[str, Any]]) -> Tuple[Dict[str, Set[str]], Set[str]]:
+        """Plain-text IDs touched by the logs, plus tables with unresolvable events"""
+        touched: Dict[str, Set[str]] = defaultdict(set)
+        unresolved: Set[str] = set()
+        tx_hashes = list(dict.fromkeys(log["transactionHash"] for log in logs))
+        calls = await asyncio.gather(*(self._calls_in_transaction(tx_hash) for tx_hash in tx_hashes))
+        calls_by_tx = dict(zip(tx_hashes, calls))
+
+        for log in logs:
+            event_name = self._topics.get(bytes(log["topics"][0]))
+            if event_name is None:
+                continue
+            table, function_name, arg_name = EVENT_SOURCES[event_name]
+            id_topic = bytes(log["topics"][1])
+
+            match = None
+            for name, args in calls_by_tx[log["transactionHash"]]:
+                if name == function_name and bytes(Web3.keccak(text=args[arg_name])) == id_topic:
+                    match = args[arg_name]
+                    break
+            if match is None:
+                unresolved.add(table)
+            else:
+                touched[table].add(match)
+        return touched, unresolved
+
+    def _refresh_caches(self, block_number: Optional[int], tables: Optional[Set[str]] = None):
+        """Drop cached client reads made stale by new events; everything when block_number is None"""
+        if block_number is None:
+            self.client.view_cache.invalidate()
+            self.client.store_cache.invalidate()
+            return
+        if tables:
+            self.client.view_cache.invalidate(name for table in tables for name in TABLE_GETTERS[table])
+            # Store reads are keyed by watermark, which a profile refresh does not move
+            self.client.store_cache.invalidate(tables)
+        self.client.view_cache.observe_block(block_number + self.confirmations)
+        self.client.store_cache.observe_block(block_number)
+
+    async def _ingest_range(self, from_block: int, to_block: int):
+        logs = await self.client._call(self.w3.eth.get_logs({
+            "address": self.contract.address,
+            "fromBlock": from_block,
+            "toBlock": to_block,
+            "topics": [list(self._topics)],
+        }), method="eth_getLogs")
+        touched, unresolved = await self._resolve_ids(logs)
+
+        upserts: Dict[str, List[Any]] = defaultdict(list)
+        deletes: Dict[str, List[str]] = defaultdict(list)
+        for table, ids in touched.items():
+            if table in unresolved:
+                continue
+            upserts[table], deletes[table] = await self._fetch_entities(table, ids, to_block)
+
+        # Events we could not tie to an ID (e.g. sent through another contract) force a table refresh
+        for table in unresolved:
+            logger.info(f"Refreshing {table} from snapshot after unresolved events in {from_block}-{to_block}")
+            upserts[table] = await self._snapshot_table(table, to_block)
+
+        self.store.apply(to_block, await self._block_hash(to_block), upserts, deletes, self.reorg_depth)
+        self._refresh_caches(to_block, set(touched) | unresolved)
+        if logs:
+            logger.info(f"Indexed {len(logs)} events in blocks {from_block}-{to_block}")
+
+    async def refresh_profiles(self, block_number: int):
+        """Re-read every candidate and company, picking up profile score updates that emit no event"""
+        tables = await asyncio.gather(*(self._snapshot_table(table, block_number) for table in PROFILE_TABLES))
+        upserts = dict(zip(PROFILE_TABLES, tables))
+        self.store.apply(block_number, await self._block_hash(block_number), upserts, {}, self.reorg_depth)
+        self._profiles_read_at = block_number
+        self._refresh_caches(block_number, set(PROFILE_TABLES))
+
+    def _profiles_due(self, watermark: int) -> bool:
+        if self.profile_refresh_blocks <= 0:
+            return False
+        return self._profiles_read_at is None or watermark - self._profiles_read_at >= self.profile_refresh_blocks
+
+    async def _handle_reorg(self, watermark: int, head: int) -> int:
+        """Return the block to resume from, rewinding past any reorganised blocks"""
+        for block_number, stored_hash in self.store.checkpoints():
+            if block_number > head:
+                continue
+            if await self._block_hash(block_number) != stored_hash:
+                continue
+            if block_number == watermark:
+                return watermark
+
+            logger.warning(f"Chain reorganisation detected; rewinding contract store from {watermark} to {block_number}")
+            upserts: Dict[str, List[Any]] = defaultdict(list)
+            deletes: Dict[str, List[str]] = defaultdict(list)
+            for table, ids in self.store.touched_after(block_number).items():
+                upserts[table], deletes[table] = await self._fetch_entities(table, ids, head)
+            self.store.rewind(block_number)
+            self.store.apply(block_number, stored_hash, upserts, deletes, self.reorg_depth)
+            self._refresh_caches(None)
+            return block_number
+
+        logger.warning("No common ancestor within reorg depth; rebuilding contract store")
+        self.store.reset()
+        self._refresh_caches(None)
+        await self.bootstrap(head)
+        return self.store.get_watermark()
+
+    async def sync_once(self) -> int:
+        """Catch the store up to the chain head; returns the new watermark"""
+        head = await self.client._call(self.w3.eth.block_number, method="eth_blockNumber") - self.confirmations
+        watermark = self.store.get_watermark()
+        if watermark is None:
+            await self.bootstrap(head)
+            watermark = self.store.get_watermark()
+        else:
+            watermark = await self._handle_reorg(watermark, head)
+
+        while watermark < head:
+            to_block = min(watermark + self.block_range, head)
+            await self._ingest_range(watermark + 1, to_block)
+            watermark = to_block
+
+        if self._profiles_due(watermark):
+            await self.refresh_profiles(watermark)
+        return watermark
+
+    async def run_forever(self, poll_seconds: float = INDEXER_POLL_SECONDS):
+        """Keep the store in sync until cancelled"""
+        while True:
+            try:
+                await self.sync_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Contract indexer sync failed: {e}")
+            await asyncio.sleep(poll_seconds)
+
+
+# Global store and indexer for the configured contract
+contract_store = ContractStore(contract_address=contract_client.contract_address)
+contract_indexer = ContractIndexer(
+    contract_client,
+    contract_store,
+    start_block=int(INDEXER_START_BLOCK) if INDEXER_START_BLOCK else None
+)
@@ -0,0 +1,29 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+/// aggregate3 subset of Multicall3 (https://github.com/mds1/multicall) for local chains.
+/// Public networks already have the canonical deployment at
+/// 0xcA11bde05977b3631167028862bE2a173976CA11.
+contract Multicall3 {
+    struct Call3 {
+        address target;
+        bool allowFailure;
+        bytes callData;
+    }
+
+    struct Result {
+        bool success;
+        bytes returnData;
+    }
+
+    function aggregate3(Call3[] calldata calls) public payable returns (Result[] memory returnData) {
+        uint256 length = calls.length;
+        returnData = new Result[](length);
+        for (uint256 i = 0; i < length; i++) {
+            Result memory result = returnData[i];
+            Call3 calldata call = calls[i];
+            (result.success, result.returnData) = call.target.call(call.callData);
+            require(call.allowFailure || result.success, "Multicall3: call failed");
+        }
+    }
+}
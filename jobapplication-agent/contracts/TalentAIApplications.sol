@@ -0,0 +1,213 @@
+// SPDX-License-Identifier: MIT
+pragma solidity ^0.8.20;
+
+/// Development build of the job platform contract. It exposes the same ABI as
+/// contract_abi.json so the agent can be run against a local eth-tester/anvil chain.
+contract TalentAIApplications {
+    enum Location { REMOTE, HYBRID, ONSITE }
+    enum JobType { FULLTIME, PARTTIME, CONTRACT, INTERNSHIP, FREELANCE }
+    enum JobStatus { ACTIVE, INACTIVE }
+    enum ApplicationStatus { PENDING, REVIEWED, ACCEPTED, REJECTED }
+
+    struct Candidate {
+        string candidateId;
+        string name;
+        string[] description;
+        string[] contacts;
+        string[] education;
+        string[] skills;
+        string[] resumePath;
+        string profileScore;
+    }
+
+    struct Company {
+        string companyId;
+        string image;
+        string name;
+        string[] contacts;
+        string description;
+        string[] misc;
+        string companyScore;
+    }
+
+    struct Job {
+        string jobId;
+        string companyId;
+        string title;
+        string description;
+        string[] requirements;
+        string[] skills;
+        Location location;
+        string[] salaryRange;
+        JobType jobType;
+        JobStatus status;
+    }
+
+    struct Application {
+        string applicationId;
+        string jobId;
+        string candidateId;
+        string applicationDate;
+        ApplicationStatus status;
+    }
+
+    mapping(string => Candidate) public candidates;
+    mapping(string => Company) public companies;
+    mapping(string => Job) public jobs;
+    mapping(string => Application) public applications;
+
+    string[] private candidateIds;
+    string[] private companyIds;
+    string[] private jobIds;
+    string[] private applicationIds;
+
+    event CandidateRegistered(string indexed candidateId, string name);
+    event CompanyRegistered(string indexed companyId, string name);
+    event JobPosted(string indexed jobId, string indexed companyId, string title);
+    event ApplicationSubmitted(string indexed applicationId, string indexed jobId, string indexed candidateId);
+    event ApplicationStatusUpdated(string indexed applicationId, ApplicationStatus status);
+
+    function _exists(string storage id) private view returns (bool) {
+        return bytes(id).length > 0;
+    }
+
+    function sayHello() external pure returns (string memory) {
+        return "Hello from TalentAIApplications";
+    }
+
+    function registerCandidate(
+        string memory _candidateId,
+        string memory _name,
+        string[] memory _description,
+        string[] memory _contacts,
+        string[] memory _education,
+        string[] memory _skills,
+        string[] memory _resumePath,
+        string memory _profileScore
+    ) external {
+        require(bytes(_candidateId).length > 0, "Candidate ID required");
+        if (!_exists(candidates[_candidateId].candidateId)) {
+            candidateIds.push(_candidateId);
+        }
+        candidates[_candidateId] = Candidate(
+            _candidateId, _name, _description, _contacts, _education, _skills, _resumePath, _profileScore
+        );
+        emit CandidateRegistered(_candidateId, _name);
+    }
+
+    function registerCompany(
+        string memory _companyId,
+        string memory _image,
+        string memory _name,
+        string[] memory _contacts,
+        string memory _description,
+        string[] memory _misc,
+        string memory _companyScore
+    ) external {
+        require(bytes(_companyId).length > 0, "Company ID required");
+        if (!_exists(companies[_companyId].companyId)) {
+            companyIds.push(_companyId);
+        }
+        companies[_companyId] = Company(_companyId, _image, _name, _contacts, _description, _misc, _companyScore);
+        emit CompanyRegistered(_companyId, _name);
+    }
+
+    function postJob(
+        string memory _jobId,
+        string memory _companyId,
+        string memory _title,
+        string memory _description,
+        string[] memory _requirements,
+        string[] memory _skills,
+        Location _location,
+        string[] memory _salaryRange,
+        JobType _jobType
+    ) external {
+        require(bytes(_jobId).length > 0, "Job ID required");
+        require(_exists(companies[_companyId].companyId), "Company not registered");
+        if (!_exists(jobs[_jobId].jobId)) {
+            jobIds.push(_jobId);
+        }
+        jobs[_jobId] = Job(
+            _jobId, _companyId, _title, _description, _requirements, _skills,
+            _location, _salaryRange, _jobType, JobStatus.ACTIVE
+        );
+        emit JobPosted(_jobId, _companyId, _title);
+    }
+
+    function submitApplication(
+        string memory _applicationId,
+        string memory _jobId,
+        string memory _candidateId,
+        string memory _applicationDate
+    ) external {
+        require(!_exists(applications[_applicationId].applicationId), "Application already exists");
+        require(_exists(jobs[_jobId].jobId), "Job not found");
+        require(_exists(candidates[_candidateId].candidateId), "Candidate not found");
+        applications[_applicationId] = Application(
+            _applicationId, _jobId, _candidateId, _applicationDate, ApplicationStatus.PENDING
+        );
+        applicationIds.push(_applicationId);
+        emit ApplicationSubmitted(_applicationId, _jobId, _candidateId);
+    }
+
+    function updateApplicationStatus(string memory _applicationId, ApplicationStatus _status) external {
+        require(_exists(applications[_applicationId].applicationId), "Application not found");
+        applications[_applicationId].status = _status;
+        emit ApplicationStatusUpdated(_applicationId, _status);
+    }
+
+    function updateCandidateProfileScore(string memory _candidateId, string memory _newScore) external {
+        require(_exists(candidates[_candidateId].candidateId), "Candidate not found");
+        candidates[_candidateId].profileScore = _newScore;
+    }
+
+    function updateCompanyProfileScore(string memory _companyId, string memory _newScore) external {
+        require(_exists(companies[_companyId].companyId), "Company not found");
+        companies[_companyId].companyScore = _newScore;
+    }
+
+    function getCandidate(string memory _candidateId) external view returns (Candidate memory) {
+        return candidates[_candidateId];
+    }
+
+    function getCompany(string memory _companyId) external view returns (Company memory) {
+        return companies[_companyId];
+    }
+
+    function getJob(string memory _jobId) external view returns (Job memory) {
+        return jobs[_jobId];
+    }
+
+    function getApplication(string memory _applicationId) external view returns (Application memory) {
+        return applications[_applicationId];
+    }
+
+    function getAllCandidates() external view returns (Candidate[] memory result) {
+        result = new Candidate[](candidateIds.length);
+        for (uint256 i = 0; i < candidateIds.length; i++) {
+            result[i] = candidates[candidateIds[i]];
+        }
+    }
+
+    function getAllCompanies() external view returns (Company[] memory result) {
+        result = new Company[](companyIds.length);
+        for (uint256 i = 0; i < companyIds.length; i++) {
+            result[i] = companies[companyIds[i]];
+        }
+    }
+
+    function getAllJobs() external view returns (Job[] memory result) {
+        result = new Job[](jobIds.length);
+        for (uint256 i = 0; i < jobIds.length; i++) {
+            result[i] = jobs[jobIds[i]];
+        }
+    }
+
+    function getAllApplications() external view returns (Application[] memory result) {
+        result = new Application[](applicationIds.length);
+        for (uint256 i = 0; i < applicationIds.length; i++) {
+            result[i] = applications[applicationIds[i]];
+        }
+    }
+}
@@ -0,0 +1,135 @@
+"""Local development chain for exercising the agent without Flow testnet.
+
+Compiles the sources in contracts/ with py-solc-x and deploys them either to an
+in-process eth-tester chain (default) or to an anvil node given by DEV_CHAIN_RPC.
+Run it directly to seed a few entities and sync the contract indexer against them:
+
+    python dev_chain.py
+"""
+import os
+import asyncio
+import functools
+import logging
+from typing import Dict, List, Tuple
+from web3 import AsyncWeb3
+from web3.providers.rpc import AsyncHTTPProvider
+
+logger = logging.getLogger(__name__)
+
+CONTRACTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "contracts")
+SOLC_VERSION = os.getenv("DEV_CHAIN_SOLC_VERSION", "0.8.24")
+# A solc already on disk, used instead of downloading SOLC_VERSION (e.g. where the download host is unreachable)
+SOLC_BINARY = os.getenv("DEV_CHAIN_SOLC_BINARY")
+
+
+@functools.lru_cache(maxsize=None)
+def compile_contract(name: str) -> Tuple[List[Dict], str]:
+    """Compile contracts/<name>.sol and return (abi, bytecode); compiled once per process"""
+    import solcx
+
+    if SOLC_BINARY:
+        compiler = {"solc_binary": SOLC_BINARY}
+    else:
+        if SOLC_VERSION not in {str(v) for v in solcx.get_installed_solc_versions()}:
+            try:
+                solcx.install_solc(SOLC_VERSION)
+            except Exception as e:
+                raise RuntimeError(
+                    f"Could not install solc {SOLC_VERSION} ({e}); set DEV_CHAIN_SOLC_BINARY to a local solc"
+                ) from e
+        compiler = {"solc_version": SOLC_VERSION}
+    source_path = os.path.join(CONTRACTS_DIR, f"{name}.sol")
+    compiled = solcx.compile_files(
+        [source_path],
+        output_values=["abi", "bin"],
+        optimize=True,
+        **compiler
+    )
+    artifact = compiled[f"{source_path}:{name}"]
+    return artifact["abi"], artifact["bin"]
+
+
+def connect() -> AsyncWeb3:
+    """anvil when DEV_CHAIN_RPC is set, otherwise a fresh eth-tester chain"""
+    rpc_url = os.getenv("DEV_CHAIN_RPC")
+    if rpc_url:
+        return AsyncWeb3(AsyncHTTPProvider(rpc_url))
+    from web3.providers.eth_tester import AsyncEthereumTesterProvider
+    return AsyncWeb3(AsyncEthereumTesterProvider())
+
+
+async def deploy(w3: AsyncWeb3, name: str) -> str:
+    """Deploy a contract from contracts/ using the first unlocked account; returns its address"""
+    abi, bytecode = compile_contract(name)
+    accounts = await w3.eth.accounts
+    factory = w3.eth.contract(abi=abi, bytecode=bytecode)
+    tx_hash = await factory.constructor().transact({"from": accounts[0]})
+    receipt = await w3.eth.wait_for_transaction_receipt(tx_hash)
+    logger.info(f"Deployed {name} at {receipt.contractAddress}")
+    return receipt.contractAddress
+
+
+async def fund(w3: AsyncWeb3, address: str, ether: int = 100):
+    """Send ether from the first unlocked account, e.g. to a wallet used through PRIVATE_KEY"""
+    sender = (await w3.eth.accounts)[0]
+    tx_hash = await w3.eth.send_transaction({"from": sender, "to": address, "value": w3.to_wei(ether, "ether")})
+    await w3.eth.wait_for_transaction_receipt(tx_hash)
+
+
+async def seed_platform(w3: AsyncWeb3, contract, companies: int = 2, jobs: int = 10, candidates: int = 3) -> Dict[str, List[str]]:
+    """Register sample companies, jobs and candidates; returns the IDs created"""
+    sender = {"from": (await w3.eth.accounts)[0]}
+    skills_pool = ["Python", "FastAPI", "Machine Learning", "SQL", "React", "Solidity", "Docker", "AWS"]
+    created = {"companies": [], "jobs": [], "candidates": []}
+
+    for i in range(companies):
+        company_id = f"company{i}"
+        await contract.functions.registerCompany(
+            company_id, "", f"Company {i}", [f"hr@company{i}.dev"], "Sample company", [], "80"
+        ).transact(sender)
+        created["companies"].append(company_id)
+
+    for i in range(jobs):
+        job_id = f"job{i}"
+        skills = [skills_pool[(i + k) % len(skills_pool)] for k in range(3)]
+        await contract.functions.postJob(
+            job_id, f"company{i % companies}", f"Engineer {i}", f"Work with {', '.join(skills)}",
+            skills[:2], skills, i % 3, ["90000", "120000"], i % 5
+        ).transact(sender)
+        created["jobs"].append(job_id)
+
+    for i in range(candidates):
+        candidate_id = f"candidate{i}"
+        await contract.functions.registerCandidate(
+            candidate_id, f"Candidate {i}", ["Engineer"], [f"candidate{i}@example.com"],
+            ["BS Computer Science"], skills_pool[i:i + 4], [], "70"
+        ).transact(sender)
+        created["candidates"].append(candidate_id)
+
+    return created
+
+
+async def main():
+    from contract_factory import ContractClient
+    from contract_indexer import ContractIndexer, ContractStore
+
+    w3 = connect()
+    address = await deploy(w3, "TalentAIApplications")
+    client = ContractClient(w3=w3, contract_address=address)
+    created = await seed_platform(w3, client.contract)
+
+    store = ContractStore(":memory:", contract_address=address)
+    indexer = ContractIndexer(client, store, start_block=1)
+    await indexer.sync_once()
+    await client.contract.functions.submitApplication(
+        "app0", created["jobs"][0], created["candidates"][0], "2024-01-01"
+    ).transact({"from": (await w3.eth.accounts)[0]})
+    await indexer.sync_once()
+
+    print(f"Watermark: {store.get_watermark()}  rows: {store.counts()}")
+    print(f"Applications for candidate0: {store.get_applications_for_candidate('candidate0')}")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(main())
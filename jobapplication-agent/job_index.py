@@ -0,0 +1,115 @@
+import re
+import logging
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+from models import Job
+
+logger = logging.getLogger(__name__)
+
+# Words that show up in requirement phrases but say nothing about a skill
+STOPWORDS = {
+    "a", "an", "and", "or", "the", "of", "in", "on", "with", "for", "to", "at",
+    "experience", "experienced", "years", "year", "yrs", "plus", "knowledge",
+    "strong", "good", "solid", "working", "proficiency", "proficient", "skills",
+    "skill", "familiarity", "familiar", "understanding", "ability", "degree",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def normalize_skill(value: str) -> str:
+    """Lowercase a skill/requirement and collapse punctuation and whitespace"""
+    return " ".join(word.rstrip(".") for word in _TOKEN_RE.findall(value.lower()))
+
+
+def skill_tokens(values: Iterable[str]) -> Set[str]:
+    """Normalized tokens for a list of skills: each full phrase plus its content words"""
+    tokens = set()
+    for value in values:
+        phrase = normalize_skill(value)
+        if not phrase:
+            continue
+        tokens.add(phrase)
+        for word in phrase.split():
+            if word not in STOPWORDS and not word.isdigit():
+                tokens.add(word)
+    return tokens
+
+
+class JobSkillIndex:
+    """Inverted index from normalized skill/requirement tokens to job IDs"""
+
+    def __init__(self):
+        self._postings: Dict[str, Set[str]] = defaultdict(set)
+        self._job_tokens: Dict[str, Set[str]] = {}
+        self._jobs: Dict[str, Job] = {}
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def add_job(self, job: Job):
+        """Index a job, replacing any previous entry with the same ID"""
+        existing = self._jobs.get(job.jobId)
+        if existing is not None and existing == job:
+            return
+        if existing is not None:
+            self.remove_job(job.jobId)
+
+        tokens = skill_tokens(job.skills + job.requirements)
+        for token in tokens:
+            self._postings[token].add(job.jobId)
+        self._job_tokens[job.jobId] = tokens
+        self._jobs[job.jobId] = job
+
+    def remove_job(self, job_id: str):
+        """Drop a job and its postings from the index"""
+        for token in self._job_tokens.pop(job_id, set()):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(job_id)
+            if not postings:
+                del self._postings[token]
+        self._jobs.pop(job_id, None)
+
+    def sync(self, jobs: List[Job]):
+        """Bring the index in line with the given job list"""
+        current_ids = {job.jobId for job in jobs}
+        for job_id in list(self._jobs):
+            if job_id not in current_ids:
+                self.remove_job(job_id)
+        for job in jobs:
+            self.add_job(job)
+
+    def rank(self, skills: List[str], top_k: int = 0, min_overlap: int = 1) -> List[Tuple[Job, int]]:
+        """Rank indexed jobs by token overlap with the given skills
+
+        Jobs with fewer than ``min_overlap`` shared tokens are dropped. Ties are broken
+        by the share of the job's own tokens that are covered. ``top_k <= 0`` means no limit.
+        """
+        overlap: Dict[str, int] = defaultdict(int)
+        for token in skill_tokens(skills):
+            for job_id in self._postings.get(token, ()):
+                overlap[job_id] += 1
+        if min_overlap <= 0:
+            for job_id in self._jobs:
+                overlap.setdefault(job_id, 0)
+
+        ranked = [
+            (job_id, count)
+            for job_id, count in overlap.items()
+            if count >= min_overlap
+        ]
+        ranked.sort(key=lambda item: (
+            -item[1],
+            -item[1] / max(len(self._job_tokens[item[0]]), 1),
+            item[0]
+        ))
+        if top_k > 0:
+            ranked = ranked[:top_k]
+
+        return [(self._jobs[job_id], count) for job_id, count in ranked]
+
+
+# Global index shared across searches
+job_index = JobSkillIndex()
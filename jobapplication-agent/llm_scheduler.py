@@ -0,0 +1,336 @@
+import os
+import time
+import random
+import asyncio
+import logging
+import contextvars
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, Optional, Tuple
+from prompt_budget import count_tokens
+from metrics import llm_queue_seconds, llm_request_seconds, llm_tokens
+
+logger = logging.getLogger(__name__)
+
+# Account-level OpenAI limits shared by every caller in the process
+LLM_RPM_LIMIT = int(os.getenv("LLM_RPM_LIMIT", "500"))
+LLM_TPM_LIMIT = int(os.getenv("LLM_TPM_LIMIT", "200000"))
+# Bounds for the adaptive number of requests in flight
+LLM_MIN_CONCURRENCY = int(os.getenv("LLM_MIN_CONCURRENCY", "1"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+# Requests slower than this shrink the concurrency limit
+LLM_TARGET_LATENCY_SECONDS = float(os.getenv("LLM_TARGET_LATENCY_SECONDS", "15"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+# Retries wait a random time up to backoff * 2^attempt (full jitter), capped at the max
+LLM_BACKOFF_SECONDS = float(os.getenv("LLM_BACKOFF_SECONDS", "1.0"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+# Completion tokens reserved against the TPM budget until the real usage is known
+LLM_OUTPUT_TOKENS_ESTIMATE = int(os.getenv("LLM_OUTPUT_TOKENS_ESTIMATE", "300"))
+
+DEFAULT_TENANT = "default"
+
+# Who the current LLM calls are made for; graph nodes set it to the candidate ID
+llm_tenant: contextvars.ContextVar[str] = contextvars.ContextVar("llm_tenant", default=DEFAULT_TENANT)
+
+
+class TokenBucket:
+    """Refills ``per_minute`` units per minute up to a one-minute burst"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def delay(self, amount: float) -> float:
+        """Seconds until ``amount`` units are available (0 when they are now)"""
+        self._refill()
+        # Requests larger than the whole bucket only wait for a full bucket
+        needed = min(amount, self.capacity) - self.tokens
+        return needed / self.rate if needed > 0 else 0.0
+
+    def consume(self, amount: float):
+        """Take ``amount`` units (negative amounts give units back)"""
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - amount)
+
+    def drain(self):
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+
+class _Waiter:
+    __slots__ = ("tenant", "tokens", "future")
+
+    def __init__(self, tenant: str, tokens: int, future: asyncio.Future):
+        self.tenant = tenant
+        self.tokens = tokens
+        self.future = future
+
+
+def _message_text(messages: Any) -> str:
+    if isinstance(messages, str):
+        return messages
+    parts = []
+    for message in messages if isinstance(messages, (list, tuple)) else [messages]:
+        content = getattr(message, "content", message)
+        parts.append(content if isinstance(content, str) else str(content))
+    return "\n".join(parts)
+
+
+def _classify_error(error: Exception) -> Tuple[bool, bool]:
+    """(retryable, rate_limited) for an exception raised by the model client"""
+    status = getattr(error, "status_code", None)
+    name = type(error).__name__
+    if status == 429 or name == "RateLimitError":
+        return True, True
+    if (status is not None and status >= 500) or name in ("APIConnectionError", "APITimeoutError"):
+        return True, False
+    return False, False
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMScheduler:
+    """Process-wide admission control for LLM requests
+
+    Every request waits for a slot under the adaptive concurrency limit and for
+    room in the RPM and TPM token buckets. Waiting requests are queued per tenant
+    and granted round-robin across tenants, so one large search cannot starve
+    other candidates. The concurrency limit grows by one per window of fast
+    successes and halves on a 429. Retryable errors, including attempts that
+    exceed the caller's per-attempt timeout, are retried with full-jitter
+    exponential backoff, and a 429 also pauses dispatch for its Retry-After.
+    """
+
+    def __init__(
+        self,
+        rpm_limit: int = LLM_RPM_LIMIT,
+        tpm_limit: int = LLM_TPM_LIMIT,
+        min_concurrency: int = LLM_MIN_CONCURRENCY,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        target_latency: float = LLM_TARGET_LATENCY_SECONDS,
+        max_retries: int = LLM_MAX_RETRIES,
+        backoff_seconds: float = LLM_BACKOFF_SECONDS,
+        backoff_max_seconds: float = LLM_BACKOFF_MAX_SECONDS
+    ):
+        self.requests_bucket = TokenBucket(rpm_limit)
+        self.tokens_bucket = TokenBucket(tpm_limit)
+        self.min_concurrency = max(1, min_concurrency)
+        self.max_concurrency = max(self.min_concurrency, max_concurrency)
+        self.concurrency_limit = float(self.max_concurrency)
+        self.target_latency = target_latency
+        self.max_retries = max_retries
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.in_flight = 0
+        self._queues: "OrderedDict[str, Deque[_Waiter]]" = OrderedDict()
+        self._paused_until = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self.requests = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self.failures = 0
+        self.latency_ewma: Optional[float] = None
+
+    def wrap(self, model: Any) -> "ScheduledModel":
+        return ScheduledModel(model, self)
+
+    # Admission
+
+    def _wake(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _acquire(self, tenant: str, tokens: int):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._wakeup = asyncio.Event()
+            self._dispatcher = asyncio.create_task(self._dispatch())
+        waiter = _Waiter(tenant, tokens, asyncio.get_running_loop().create_future())
+        self._queues.setdefault(tenant, deque()).append(waiter)
+        self._wake()
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Granted just as the caller gave up; hand the slot back
+                self._release()
+            raise
+
+    def _next_waiter(self) -> Optional[_Waiter]:
+        """Head of the next tenant's queue in round-robin order, dropping abandoned waiters"""
+        for tenant in list(self._queues):
+            queue = self._queues[tenant]
+            while queue and queue[0].future.done():
+                queue.popleft()
+            if not queue:
+                del self._queues[tenant]
+                continue
+            return queue[0]
+        return None
+
+    async def _dispatch(self):
+        while True:
+            waiter = self._next_waiter()
+            delay = None
+            if waiter is not None and self.in_flight < int(self.concurrency_limit):
+                delay = max(
+                    self._paused_until - time.monotonic(),
+                    self.requests_bucket.delay(1),
+                    self.tokens_bucket.delay(waiter.tokens)
+                )
+                if delay <= 0:
+                    queue = self._queues[waiter.tenant]
+                    queue.popleft()
+                    # Move this tenant behind the others so the next grant goes elsewhere
+                    self._queues.move_to_end(waiter.tenant)
+                    self.requests_bucket.consume(1)
+                    self.tokens_bucket.consume(waiter.tokens)
+                    self.in_flight += 1
+                    waiter.future.set_result(None)
+                    continue
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+            except asyncio.TimeoutError:
+                pass
+
+    def _release(self):
+        self.in_flight -= 1
+        self._wake()
+
+    # Adaptation
+
+    def _on_success(self, latency: float, estimated_tokens: int, response: Any):
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+        if latency > self.target_latency:
+            self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit - 1)
+        else:
+            # Additive increase: about +1 per window of ``limit`` fast successes
+            self.concurrency_limit = min(self.max_concurrency, self.concurrency_limit + 1 / self.concurrency_limit)
+        usage = getattr(response, "usage_metadata", None) or {}
+        if usage.get("total_tokens"):
+            # Settle the TPM reservation against what the request really used
+            self.tokens_bucket.consume(usage["total_tokens"] - estimated_tokens)
+            llm_tokens.inc("input", amount=usage.get("input_tokens", 0))
+            llm_tokens.inc("output", amount=usage.get("output_tokens", 0))
+        else:
+            llm_tokens.inc("input_estimated", amount=estimated_tokens - LLM_OUTPUT_TOKENS_ESTIMATE)
+
+    def _on_rate_limited(self, error: Exception):
+        self.rate_limited += 1
+        self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit / 2)
+        self.requests_bucket.drain()
+        retry_after = _retry_after(error)
+        if retry_after:
+            self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        logger.warning(
+            f"LLM rate limited; concurrency limit now {int(self.concurrency_limit)}"
+            + (f", pausing {retry_after:.1f}s" if retry_after else "")
+        )
+
+    # Calls
+
+    async def invoke(
+        self, model: Any, messages: Any, tenant: Optional[str] = None, timeout: Optional[float] = None, **kwargs
+    ) -> Any:
+        """``model.ainvoke(messages)`` under the shared limits, retrying transient failures
+
+        ``timeout`` bounds each attempt's model call only; time spent queued, waiting for
+        rate limit budget or backing off between retries does not count against it.
+        """
+        tenant = tenant or llm_tenant.get()
+        estimated = count_tokens(_message_text(messages)) + LLM_OUTPUT_TOKENS_ESTIMATE
+        attempt = 0
+        while True:
+            queued = time.monotonic()
+            await self._acquire(tenant, estimated)
+            started = time.monotonic()
+            llm_queue_seconds.observe(started - queued)
+            try:
+                self.requests += 1
+                response = await asyncio.wait_for(model.ainvoke(messages, **kwargs), timeout=timeout)
+            except asyncio.CancelledError:
+                llm_request_seconds.observe(time.monotonic() - started, "cancelled")
+                raise
+            except asyncio.TimeoutError:
+                llm_request_seconds.observe(time.monotonic() - started, "timeout")
+                # A call that ran out of time was slow; treat it like a slow success for the limit
+                self.concurrency_limit = max(self.min_concurrency, self.concurrency_limit - 1)
+                if attempt >= self.max_retries:
+                    self.failures += 1
+                    raise
+            except Exception as e:
+                retryable, rate_limited = _classify_error(e)
+                llm_request_seconds.observe(
+                    time.monotonic() - started, "rate_limited" if rate_limited else "retryable" if retryable else "error"
+                )
+                if rate_limited:
+                    self._on_rate_limited(e)
+                if not retryable or attempt >= self.max_retries:
+                    self.failures += 1
+                    raise
+            else:
+                latency = time.monotonic() - started
+                llm_request_seconds.observe(latency, "ok")
+                self._on_success(latency, estimated, response)
+                return response
+            finally:
+                self._release()
+
+            delay = random.uniform(0, min(self.backoff_max_seconds, self.backoff_seconds * 2 ** attempt))
+            attempt += 1
+            self.retries += 1
+            logger.info(f"Retrying LLM request for {tenant} in {delay:.2f}s (attempt {attempt}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": int(self.concurrency_limit),
+            "in_flight": self.in_flight,
+            "queued": {
+                tenant: waiting
+                for tenant, queue in self._queues.items()
+                if (waiting := sum(not waiter.future.done() for waiter in queue))
+            },
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "failures": self.failures,
+            "latency_ewma_seconds": round(self.latency_ewma, 3) if self.latency_ewma is not None else None,
+            "rpm_available": round(self.requests_bucket.tokens, 1),
+            "tpm_available": round(self.tokens_bucket.tokens),
+        }
+
+
+class ScheduledModel:
+    """Chat model wrapper whose ``ainvoke`` goes through an LLMScheduler"""
+
+    def __init__(self, model: Any, scheduler: LLMScheduler):
+        self.model = model
+        self.scheduler = scheduler
+
+    async def ainvoke(self, messages: Any, **kwargs) -> Any:
+        return await self.scheduler.invoke(self.model, messages, **kwargs)
+
+    def invoke(self, messages: Any, **kwargs) -> Any:
+        return self.model.invoke(messages, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.model, name)
+
+
+# Global scheduler shared by every model call in the process
+llm_scheduler = LLMScheduler()
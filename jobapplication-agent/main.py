@@ -1,11 +1,15 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks, Path, Query
+from fastapi import FastAPI, HTTPException, Path, Query
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 import httpx
 import os
 import json
+import time
+import base64
 import asyncio
+import functools
 import logging
+from contextlib import asynccontextmanager
 from datetime import datetime
 from langgraph.graph import StateGraph, END
 from langchain_openai import ChatOpenAI
@@ -13,36 +17,82 @@ from dotenv import load_dotenv
 from langchain_core.messages import HumanMessage, ToolMessage, SystemMessage
 from langchain.prompts import ChatPromptTemplate
 from langchain.output_parsers import PydanticOutputParser
-from web3 import Web3
-from jobsearch_tools.PDFTool import load_pdf
+from JobSearchTool.PDFTool import load_pdf, extract_pdf_async, shutdown_executor
 from pydantic import BaseModel
-from typing import TypedDict, Optional, Dict, Any, List
+from typing import TypedDict, Optional, Dict, Any, List, Tuple, AsyncIterator
 from enum import Enum
 from models import Job, Candidate, Application, Location, JobType, ApplicationStatus, JobStatus, Company
 from contract_factory import contract_client
+from contract_indexer import contract_indexer, contract_store, CONTRACT_INDEXER_ENABLED
+from job_index import job_index
+from vector_index import job_vector_index
+from match_cache import match_cache, MATCH_CACHE_ENABLED
+from resume_cache import resume_cache
+from resume_validator import ResumeValidator
+from search_runs import search_runs, SearchRun
+from prompt_budget import (
+    MatchPromptBuilder, PROMPT_COMPACTION_ENABLED, count_tokens, job_summaries, prompt_stats, tokenizer_name
+)
+from llm_scheduler import llm_scheduler, llm_tenant
+from skill_matrix import SkillMatrix, skill_coverage
+from work_queue import work_queue, PermanentJobError, WORK_QUEUE_SEARCH_WORKERS, WORK_QUEUE_APPLY_WORKERS
+from metrics import metrics, graph_node_seconds, HTTPMetricsMiddleware
+from langchain_core.runnables import RunnableConfig
 import os
 
+try:
+    import orjson
+    json_loads = orjson.loads
+    json_dumps = orjson.dumps
+except ImportError:  # orjson is optional; it only speeds up /jobs serialization
+    json_loads = json.loads
+
+    def json_dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
 
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services with the app and stop them on shutdown"""
+    await contract_client.connect()
+    indexer_task = None
+    if CONTRACT_INDEXER_ENABLED:
+        contract_client.attach_store(contract_store)
+        indexer_task = asyncio.create_task(contract_indexer.run_forever())
+    work_queue.start()
+    try:
+        yield
+    finally:
+        await work_queue.stop()
+        await search_runs.aclose()
+        if indexer_task:
+            indexer_task.cancel()
+            try:
+                await indexer_task
+            except asyncio.CancelledError:
+                pass
+        await contract_client.aclose()
+        shutdown_executor()
 
-app = FastAPI(swagger_ui_parameters={"syntaxHighlight": {"theme": "obsidian"}}  )
+app = FastAPI(lifespan=lifespan, swagger_ui_parameters={"syntaxHighlight": {"theme": "obsidian"}}  )
 load_dotenv()
 
 HARDCODED_PRIVATE_KEY = os.getenv("PRIVATE_KEY")
 HARDCODED_WALLET_ADDRESS = os.getenv("PUBLIC_KEY")
 
 
-w3 = Web3(Web3.HTTPProvider("https://testnet.evm.nodes.onflow.org"))  # or your RPC URL
-
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # Initialize OpenAI model
-model = ChatOpenAI(model="gpt-4o-mini", temperature=0.1)
-model = model.bind_tools(tools=[load_pdf])
+MODEL_NAME = "gpt-4o-mini"
+# Retries are left to the shared scheduler, which also enforces RPM/TPM limits across requests
+model = ChatOpenAI(model=MODEL_NAME, temperature=0.1, max_retries=0)
+model = llm_scheduler.wrap(model.bind_tools(tools=[load_pdf]))
 
 
 
@@ -91,16 +141,112 @@ class JobSearchState(TypedDict):
     resume_path: Optional[str]
     application_results: Optional[List[Dict[str, Any]]]  # Add this
     applications_summary: Optional[Dict[str, Any]]  # Add this
+    resume_pages: Optional[List[Dict[str, Any]]]  # Page-level metadata from direct extraction
 
 class JobMatchEvaluation(BaseModel):
     score: float
     reasons: List[str]
     improvements: List[str]
 
+class KeyedJobMatchEvaluation(JobMatchEvaluation):
+    jobId: str
+
+class BatchJobMatchEvaluation(BaseModel):
+    evaluations: List[KeyedJobMatchEvaluation]
+
+# "direct" parses the PDF locally; "tool" asks the model to call load_pdf
+RESUME_EXTRACTION_MODE = os.getenv("RESUME_EXTRACTION_MODE", "direct")
+
+# Page sizes for GET /v2/jobs; ndjson streams read the store in pages of JOBS_STREAM_PAGE_SIZE
+JOBS_PAGE_SIZE = int(os.getenv("JOBS_PAGE_SIZE", "100"))
+JOBS_MAX_PAGE_SIZE = int(os.getenv("JOBS_MAX_PAGE_SIZE", "1000"))
+JOBS_STREAM_PAGE_SIZE = int(os.getenv("JOBS_STREAM_PAGE_SIZE", "500"))
+
+# "pipelined" sends one transaction per application back to back; "batch" packs
+# them into Multicall3 aggregate3 transactions
+APPLICATION_SUBMIT_MODE = os.getenv("APPLICATION_SUBMIT_MODE", "pipelined")
+
+# Concurrency limit and per-attempt model call timeout for AI job scoring
+MATCH_CONCURRENCY = int(os.getenv("MATCH_CONCURRENCY", "8"))
+MATCH_TIMEOUT_SECONDS = float(os.getenv("MATCH_TIMEOUT_SECONDS", "30"))
+
+# "batch" scores several jobs per request with the candidate context sent once; "single" sends one job per request
+MATCH_MODE = os.getenv("MATCH_MODE", "batch")
+# Estimated input+output tokens a batched request may use, and a hard cap on jobs per batch
+MATCH_BATCH_TOKEN_BUDGET = int(os.getenv("MATCH_BATCH_TOKEN_BUDGET", "6000"))
+MATCH_BATCH_MAX_JOBS = int(os.getenv("MATCH_BATCH_MAX_JOBS", "20"))
+# Output tokens reserved per job in a batch for its score, reasons and improvements
+MATCH_BATCH_OUTPUT_TOKENS_PER_JOB = int(os.getenv("MATCH_BATCH_OUTPUT_TOKENS_PER_JOB", "120"))
+MATCH_BATCH_TIMEOUT_SECONDS = float(os.getenv("MATCH_BATCH_TIMEOUT_SECONDS", "90"))
+
+# Shortlist size and minimum skill-token overlap for the prefilter ahead of AI scoring
+PREFILTER_TOP_K = int(os.getenv("PREFILTER_TOP_K", "50"))
+PREFILTER_MIN_OVERLAP = int(os.getenv("PREFILTER_MIN_OVERLAP", "1"))
+
+# Extra jobs pulled into the shortlist by semantic (hashed TF-IDF) similarity
+SEMANTIC_TOP_K = int(os.getenv("SEMANTIC_TOP_K", "20"))
+SEMANTIC_MIN_SCORE = float(os.getenv("SEMANTIC_MIN_SCORE", "0.15"))
+
+# Candidates ranked for a job: how many the skill-coverage prefilter passes on to AI scoring
+# (callers may ask for up to the max), the least coverage worth scoring, and AI requests in flight
+CANDIDATE_SHORTLIST_SIZE = int(os.getenv("CANDIDATE_SHORTLIST_SIZE", "50"))
+CANDIDATE_SHORTLIST_MAX = int(os.getenv("CANDIDATE_SHORTLIST_MAX", "500"))
+CANDIDATE_MIN_COVERAGE = float(os.getenv("CANDIDATE_MIN_COVERAGE", "0.05"))
+CANDIDATE_RANK_CONCURRENCY = int(os.getenv("CANDIDATE_RANK_CONCURRENCY", "8"))
+
+# Bump when the prompt or JobMatchEvaluation schema changes to invalidate cached scores
+MATCH_PROMPT_VERSION = "v1"
+
+MATCH_PROMPT = ChatPromptTemplate.from_template("""
+    Analyze job compatibility between candidate and job:
+
+    Candidate Profile:
+    - Skills: {skills}
+    - Education: {education}
+    - Resume: {resume}
+
+    Job Details:
+    - Title: {title}
+    - Company ID: {companyId}
+    - Description: {description}
+    - Requirements: {requirements}
+    - Location: {location}
+    - Job Type: {jobType}
+
+    Analyze the compatibility and provide a detailed assessment.
+    
+    {format_instructions}
+""")
+
+MATCH_BATCH_PROMPT = ChatPromptTemplate.from_template("""
+    Analyze job compatibility between one candidate and each of the jobs below.
+
+    Candidate Profile:
+    - Skills: {skills}
+    - Education: {education}
+    - Resume: {resume}
+
+    Jobs:
+    {jobs}
+
+    Assess every job independently and return exactly one evaluation per job, using its jobId.
+
+    {format_instructions}
+""")
+
+MATCH_BATCH_JOB_TEMPLATE = """[jobId: {jobId}]
+    - Title: {title}
+    - Company ID: {companyId}
+    - Description: {description}
+    - Requirements: {requirements}
+    - Location: {location}
+    - Job Type: {jobType}
+"""
+
 
 async def run_with_tools(prompt: str, context_msgs: List = None):
     """Enhanced async tool runner with context support"""
-    msgs = context_msgs or []
+    msgs = context_msgs if context_msgs is not None else []
     msgs.append(HumanMessage(content=prompt))
     
     print(f"\n=== Tool Runner Debug ===")
@@ -142,12 +288,8 @@ async def run_with_tools(prompt: str, context_msgs: List = None):
     print("=" * 25)
     return result
 
-def validate_resume_content(text: str) -> tuple[bool, str]:
-    """Validate if extracted text is actually resume content"""
-    if not text or len(text.strip()) < 50:
-        return False, "Text too short or empty"
-    
-    # Use AI to validate resume content
+async def llm_validate_resume_content(text: str) -> tuple[bool, str]:
+    """Ask the model whether the text is resume content (used for ambiguous documents)"""
     validation_prompt = f"""
     Analyze this text and determine if it appears to be resume/CV content.
     
@@ -165,17 +307,22 @@ def validate_resume_content(text: str) -> tuple[bool, str]:
     Respond with: VALID: YES/NO | REASON: explanation
     """
     
-    try:
-        result = model.invoke([HumanMessage(content=validation_prompt)])
-        response = result.content
-        
-        if "VALID: YES" in response:
-            return True, "Valid resume content detected"
-        else:
-            reason = response.split("REASON:")[-1].strip() if "REASON:" in response else "Content doesn't appear to be resume-related"
-            return False, reason
-    except Exception as e:
-        return False, f"Validation error: {str(e)}"
+    # Errors propagate so ResumeValidator.validate can count them as escalation errors
+    result = await model.ainvoke([HumanMessage(content=validation_prompt)])
+    response = result.content
+    
+    if "VALID: YES" in response:
+        return True, "Valid resume content detected"
+    else:
+        reason = response.split("REASON:")[-1].strip() if "REASON:" in response else "Content doesn't appear to be resume-related"
+        return False, reason
+
+# Local heuristic validator; only ambiguous documents reach the LLM
+resume_validator = ResumeValidator(escalate=llm_validate_resume_content)
+
+async def validate_resume_content(text: str) -> tuple[bool, str]:
+    """Validate if extracted text is actually resume content"""
+    return await resume_validator.validate(text)
 
 # async def load_candidate_profile(state: JobSearchState) -> JobSearchState:
 #     """Load candidate profile and resume"""
@@ -273,11 +420,13 @@ async def get_available_jobs() -> List[Job]:
     #     )
     # ]
 
-async def apply_to_job(application: ApplicationDetails) -> Dict[str, Any]:
+def new_application_id(application: ApplicationDetails) -> str:
+    return f"app_{application.job_id}_{application.candidate_id}_{int(datetime.now().timestamp())}"
+
+async def apply_to_job(application: ApplicationDetails, application_id: Optional[str] = None) -> Dict[str, Any]:
     """Submit application using contract with hardcoded wallet"""
+    application_id = application_id or new_application_id(application)
     try:
-        application_id = f"app_{application.job_id}_{application.candidate_id}_{int(datetime.now().timestamp())}"
-        
         success = await contract_client.submit_application(
             application_id,
             application.job_id,
@@ -303,28 +452,72 @@ async def apply_to_job(application: ApplicationDetails) -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error applying to job: {e}")
         return {
-            "application_id": f"app_{application.job_id}_{application.candidate_id}",
+            "application_id": application_id,
             "status": "failed",
             "error": str(e)
         }
 
+async def extract_resume_text(resume_path: str, mode: str = "direct") -> tuple[str, Optional[List[Dict[str, Any]]]]:
+    """Extract resume text directly in the PDF worker pool, or through LLM tool-calling when asked"""
+    if mode == "tool":
+        prompt = f"Extract resume text from: {resume_path}"
+        print(f"\n=== PDF Tool Execution ===")
+        print(f"Prompt: {prompt}")
+        msgs: List = []
+        result = await run_with_tools(prompt, msgs)
+        if not any(isinstance(msg, ToolMessage) for msg in msgs) and not isinstance(result, HumanMessage):
+            # The model answered from the prompt alone; that is not the resume's text
+            return "Error executing tool: model replied without calling load_pdf", None
+        return (result.content if hasattr(result, 'content') else str(result)), None
+
+    try:
+        extracted = await extract_pdf_async(resume_path)
+    except Exception as e:
+        logger.error(f"PDF extraction failed for {resume_path}: {e}")
+        return f"Error extracting resume: {str(e)}", None
+
+    print(f"\n=== Direct PDF extraction: {extracted.total_pages} pages, {len(extracted.text)} chars ===")
+    pages = [
+        {"page_number": page.page_number, "char_count": page.char_count, "metadata": page.metadata}
+        for page in extracted.pages
+    ]
+    return extracted.text, pages
+
 # LangGraph node functions
 async def load_candidate_profile(state: JobSearchState) -> JobSearchState:
     """Load candidate profile and resume"""
+    llm_tenant.set(state["candidate_id"])
     try:
         # If resume_text is not provided, try to load from PDF
         if not state.get("resume_text") and state.get("resume_path"):
-            prompt = f"Extract resume text from: {state['resume_path']}"
-            print(f"\n=== PDF Tool Execution ===")
-            print(f"Prompt: {prompt}")
-            
-            # NOW this is an async call
-            result = await run_with_tools(prompt)
-            
-            extracted_text = result.content if hasattr(result, 'content') else str(result)
-            
-            # Validate if extracted text is actually resume content
-            is_valid, validation_reason = validate_resume_content(extracted_text)
+            resume_path = state["resume_path"]
+            preferences = state.get("preferences") or {}
+            mode = preferences.get("resume_extraction", RESUME_EXTRACTION_MODE)
+            # The LLM judges ambiguous resumes, so its model is part of the verdict's version
+            validator_version = f"{resume_validator.version}:{MODEL_NAME}"
+            if preferences.get("refresh_resume"):
+                # Lets a candidate get a wrongly rejected resume re-checked right away
+                await asyncio.to_thread(resume_cache.invalidate, resume_path)
+            cached = await asyncio.to_thread(resume_cache.get, resume_path, mode, validator_version)
+
+            if cached:
+                print(f"\n=== Resume cache hit ({cached.content_hash[:12]}) ===")
+                extracted_text = cached.text
+                state["resume_pages"] = cached.pages
+                is_valid, validation_reason = cached.is_valid, cached.reason
+            else:
+                extracted_text, pages = await extract_resume_text(resume_path, mode)
+                state["resume_pages"] = pages
+                
+                # Validate if extracted text is actually resume content
+                is_valid, validation_reason = await validate_resume_content(extracted_text)
+
+                # Don't remember transient tool or model failures
+                if not extracted_text.startswith(("Error executing tool", "Error extracting resume")) and not validation_reason.startswith("Validation error"):
+                    await asyncio.to_thread(
+                        resume_cache.put, resume_path, mode, validator_version,
+                        extracted_text, pages, is_valid, validation_reason
+                    )
 
             if is_valid:
                 state["resume_text"] = extracted_text
@@ -350,11 +543,57 @@ async def load_candidate_profile(state: JobSearchState) -> JobSearchState:
     
     return state
 
+def retrieve_shortlist(
+    candidate: Candidate,
+    resume_text: Optional[str],
+    jobs: List[Job],
+    preferences: Dict[str, Any]
+) -> List[Job]:
+    """Cheap retrieval ahead of AI scoring: skill-token overlap plus semantic similarity"""
+    top_k = int(preferences.get("prefilter_top_k", PREFILTER_TOP_K))
+    min_overlap = int(preferences.get("prefilter_min_overlap", PREFILTER_MIN_OVERLAP))
+    semantic_top_k = int(preferences.get("semantic_top_k", SEMANTIC_TOP_K))
+    semantic_min_score = float(preferences.get("semantic_min_score", SEMANTIC_MIN_SCORE))
+
+    shortlist: Dict[str, Job] = {}
+    for job, _ in job_index.rank(candidate.skills, top_k=top_k, min_overlap=min_overlap):
+        shortlist[job.jobId] = job
+    lexical_count = len(shortlist)
+
+    # Pick up paraphrased matches the exact-token index misses
+    if resume_text == "No valid resume content provided":
+        resume_text = None
+    for job, _ in job_vector_index.query_candidate(
+        candidate, resume_text, top_k=semantic_top_k, min_score=semantic_min_score
+    ):
+        shortlist.setdefault(job.jobId, job)
+
+    logger.info(
+        f"Shortlisted {len(shortlist)} of {len(jobs)} jobs "
+        f"({lexical_count} by skill overlap, {len(shortlist) - lexical_count} by semantic similarity)"
+    )
+    return list(shortlist.values())
+
 async def fetch_jobs(state: JobSearchState) -> JobSearchState:
     """Fetch available jobs from database"""
     try:
         jobs = await contract_client.get_all_jobs()
         print(jobs, 'fucku')
+        job_index.sync(jobs)
+        job_vector_index.sync(jobs)
+
+        candidate = state.get("candidate_profile")
+        if candidate and candidate.skills:
+            jobs = retrieve_shortlist(
+                candidate,
+                state.get("resume_text"),
+                jobs,
+                state.get("preferences") or {}
+            )
+
+        # Summaries of the shortlisted jobs are what the match prompts send
+        job_summaries.warm(jobs)
+
         state["available_jobs"] = jobs
         state["current_step"] = "jobs_fetched"
         logger.info(f"Fetched {len(jobs)} available jobs")
@@ -363,110 +602,356 @@ async def fetch_jobs(state: JobSearchState) -> JobSearchState:
         logger.error(state["error_message"])
     return state
 
-async def match_jobs(state: JobSearchState) -> JobSearchState:
+def fallback_skill_evaluation(job: Job, fallback_scores: Dict[str, float]) -> Optional[JobMatchEvaluation]:
+    """Skill-coverage scoring used when the AI evaluation is unavailable
+
+    ``fallback_scores`` holds the share of each job's requirements the candidate has,
+    computed in one pass by skill_matrix.skill_coverage.
+    """
+    try:
+        skill_overlap = fallback_scores[job.jobId]
+        print(f"Using fallback scoring for job {job.jobId}: {skill_overlap}")
+        return JobMatchEvaluation(
+            score=skill_overlap,
+            reasons=["Basic skill overlap detected"],
+            improvements=["Enhance matching skills", "Provide more detailed resume"]
+        )
+    except Exception as fallback_error:
+        print(f"❌ Fallback scoring failed for job {job.jobId}: {fallback_error}")
+    return None
+
+async def evaluate_job(
+    job: Job,
+    candidate: Candidate,
+    resume: str,
+    parser: PydanticOutputParser,
+    timeout: float,
+    description: Optional[str] = None
+) -> JobMatchEvaluation:
+    """Ask the model to score a single job and parse the structured result"""
+    formatted_messages = MATCH_PROMPT.format_messages(
+        skills=", ".join(candidate.skills),
+        education=", ".join(candidate.education),
+        resume=resume,
+        title=job.title,
+        companyId=job.companyId,
+        description=job.description if description is None else description,
+        requirements=", ".join(job.requirements),
+        location=job.location.value,
+        jobType=job.jobType.value,
+        format_instructions=parser.get_format_instructions()
+    )
+
+    prompt_stats.record("single", count_tokens(formatted_messages[0].content))
+    response = await model.ainvoke(formatted_messages, timeout=timeout)
+
+    try:
+        return parser.parse(response.content)
+    except Exception:
+        print(f"Raw response was: {response.content}")
+        raise
+
+async def score_job(
+    job: Job,
+    candidate: Candidate,
+    prompts: MatchPromptBuilder,
+    parser: PydanticOutputParser,
+    threshold: float,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+    fallback_scores: Dict[str, float]
+) -> Tuple[Optional[MatchedJob], Optional[JobMatchEvaluation]]:
+    """Score one job under the shared concurrency limit, falling back to skill overlap on failure
+
+    Returns the match (None below the threshold) and the evaluation it was based on.
+    """
+    try:
+        description, resume = prompts.describe(job), prompts.job_resume(job)
+        cache_key = match_cache.make_key(
+            candidate, resume, job, description,
+            MATCH_PROMPT_VERSION, MATCH_PROMPT.messages[0].prompt.template, MODEL_NAME
+        )
+        cached = await asyncio.to_thread(match_cache.get, cache_key) if MATCH_CACHE_ENABLED else None
+        if cached is not None:
+            parsed_result = JobMatchEvaluation(**cached)
+        else:
+            async with semaphore:
+                parsed_result = await evaluate_job(job, candidate, resume, parser, timeout, description)
+            if MATCH_CACHE_ENABLED:
+                await asyncio.to_thread(match_cache.set, cache_key, parsed_result.model_dump())
+    except asyncio.TimeoutError:
+        logger.warning(f"AI evaluation attempts timed out after {timeout}s each for job {job.jobId}")
+        parsed_result = fallback_skill_evaluation(job, fallback_scores)
+    except Exception as parse_error:
+        print(f"❌ Parse error for job {job.jobId}: {parse_error}")
+        logger.warning(f"Could not parse AI response for job {job.jobId}: {parse_error}")
+        parsed_result = fallback_skill_evaluation(job, fallback_scores)
+
+    if parsed_result is None:
+        return None, None
+    return threshold_match(job, parsed_result, threshold), parsed_result
+
+def threshold_match(job: Job, evaluation: JobMatchEvaluation, threshold: float) -> Optional[MatchedJob]:
+    """MatchedJob for an evaluation that clears the threshold, else None"""
+    print(f"\n=== AI Response for Job {job.jobId} ===")
+    print(f"Parsed score: {evaluation.score}")
+    print(f"Parsed reasons: {evaluation.reasons}")
+    print(f"Parsed improvements: {evaluation.improvements}")
+
+    # Check if job meets threshold
+    if evaluation.score >= threshold:
+        print(f"✅ Job {job.jobId} matches! Score: {evaluation.score} >= {threshold}")
+        return MatchedJob(
+            job=job,
+            compatibility_score=evaluation.score,
+            match_reasons=evaluation.reasons,
+            suggested_improvements=evaluation.improvements
+        )
+
+    print(f"❌ Job {job.jobId} doesn't match. Score: {evaluation.score} < {threshold}")
+    return None
+
+def format_batch_job(job: Job, description: str) -> str:
+    return MATCH_BATCH_JOB_TEMPLATE.format(
+        jobId=job.jobId,
+        title=job.title,
+        companyId=job.companyId,
+        description=description,
+        requirements=", ".join(job.requirements),
+        location=job.location.value,
+        jobType=job.jobType.value
+    )
+
+def plan_batches(
+    jobs: List[Job],
+    prompts: MatchPromptBuilder,
+    base_tokens: int,
+    token_budget: int,
+    max_jobs: int
+) -> List[List[Job]]:
+    """Pack jobs in order into batches whose prompt plus reserved output fits the token budget"""
+    batches: List[List[Job]] = []
+    current: List[Job] = []
+    used = base_tokens
+    for job in jobs:
+        cost = count_tokens(format_batch_job(job, prompts.describe(job))) + MATCH_BATCH_OUTPUT_TOKENS_PER_JOB
+        if current and (used + cost > token_budget or len(current) >= max_jobs):
+            batches.append(current)
+            current, used = [], base_tokens
+        current.append(job)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+async def evaluate_job_batch(
+    jobs: List[Job],
+    candidate: Candidate,
+    prompts: MatchPromptBuilder,
+    resume: str,
+    parser: PydanticOutputParser,
+    timeout: float
+) -> Dict[str, JobMatchEvaluation]:
+    """Ask the model to score several jobs in one request; returns evaluations by jobId"""
+    formatted_messages = MATCH_BATCH_PROMPT.format_messages(
+        skills=", ".join(candidate.skills),
+        education=", ".join(candidate.education),
+        resume=resume,
+        jobs="\n    ".join(format_batch_job(job, prompts.describe(job)) for job in jobs),
+        format_instructions=parser.get_format_instructions()
+    )
+
+    prompt_stats.record("batch", count_tokens(formatted_messages[0].content), len(jobs))
+    response = await model.ainvoke(formatted_messages, timeout=timeout)
+
+    try:
+        parsed = parser.parse(response.content)
+    except Exception:
+        print(f"Raw batch response was: {response.content}")
+        raise
+
+    wanted = {job.jobId for job in jobs}
+    evaluations: Dict[str, JobMatchEvaluation] = {}
+    for item in parsed.evaluations:
+        # Ignore IDs the model invented and keep the first answer for repeated ones
+        if item.jobId in wanted and item.jobId not in evaluations:
+            evaluations[item.jobId] = JobMatchEvaluation(**item.model_dump(exclude={"jobId"}))
+    return evaluations
+
+async def score_job_batch(
+    jobs: List[Job],
+    candidate: Candidate,
+    prompts: MatchPromptBuilder,
+    resume: str,
+    batch_parser: PydanticOutputParser,
+    parser: PydanticOutputParser,
+    threshold: float,
+    semaphore: asyncio.Semaphore,
+    timeout: float,
+    fallback_scores: Dict[str, float]
+) -> List[Tuple[Job, Optional[MatchedJob], Optional[JobMatchEvaluation]]]:
+    """Score a batch of jobs in one request; jobs the response leaves out are scored individually"""
+    evaluations: Dict[str, JobMatchEvaluation] = {}
+    cache_keys = {
+        job.jobId: match_cache.make_key(
+            candidate, resume, job, prompts.describe(job),
+            MATCH_PROMPT_VERSION, MATCH_BATCH_PROMPT.messages[0].prompt.template, MODEL_NAME
+        )
+        for job in jobs
+    }
+    if MATCH_CACHE_ENABLED:
+        cached = await asyncio.to_thread(match_cache.get_many, list(cache_keys.values()))
+        for job in jobs:
+            if cache_keys[job.jobId] in cached:
+                evaluations[job.jobId] = JobMatchEvaluation(**cached[cache_keys[job.jobId]])
+
+    pending = [job for job in jobs if job.jobId not in evaluations]
+    if pending:
+        try:
+            async with semaphore:
+                fresh = await evaluate_job_batch(
+                    pending, candidate, prompts, resume, batch_parser, MATCH_BATCH_TIMEOUT_SECONDS
+                )
+            evaluations.update(fresh)
+            if MATCH_CACHE_ENABLED:
+                await asyncio.to_thread(
+                    match_cache.set_many,
+                    [(cache_keys[job_id], evaluation.model_dump()) for job_id, evaluation in fresh.items()]
+                )
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Batch evaluation attempts of {len(pending)} jobs timed out after {MATCH_BATCH_TIMEOUT_SECONDS}s each"
+            )
+        except Exception as batch_error:
+            logger.warning(f"Could not parse batch evaluation of {len(pending)} jobs: {batch_error}")
+
+    missing = [job for job in jobs if job.jobId not in evaluations]
+    if missing:
+        logger.info(f"Re-scoring {len(missing)} of {len(jobs)} batched jobs individually")
+    rescored = await asyncio.gather(*(
+        score_job(job, candidate, prompts, parser, threshold, semaphore, timeout, fallback_scores)
+        for job in missing
+    ))
+
+    results = [
+        (job, threshold_match(job, evaluations[job.jobId], threshold), evaluations[job.jobId])
+        for job in jobs if job.jobId in evaluations
+    ]
+    return results + [(job, *outcome) for job, outcome in zip(missing, rescored)]
+
+def job_scored_event(
+    job: Job,
+    evaluation: Optional[JobMatchEvaluation],
+    matched_job: Optional[MatchedJob],
+    scored: int,
+    total: int,
+    matched: int,
+    started: float
+) -> Dict[str, Any]:
+    """Progress event for one finished job, with running counts and a remaining-time estimate"""
+    elapsed = time.monotonic() - started
+    return {
+        "step": "job_scored",
+        "job_id": job.jobId,
+        "title": job.title,
+        "score": evaluation.score if evaluation else None,
+        "reasons": evaluation.reasons if evaluation else [],
+        "passed": matched_job is not None,
+        "scored": scored,
+        "total": total,
+        "matched": matched,
+        "elapsed_seconds": round(elapsed, 2),
+        "eta_seconds": round(elapsed / scored * (total - scored), 2),
+    }
+
+async def match_jobs(state: JobSearchState, config: Optional[RunnableConfig] = None) -> JobSearchState:
     """Use AI to match jobs with candidate profile"""
     try:
+        # Optional progress hook, called as on_job_scored(event, matched_job_or_None) after every job
+        on_job_scored = ((config or {}).get("configurable") or {}).get("on_job_scored")
         candidate = state["candidate_profile"]
-        jobs = state["available_jobs"]
+        # Scoring tasks inherit this, so the LLM scheduler shares capacity fairly between candidates
+        llm_tenant.set(candidate.candidateId)
+        jobs = state["available_jobs"] or []
         threshold = state["compatibility_threshold"]
         resume_text = state.get("resume_text", "")
+        preferences = state.get("preferences") or {}
+        concurrency = max(1, int(preferences.get("match_concurrency", MATCH_CONCURRENCY)))
+        timeout = float(preferences.get("match_timeout", MATCH_TIMEOUT_SECONDS))
         
         matched_jobs = []
 
         print("Candidate Profile:", candidate)
-        print("Number of Available Jobs:", len(jobs) if jobs else 0)
+        print("Number of Available Jobs:", len(jobs))
         print(f"Resume text length: {len(resume_text) if resume_text else 0}")
 
         has_valid_resume = resume_text and resume_text != "No valid resume content provided"
         print(f"Has valid resume content: {has_valid_resume}")
+        resume = resume_text if has_valid_resume else "No detailed resume available"
         
-        # Create parser outside the loop
+        # Create parsers once and share them across all evaluations
         parser = PydanticOutputParser(pydantic_object=JobMatchEvaluation)
-        
-        for job in jobs:
-            try:
-                # Create the prompt template with proper formatting
-                prompt = ChatPromptTemplate.from_template("""
-                    Analyze job compatibility between candidate and job:
-
-                    Candidate Profile:
-                    - Skills: {skills}
-                    - Education: {education}
-                    - Resume: {resume}
-
-                    Job Details:
-                    - Title: {title}
-                    - Company ID: {companyId}
-                    - Description: {description}
-                    - Requirements: {requirements}
-                    - Location: {location}
-                    - Job Type: {jobType}
-
-                    Analyze the compatibility and provide a detailed assessment.
-                    
-                    {format_instructions}
-                """)
-
-                # Format the messages with actual data
-                formatted_messages = prompt.format_messages(
-                    skills=", ".join(candidate.skills),
-                    education=", ".join(candidate.education),
-                    resume=resume_text[:800] if has_valid_resume else "No detailed resume available",
-                    title=job.title,
-                    companyId=job.companyId,
-                    description=job.description,
-                    requirements=", ".join(job.requirements),
-                    location=job.location.value,
-                    jobType=job.jobType.value,
-                    format_instructions=parser.get_format_instructions()
-                )
+        semaphore = asyncio.Semaphore(concurrency)
+        mode = preferences.get("match_mode", MATCH_MODE)
+        candidate_text = ", ".join(candidate.skills) + ", ".join(candidate.education)
+        # Picks job summaries and the relevant resume sections within the prompt token budget
+        prompts = MatchPromptBuilder(
+            resume,
+            MATCH_PROMPT.messages[0].prompt.template + candidate_text + parser.get_format_instructions(),
+            enabled=bool(preferences.get("prompt_compaction", PROMPT_COMPACTION_ENABLED))
+        )
 
-                # Get AI response
-                response = model.invoke(formatted_messages)
-                
-                print(f"\n=== AI Response for Job {job.jobId} ===")
-                # print(f"Raw response: {response.content}")
-                # print("=" * 50)
+        # Skill coverage of every job in one vectorized pass, used wherever AI scoring fails
+        fallback_scores = skill_coverage(candidate, jobs)
 
-                # Parse using Pydantic
-                parsed_result = parser.parse(response.content)
-                
-                print(f"Parsed score: {parsed_result.score}")
-                print(f"Parsed reasons: {parsed_result.reasons}")
-                print(f"Parsed improvements: {parsed_result.improvements}")
-
-                # Check if job meets threshold
-                if parsed_result.score >= threshold:
-                    print(f"✅ Job {job.jobId} matches! Score: {parsed_result.score} >= {threshold}")
-                    matched_jobs.append(MatchedJob(
-                        job=job,
-                        compatibility_score=parsed_result.score,
-                        match_reasons=parsed_result.reasons,
-                        suggested_improvements=parsed_result.improvements
-                    ))
-                else:
-                    print(f"❌ Job {job.jobId} doesn't match. Score: {parsed_result.score} < {threshold}")
-
-            except Exception as parse_error:
-                print(f"❌ Parse error for job {job.jobId}: {parse_error}")
-                print(f"Raw response was: {response.content if 'response' in locals() else 'No response'}")
-                logger.warning(f"Could not parse AI response for job {job.jobId}: {parse_error}")
-                
-                # Fallback to basic skill matching
-                try:
-                    skill_overlap = len(set(candidate.skills) & set(job.requirements)) / len(job.requirements) if job.requirements else 0
-                    if skill_overlap >= threshold:
-                        print(f"✅ Using fallback scoring for job {job.jobId}: {skill_overlap}")
-                        matched_jobs.append(MatchedJob(
-                            job=job,
-                            compatibility_score=skill_overlap,
-                            match_reasons=["Basic skill overlap detected"],
-                            suggested_improvements=["Enhance matching skills", "Provide more detailed resume"]
-                        ))
-                    else:
-                        print(f"❌ Fallback scoring too low for job {job.jobId}: {skill_overlap}")
-                except Exception as fallback_error:
-                    print(f"❌ Fallback scoring failed for job {job.jobId}: {fallback_error}")
+        async def score(job: Job):
+            return [(job, *await score_job(
+                job, candidate, prompts, parser, threshold, semaphore, timeout, fallback_scores
+            ))]
+
+        if mode == "batch":
+            batch_parser = PydanticOutputParser(pydantic_object=BatchJobMatchEvaluation)
+            batch_resume = prompts.shared_resume(jobs)
+            base_tokens = count_tokens(
+                MATCH_BATCH_PROMPT.messages[0].prompt.template + candidate_text + batch_resume
+                + batch_parser.get_format_instructions()
+            )
+            batches = plan_batches(
+                jobs,
+                prompts,
+                base_tokens,
+                int(preferences.get("match_batch_token_budget", MATCH_BATCH_TOKEN_BUDGET)),
+                max(1, int(preferences.get("match_batch_max_jobs", MATCH_BATCH_MAX_JOBS)))
+            )
+            logger.info(f"Scoring {len(jobs)} jobs in {len(batches)} batches with concurrency {concurrency}")
+            tasks = [
+                asyncio.create_task(score_job_batch(
+                    batch, candidate, prompts, batch_resume, batch_parser, parser, threshold, semaphore, timeout,
+                    fallback_scores
+                ))
+                for batch in batches
+            ]
+        else:
+            logger.info(f"Scoring {len(jobs)} jobs with concurrency {concurrency} and {timeout}s timeout")
+            tasks = [asyncio.create_task(score(job)) for job in jobs]
+
+        started = time.monotonic()
+        scored = 0
+        try:
+            # Collect results as they finish rather than in submission order
+            for finished in asyncio.as_completed(tasks):
+                for job, matched_job, evaluation in await finished:
+                    scored += 1
+                    if matched_job:
+                        matched_jobs.append(matched_job)
+                    if on_job_scored:
+                        on_job_scored(
+                            job_scored_event(job, evaluation, matched_job, scored, len(jobs), len(matched_jobs), started),
+                            matched_job
+                        )
+        finally:
+            for task in tasks:
+                task.cancel()
         
         # Sort by compatibility score
         matched_jobs.sort(key=lambda x: x.compatibility_score, reverse=True)
@@ -474,6 +959,9 @@ async def match_jobs(state: JobSearchState) -> JobSearchState:
         state["matched_jobs"] = matched_jobs
         state["current_step"] = "jobs_matched"
         logger.info(f"Matched {len(matched_jobs)} jobs above threshold {threshold}")
+        if MATCH_CACHE_ENABLED:
+            logger.info(f"Match cache stats: {await asyncio.to_thread(match_cache.stats)}")
+        logger.info(f"Prompt token stats: {prompt_stats.stats()}")
         
     except Exception as e:
         state["error_message"] = f"Error matching jobs: {str(e)}"
@@ -481,6 +969,93 @@ async def match_jobs(state: JobSearchState) -> JobSearchState:
     
     return state
 
+async def rank_candidates_for_job(
+    job: Job,
+    threshold: float,
+    shortlist_size: int = CANDIDATE_SHORTLIST_SIZE,
+    min_coverage: float = CANDIDATE_MIN_COVERAGE,
+    concurrency: int = CANDIDATE_RANK_CONCURRENCY
+) -> AsyncIterator[Dict[str, Any]]:
+    """Rank registered candidates for a job, yielding progress events as they are scored
+
+    Every candidate is first scored by IDF-weighted skill coverage of the job in one
+    vectorized pass; only the best ``shortlist_size`` go to the model, with the same
+    prompt, JobMatchEvaluation schema and match cache as the candidate-side search.
+    Candidates have no parsed resume here, so their profile description stands in for it.
+    Ends with a "completed" event holding the shortlist ranked by score.
+    """
+    started = time.monotonic()
+    candidates = await contract_client.get_all_candidates()
+    by_id = {candidate.candidateId: candidate for candidate in candidates}
+    matrix = await asyncio.to_thread(SkillMatrix.from_models, candidates, [job])
+    shortlist = matrix.rank_candidates(job.jobId, top_k=shortlist_size, min_score=min_coverage)
+    yield {
+        "step": "shortlisted",
+        "job_id": job.jobId,
+        "candidates": len(candidates),
+        "shortlisted": len(shortlist),
+        "elapsed_seconds": round(time.monotonic() - started, 2),
+    }
+
+    parser = PydanticOutputParser(pydantic_object=JobMatchEvaluation)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def score(candidate: Candidate, coverage: float):
+        # The company pays for these requests, so the LLM scheduler queues them under its ID
+        llm_tenant.set(f"company:{job.companyId}")
+        resume = "\n".join(candidate.description) or "No detailed resume available"
+        prompts = MatchPromptBuilder(
+            resume,
+            MATCH_PROMPT.messages[0].prompt.template + ", ".join(candidate.skills) + ", ".join(candidate.education)
+            + parser.get_format_instructions()
+        )
+        matched_job, evaluation = await score_job(
+            job, candidate, prompts, parser, threshold, semaphore, MATCH_TIMEOUT_SECONDS,
+            skill_coverage(candidate, [job])
+        )
+        return candidate, coverage, matched_job, evaluation
+
+    tasks = [asyncio.create_task(score(by_id[candidate_id], coverage)) for candidate_id, coverage in shortlist]
+    ranked: List[Dict[str, Any]] = []
+    scored_started = time.monotonic()
+    try:
+        for finished in asyncio.as_completed(tasks):
+            candidate, coverage, matched_job, evaluation = await finished
+            result = {
+                "candidate_id": candidate.candidateId,
+                "name": candidate.name,
+                "score": evaluation.score if evaluation else None,
+                "reasons": evaluation.reasons if evaluation else [],
+                "improvements": evaluation.improvements if evaluation else [],
+                "skill_coverage": round(coverage, 4),
+                "passed": matched_job is not None,
+            }
+            ranked.append(result)
+            elapsed = time.monotonic() - scored_started
+            yield {
+                "step": "candidate_scored",
+                **result,
+                "scored": len(ranked),
+                "total": len(tasks),
+                "matched": sum(item["passed"] for item in ranked),
+                "elapsed_seconds": round(elapsed, 2),
+                "eta_seconds": round(elapsed / len(ranked) * (len(tasks) - len(ranked)), 2),
+            }
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    ranked.sort(key=lambda item: (item["score"] or 0.0, item["skill_coverage"]), reverse=True)
+    yield {
+        "step": "completed",
+        "job_id": job.jobId,
+        "candidates": len(candidates),
+        "shortlisted": len(shortlist),
+        "matched": sum(item["passed"] for item in ranked),
+        "ranked": ranked,
+        "elapsed_seconds": round(time.monotonic() - started, 2),
+    }
+
 async def generate_applications(state: JobSearchState) -> JobSearchState:
     """Prepare applications without cover letters"""
     try:
@@ -521,61 +1096,70 @@ async def apply_to_jobs_node(state: JobSearchState) -> JobSearchState:
         application_results = []
         successful_applications = 0
         failed_applications = 0
+        submitter = contract_client.tx_submitter
         
         logger.info(f"Starting to apply to {len(applications)} jobs")
         
-        for i, application in enumerate(applications):
-            try:
-                logger.info(f"Applying to job {i+1}/{len(applications)}: {application.job_id}")
-                
+        # Send every transaction back to back, then wait for the receipts together
+        timestamp = int(datetime.now().timestamp())
+        submit_mode = state.get("preferences", {}).get("submit_mode", APPLICATION_SUBMIT_MODE)
+        sent = []
+        if submit_mode == "batch":
+            items = [
+                {
+                    "application_id": f"app_{application.job_id}_{application.candidate_id}_{timestamp}_{i}",
+                    "job_id": application.job_id,
+                    "candidate_id": application.candidate_id,
+                    "application_date": datetime.now().isoformat()
+                }
+                for i, application in enumerate(applications)
+            ]
+            logger.info(f"Sending {len(items)} applications in batched transactions")
+            sent = list(zip(applications, await contract_client.submit_applications(items)))
+        else:
+            for i, application in enumerate(applications):
                 # Generate unique application ID
-                application_id = f"app_{application.job_id}_{application.candidate_id}_{int(datetime.now().timestamp())}_{i}"
-                
-                # Submit application to smart contract
-                success = await contract_client.submit_application(
-                    application_id,
-                    application.job_id,
-                    application.candidate_id,
-                    datetime.now().isoformat()
-                )
-                
-                if success:
-                    successful_applications += 1
-                    result = {
-                        "application_id": application_id,
-                        "job_id": application.job_id,
-                        "status": "submitted",
-                        "submitted_at": datetime.now().isoformat(),
-                        "message": "Application submitted successfully to blockchain"
-                    }
-                    logger.info(f"✅ Application {application_id} submitted successfully")
-                else:
-                    failed_applications += 1
-                    result = {
-                        "application_id": application_id,
-                        "job_id": application.job_id,
-                        "status": "failed",
-                        "submitted_at": datetime.now().isoformat(),
-                        "error": "Smart contract transaction failed"
-                    }
-                    logger.error(f"❌ Application {application_id} failed")
-                
-                application_results.append(result)
-                
-                # Add small delay between applications
-                await asyncio.sleep(1)
-                
-            except Exception as app_error:
+                application_id = f"app_{application.job_id}_{application.candidate_id}_{timestamp}_{i}"
+                try:
+                    logger.info(f"Sending application {i+1}/{len(applications)}: {application.job_id}")
+                    tx = await submitter.submit_application(
+                        application_id,
+                        application.job_id,
+                        application.candidate_id,
+                        datetime.now().isoformat()
+                    )
+                except Exception as app_error:
+                    logger.error(f"❌ Error applying to job {application.job_id}: {app_error}")
+                    tx = submitter.reject(application_id, str(app_error))
+                sent.append((application, tx))
+        
+        settled = await submitter.wait_all([tx for _, tx in sent])
+        
+        for (application, _), tx in zip(sent, settled):
+            if tx.status == "confirmed":
+                successful_applications += 1
+                result = {
+                    "application_id": tx.application_id,
+                    "job_id": application.job_id,
+                    "status": "submitted",
+                    "submitted_at": tx.submitted_at,
+                    "tx_hash": tx.tx_hash,
+                    "block_number": tx.block_number,
+                    "message": "Application submitted successfully to blockchain"
+                }
+                logger.info(f"✅ Application {tx.application_id} submitted successfully")
+            else:
                 failed_applications += 1
-                error_result = {
-                    "application_id": f"app_{application.job_id}_{application.candidate_id}_error",
+                result = {
+                    "application_id": tx.application_id,
                     "job_id": application.job_id,
                     "status": "failed",
-                    "submitted_at": datetime.now().isoformat(),
-                    "error": str(app_error)
+                    "submitted_at": tx.submitted_at,
+                    "tx_hash": tx.tx_hash,
+                    "error": tx.error or "Smart contract transaction failed"
                 }
-                application_results.append(error_result)
-                logger.error(f"❌ Error applying to job {application.job_id}: {app_error}")
+                logger.error(f"❌ Application {tx.application_id} failed: {tx.error}")
+            application_results.append(result)
         
         # Update state with results
         state["application_results"] = application_results
@@ -617,15 +1201,29 @@ def should_continue(state: JobSearchState) -> str:
     else:
         return "load_profile"
 
+def timed_node(name: str, node):
+    """Wrap a graph node so its duration is recorded; nodes report failure through error_message"""
+    @functools.wraps(node)
+    async def timed(*args, **kwargs):
+        started = time.perf_counter()
+        outcome = "exception"
+        try:
+            result = await node(*args, **kwargs)
+            outcome = "error" if (result or {}).get("error_message") else "ok"
+            return result
+        finally:
+            graph_node_seconds.observe(time.perf_counter() - started, name, outcome)
+    return timed
+
 # Build the workflow graph
 workflow = StateGraph(JobSearchState)
 
 # Add nodes
-workflow.add_node("load_profile", load_candidate_profile)
-workflow.add_node("fetch_jobs", fetch_jobs)
-workflow.add_node("match_jobs", match_jobs)
-workflow.add_node("generate_applications", generate_applications)
-workflow.add_node("apply_jobs", apply_to_jobs_node)
+workflow.add_node("load_profile", timed_node("load_profile", load_candidate_profile))
+workflow.add_node("fetch_jobs", timed_node("fetch_jobs", fetch_jobs))
+workflow.add_node("match_jobs", timed_node("match_jobs", match_jobs))
+workflow.add_node("generate_applications", timed_node("generate_applications", generate_applications))
+workflow.add_node("apply_jobs", timed_node("apply_jobs", apply_to_jobs_node))
 
 # Add edges
 workflow.set_entry_point("load_profile")
@@ -680,56 +1278,266 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+# Outermost, so the time spent in CORS handling is included
+app.add_middleware(HTTPMetricsMiddleware)
+
+# Counters and depths kept by each component, read when /metrics is scraped
+metrics.counter(
+    "agent_cache_lookups_total", "Cache lookups by cache and result", ("cache", "result"),
+    collect=lambda: {
+        key: value
+        for cache, stats in (
+            ("match", match_cache.stats()),
+            ("resume", resume_cache.stats()),
+            ("contract_view", contract_client.view_cache.stats()),
+            ("contract_store", contract_client.store_cache.stats()),
+            ("job_summary", job_summaries.stats()),
+        )
+        for key, value in (
+            ((cache, "hit"), stats.get("hits", 0) + stats.get("memory_hits", 0) + stats.get("disk_hits", 0)
+             + stats.get("coalesced", 0)),
+            ((cache, "miss"), stats["misses"]),
+        )
+    }
+)
+metrics.gauge(
+    "agent_work_queue_jobs", "Jobs in the durable work queue by state (ready: queued and due now)", ("queue", "state"),
+    collect=lambda: {
+        (queue, state): counts[state]
+        for queue, counts in work_queue.stats()["queues"].items()
+        for state in ("queued", "ready", "running", "succeeded", "dead")
+    }
+)
+metrics.gauge(
+    "agent_search_runs", "Tracked background searches by state", ("state",),
+    collect=lambda: {(state,): count for state, count in search_runs.stats().items()}
+)
+metrics.gauge(
+    "agent_llm_requests_queued", "LLM requests waiting for the scheduler",
+    collect=lambda: {(): sum(llm_scheduler.stats()["queued"].values())}
+)
+metrics.gauge("agent_llm_requests_in_flight", "LLM requests in flight", collect=lambda: {(): llm_scheduler.in_flight})
+metrics.gauge(
+    "agent_llm_concurrency_limit", "Adaptive LLM concurrency limit",
+    collect=lambda: {(): int(llm_scheduler.concurrency_limit)}
+)
+metrics.gauge(
+    "agent_tx_pending", "Sent transactions waiting for a receipt",
+    collect=lambda: {(): contract_client.tx_submitter.stats()["pending"]}
+)
 
 @app.get("/")
 async def root():
     return {"message": "Job Platform AI Agent API", "version": "1.0.0"}
 
+def serialize_matched_job(job: MatchedJob) -> Dict[str, Any]:
+    return {
+        "job_id": job.job.jobId,
+        "title": job.job.title,
+        "company_id": job.job.companyId,
+        "description": job.job.description,
+        "location": job.job.location.value,
+        "job_type": job.job.jobType.value,
+        "salary_range": job.job.salaryRange,
+        "compatibility_score": job.compatibility_score,
+        "match_reasons": job.match_reasons,
+        "suggested_improvements": job.suggested_improvements
+    }
+
+def initial_search_state(request: JobSearchRequest) -> JobSearchState:
+    return JobSearchState(
+        candidate_id=request.candidate_id,
+        resume_text=request.resume_text,
+        resume_path=request.resume_path,
+        compatibility_threshold=request.compatibility_threshold,
+        preferences=request.preferences,
+        current_step="start"
+    )
+
+def search_response(result: JobSearchState) -> Dict[str, Any]:
+    return {
+        "candidate_id": result["candidate_id"],
+        "matched_jobs_count": len(result.get("matched_jobs") or []),
+        "matched_jobs": [serialize_matched_job(job) for job in result.get("matched_jobs") or []],
+        "applications_ready": len(result.get("applications") or []),
+        "status": "completed"
+    }
+
 @app.post("/search-jobs")
 async def search_jobs(request: JobSearchRequest):
     """Main endpoint to search and match jobs for a candidate"""
     try:
-        # Initialize state
-        initial_state = JobSearchState(
-            candidate_id=request.candidate_id,
-            resume_text=request.resume_text,
-            compatibility_threshold=request.compatibility_threshold,
-            preferences=request.preferences,
-            current_step="start"
-        )
-        
         # Run the workflow
-        result = app_workflow.invoke(initial_state)
+        result = await app_workflow.ainvoke(initial_search_state(request))
         
         if result.get("error_message"):
             raise HTTPException(status_code=400, detail=result["error_message"])
         
-        return {
-            "candidate_id": result["candidate_id"],
-            "matched_jobs_count": len(result.get("matched_jobs", [])),
-            "matched_jobs": [
-                {
-                    "job_id": job.job.jobId,
-                    "title": job.job.title,
-                    "company_id": job.job.companyId,
-                    "description": job.job.description,
-                    "location": job.job.location.value,
-                    "job_type": job.job.jobType.value,
-                    "salary_range": job.job.salaryRange,
-                    "compatibility_score": job.compatibility_score,
-                    "match_reasons": job.match_reasons,
-                    "suggested_improvements": job.suggested_improvements
-                }
-                for job in result.get("matched_jobs", [])
-            ],
-            "applications_ready": len(result.get("applications", [])),
-            "status": "completed"
-        }
+        return search_response(result)
         
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error in job search: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# Graph nodes in execution order, used to report search progress
+WORKFLOW_NODES = ["load_profile", "fetch_jobs", "match_jobs", "generate_applications", "apply_jobs"]
+
+async def run_search(run: SearchRun, initial_state: JobSearchState) -> Dict[str, Any]:
+    """Drive the workflow for a background search, recording node and per-job progress"""
+    def node_progress(completed: int, fraction: float = 0.0) -> float:
+        return min((completed + fraction) / len(WORKFLOW_NODES), 0.99)
+
+    def on_job_scored(event: Dict[str, Any], matched_job: Optional[MatchedJob]):
+        scored, total = event["scored"], event["total"]
+        changes = {"jobs_scored": scored, "jobs_total": total, "eta_seconds": event["eta_seconds"],
+                   "progress": node_progress(len(run.completed_nodes), scored / total)}
+        if matched_job:
+            changes["matched_jobs"] = run.matched_jobs + [serialize_matched_job(matched_job)]
+        search_runs.update(run, **changes)
+
+    config = {"configurable": {"on_job_scored": on_job_scored}}
+    search_runs.update(run, current_node=WORKFLOW_NODES[0])
+    final_state: Dict[str, Any] = dict(initial_state)
+    # astream runs the graph exactly like ainvoke but reports each finished node
+    async for update in app_workflow.astream(initial_state, config=config, stream_mode="updates"):
+        for node, node_state in update.items():
+            final_state.update(node_state or {})
+            completed = run.completed_nodes + [node]
+            next_index = WORKFLOW_NODES.index(node) + 1 if node in WORKFLOW_NODES else len(WORKFLOW_NODES)
+            search_runs.update(
+                run,
+                completed_nodes=completed,
+                current_node=WORKFLOW_NODES[next_index] if next_index < len(WORKFLOW_NODES) else None,
+                progress=node_progress(len(completed))
+            )
+
+    if final_state.get("error_message"):
+        return {"error_message": final_state["error_message"]}
+    response = search_response(final_state)
+    response["applications_summary"] = final_state.get("applications_summary")
+    return response
+
+# Outcomes a retry would only repeat, so their jobs are dead-lettered at once
+PERMANENT_SEARCH_ERRORS = ("Invalid resume content", "No applications to submit")
+PERMANENT_TX_ERRORS = ("Transaction reverted", "PRIVATE_KEY not configured")
+
+async def run_queued_search(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Work queue handler for "search" jobs"""
+    result = await app_workflow.ainvoke(initial_search_state(JobSearchRequest(**payload)))
+    error = result.get("error_message")
+    if error:
+        if error.startswith(PERMANENT_SEARCH_ERRORS):
+            raise PermanentJobError(error)
+        raise RuntimeError(error)
+    response = search_response(result)
+    response["applications_summary"] = result.get("applications_summary")
+    return response
+
+async def run_queued_application(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Work queue handler for "apply" jobs
+
+    Every attempt reuses the application ID chosen at enqueue time, so an attempt whose
+    transaction landed after its receipt wait gave up is recognised instead of resent.
+    """
+    payload = dict(payload)
+    application_id = payload.pop("application_id", None)
+    application = ApplicationDetails(**payload)
+    if application_id:
+        existing = await contract_client.get_application(application_id)
+        if existing is not None:
+            if (existing.jobId, existing.candidateId) != (application.job_id, application.candidate_id):
+                raise PermanentJobError(f"Application ID {application_id} is already used by another application")
+            return {
+                "application_id": application_id,
+                "status": "submitted",
+                "submitted_at": existing.applicationDate,
+                "job_id": application.job_id,
+                "candidate_id": application.candidate_id
+            }
+
+    result = await apply_to_job(application, application_id)
+    if result["status"] == "failed":
+        tx = contract_client.tx_submitter.status(result["application_id"])
+        error = (tx.error if tx and tx.error else None) or result.get("error") or "Transaction failed"
+        if tx is not None and tx.status == "failed" and error.startswith(PERMANENT_TX_ERRORS):
+            raise PermanentJobError(error)
+        raise RuntimeError(error)
+    return result
+
+work_queue.register("search", run_queued_search, workers=WORK_QUEUE_SEARCH_WORKERS)
+work_queue.register("apply", run_queued_application, workers=WORK_QUEUE_APPLY_WORKERS)
+
+@app.post("/queue/search", status_code=202)
+async def enqueue_search(
+    request: JobSearchRequest,
+    priority: int = Query(0, description="Higher priority searches run first")
+):
+    """Queue a job search on the durable work queue; it survives restarts and is retried on failure"""
+    queued = await asyncio.to_thread(work_queue.enqueue, "search", request.model_dump(), priority)
+    return {"job_id": queued.job_id, "state": queued.state, "status_url": f"/queue/jobs/{queued.job_id}"}
+
+@app.get("/queue/stats")
+async def get_queue_stats():
+    """Depth, state counts and wait/run latency per work queue"""
+    return await asyncio.to_thread(work_queue.stats)
+
+@app.get("/queue/jobs")
+async def list_queue_jobs(
+    queue: Optional[str] = Query(None, description="Only jobs on this queue (search or apply)"),
+    state: Optional[str] = Query(None, description="Only jobs in this state, e.g. dead"),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Most recently enqueued jobs, newest first"""
+    return await asyncio.to_thread(work_queue.list_jobs, queue, state, limit)
+
+@app.get("/queue/jobs/{job_id}")
+async def get_queue_job(job_id: str = Path(..., description="ID returned when the job was queued")):
+    """State, attempts and result of a queued job"""
+    job = await asyncio.to_thread(work_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Queued job {job_id} not found")
+    return job
+
+@app.post("/queue/jobs/{job_id}/retry")
+async def retry_queue_job(job_id: str = Path(..., description="ID of a dead-lettered job")):
+    """Put a dead-lettered job back on its queue"""
+    if not await asyncio.to_thread(work_queue.retry_dead, job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is not dead-lettered")
+    return {"job_id": job_id, "state": "queued"}
+
+@app.post("/searches", status_code=202)
+async def submit_search(request: JobSearchRequest):
+    """Start a job search in the background and return its ID immediately"""
+    initial_state = initial_search_state(request)
+    run = search_runs.submit(request.candidate_id, lambda run: run_search(run, initial_state))
+    return {"search_id": run.search_id, "state": run.state, "status_url": f"/searches/{run.search_id}"}
+
+@app.get("/searches/{search_id}")
+async def get_search(
+    search_id: str = Path(..., description="ID returned by POST /searches"),
+    wait: float = Query(0, ge=0, le=60, description="Long-poll up to this many seconds for a change"),
+    since: int = Query(-1, description="Only return once the run's version is newer than this")
+):
+    """State, node progress and partial matches of a background search"""
+    run = await search_runs.wait(search_id, since, wait) if wait else search_runs.get(search_id)
+    if run is None:
+        raise HTTPException(status_code=404, detail=f"Search {search_id} not found")
+    return run
+
+@app.delete("/searches/{search_id}")
+async def cancel_search(search_id: str = Path(..., description="ID returned by POST /searches")):
+    """Cancel a queued or running search"""
+    if search_runs.get(search_id) is None:
+        raise HTTPException(status_code=404, detail=f"Search {search_id} not found")
+    return {"search_id": search_id, "cancelled": search_runs.cancel(search_id)}
+
+@app.get("/searches")
+async def get_search_stats():
+    """Number of tracked searches in each state"""
+    return search_runs.stats()
+
 @app.get("/search-jobs/{candidate_id}/stream")
 async def stream_job_search(
     candidate_id: str = Path(..., description="The ID of the candidate to search jobs for"),
@@ -738,38 +1546,55 @@ async def stream_job_search(
     """Stream job search progress to frontend"""
     
     async def generate_stream():
+        initial_state = JobSearchState(
+            candidate_id=candidate_id,
+            compatibility_threshold=compatibility_threshold,
+            preferences={},
+            current_step="start",
+            resume_path="/Users/jaydeepdey/Desktop/doc/Resume_Jaydeep_2024.pdf"
+        )
+        # Node completions and per-job scores from match_jobs share one queue, in the order they happen
+        events: asyncio.Queue = asyncio.Queue()
+
+        def on_job_scored(event: Dict[str, Any], matched_job: Optional[MatchedJob]):
+            verdict = "matched" if event["passed"] else "below threshold"
+            events.put_nowait({
+                **event,
+                "message": f"Scored {event['title']} ({event['score']}): {verdict}, "
+                           f"{event['scored']}/{event['total']} done, ~{event['eta_seconds']:.0f}s left"
+            })
+
+        async def run_workflow():
+            try:
+                config = {"configurable": {"on_job_scored": on_job_scored}}
+                async for step_result in app_workflow.astream(initial_state, config=config, stream_mode="updates"):
+                    step_name = list(step_result.keys())[0]
+                    state = step_result[step_name] or {}
+
+                    event_data = {
+                        'step': step_name,
+                        'current_step': state.get('current_step', ''),
+                        'message': f'Completed {step_name}'
+                    }
+
+                    if step_name == 'match_jobs' and state.get('matched_jobs'):
+                        event_data['matched_count'] = len(state['matched_jobs'])
+
+                    events.put_nowait(event_data)
+                events.put_nowait({'step': 'completed', 'message': 'Job search completed'})
+            except Exception as e:
+                events.put_nowait({'step': 'error', 'message': str(e)})
+            finally:
+                events.put_nowait(None)
+
+        yield f"data: {json.dumps({'step': 'started', 'message': 'Starting job search'})}\n\n"
+        producer = asyncio.create_task(run_workflow())
         try:
-            initial_state = JobSearchState(
-                candidate_id=candidate_id,
-                compatibility_threshold=compatibility_threshold,
-                preferences={},
-                current_step="start",
-                resume_path="/Users/jaydeepdey/Desktop/doc/Resume_Jaydeep_2024.pdf"
-            )
-            
-            # Stream each step
-            yield f"data: {json.dumps({'step': 'started', 'message': 'Starting job search'})}\n\n"
-            
-            # FIXED: Use async for loop with astream
-            async for step_result in app_workflow.astream(initial_state):
-                step_name = list(step_result.keys())[0]
-                state = step_result[step_name]
-                
-                event_data = {
-                    'step': step_name,
-                    'current_step': state.get('current_step', ''),
-                    'message': f'Completed {step_name}'
-                }
-                
-                if step_name == 'match_jobs' and state.get('matched_jobs'):
-                    event_data['matched_count'] = len(state['matched_jobs'])
-                
-                yield f"data: {json.dumps(event_data)}\n\n"
-            
-            yield f"data: {json.dumps({'step': 'completed', 'message': 'Job search completed'})}\n\n"
-            
-        except Exception as e:
-            yield f"data: {json.dumps({'step': 'error', 'message': str(e)})}\n\n"
+            while (event := await events.get()) is not None:
+                yield f"data: {json.dumps(event)}\n\n"
+        finally:
+            # Stop scoring as soon as the client disconnects
+            producer.cancel()
     
     return StreamingResponse(
         generate_stream(),
@@ -780,7 +1605,7 @@ async def stream_job_search(
 @app.post("/apply-jobs/{candidate_id}")
 async def apply_to_jobs(
     candidate_id: str = Path(..., description="The ID of the candidate to apply jobs for"),
-    background_tasks: BackgroundTasks = BackgroundTasks()
+    priority: int = Query(0, description="Higher priority applications are submitted first")
 ):
     """Apply to all matched jobs for a candidate"""
     try:
@@ -796,12 +1621,17 @@ async def apply_to_jobs(
         
         application_results = []
         for app in applications:
-            # Add background task for actual application submission
-            background_tasks.add_task(apply_to_job, app)
+            # Queue the on-chain submission so it survives restarts and is retried on failure
+            application_id = new_application_id(app)
+            payload = {**app.model_dump(), "application_id": application_id}
+            queued = await asyncio.to_thread(work_queue.enqueue, "apply", payload, priority)
             application_results.append({
                 "job_id": app.job_id,
-                "status": "submitted",
-                "message": "Application submitted successfully"
+                "application_id": application_id,
+                "status": "queued",
+                "queue_job_id": queued.job_id,
+                "status_url": f"/queue/jobs/{queued.job_id}",
+                "message": "Application queued for submission"
             })
         
         return {
@@ -825,16 +1655,221 @@ async def get_candidate_profile_endpoint(
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Candidate not found: {str(e)}")
 
+@app.get("/candidate/{candidate_id}/applications")
+async def get_candidate_applications(
+    candidate_id: str = Path(..., description="The ID of the candidate"),
+    status: Optional[ApplicationStatus] = Query(None, description="Only applications in this status")
+):
+    """Applications submitted by a candidate, served from the indexed contract mirror"""
+    applications = await contract_client.get_applications_for_candidate(candidate_id, status)
+    return {
+        "candidate_id": candidate_id,
+        "applications": applications,
+        "status_counts": await contract_client.count_by_status(candidate_id=candidate_id)
+    }
+
+@app.get("/jobs/{job_id}/applications")
+async def get_job_applications(
+    job_id: str = Path(..., description="The ID of the job"),
+    status: Optional[ApplicationStatus] = Query(None, description="Only applications in this status")
+):
+    """Applications received by a job, served from the indexed contract mirror"""
+    applications = await contract_client.get_applications_for_job(job_id, status)
+    return {
+        "job_id": job_id,
+        "applications": applications,
+        "status_counts": await contract_client.count_by_status(job_id=job_id)
+    }
+
+async def job_or_404(job_id: str) -> Job:
+    job = (await contract_client.get_jobs([job_id])).items.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@app.get("/jobs/{job_id}/candidates")
+async def rank_job_candidates(
+    job_id: str = Path(..., description="The ID of the job to rank candidates for"),
+    compatibility_threshold: float = Query(0.7, description="Minimum score for a candidate to pass", ge=0.0, le=1.0),
+    shortlist: int = Query(CANDIDATE_SHORTLIST_SIZE, description="Candidates passed from the skill prefilter to AI scoring", ge=1, le=CANDIDATE_SHORTLIST_MAX),
+    min_coverage: float = Query(CANDIDATE_MIN_COVERAGE, description="Least skill coverage of the job worth scoring", ge=0.0, le=1.0)
+):
+    """Registered candidates ranked by AI compatibility with a job"""
+    job = await job_or_404(job_id)
+    async for event in rank_candidates_for_job(job, compatibility_threshold, shortlist, min_coverage):
+        if event["step"] == "completed":
+            return event
+
+@app.get("/jobs/{job_id}/candidates/stream")
+async def stream_job_candidates(
+    job_id: str = Path(..., description="The ID of the job to rank candidates for"),
+    compatibility_threshold: float = Query(0.7, description="Minimum score for a candidate to pass", ge=0.0, le=1.0),
+    shortlist: int = Query(CANDIDATE_SHORTLIST_SIZE, description="Candidates passed from the skill prefilter to AI scoring", ge=1, le=CANDIDATE_SHORTLIST_MAX),
+    min_coverage: float = Query(CANDIDATE_MIN_COVERAGE, description="Least skill coverage of the job worth scoring", ge=0.0, le=1.0)
+):
+    """Stream candidate scores for a job as they finish, then the final ranking"""
+    job = await job_or_404(job_id)
+
+    async def generate_stream():
+        events = rank_candidates_for_job(job, compatibility_threshold, shortlist, min_coverage)
+        try:
+            async for event in events:
+                yield f"data: {json.dumps(event)}\n\n"
+        except Exception as e:
+            yield f"data: {json.dumps({'step': 'error', 'message': str(e)})}\n\n"
+        finally:
+            # Cancels the outstanding scoring tasks when the client disconnects
+            await events.aclose()
+
+    return StreamingResponse(
+        generate_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "Connection": "keep-alive"}
+    )
+
+@app.get("/applications/status-counts")
+async def get_application_status_counts(
+    candidate_id: Optional[str] = Query(None, description="Only count this candidate's applications"),
+    job_id: Optional[str] = Query(None, description="Only count applications to this job")
+):
+    """Number of applications per status"""
+    return await contract_client.count_by_status(candidate_id=candidate_id, job_id=job_id)
+
+@app.get("/cache/stats")
+async def get_cache_stats():
+    """Hit/miss counters for the job match, resume and contract view caches"""
+    return {
+        "match_cache": await asyncio.to_thread(match_cache.stats),
+        "resume_cache": resume_cache.stats(),
+        "view_cache": contract_client.view_cache.stats(),
+        "store_cache": contract_client.store_cache.stats()
+    }
+
+@app.get("/prompts/stats")
+async def get_prompt_stats():
+    """Input tokens per match prompt and job summary cache counters"""
+    return {
+        "tokenizer": tokenizer_name(),
+        "input_tokens": prompt_stats.stats(),
+        "job_summaries": job_summaries.stats()
+    }
+
+@app.get("/llm/stats")
+async def get_llm_stats():
+    """Concurrency limit, queue and rate-limit counters of the shared LLM scheduler"""
+    return llm_scheduler.stats()
+
+@app.get("/resume-validator/stats")
+async def get_resume_validator_stats():
+    """How often resume validation is decided locally versus escalated to the LLM"""
+    return resume_validator.stats()
+
+@app.get("/transactions/stats")
+async def get_transaction_stats():
+    """Nonce and receipt-tracking counters of the application submitter"""
+    return contract_client.tx_submitter.stats()
+
+@app.get("/transactions/{application_id}")
+async def get_transaction_status(
+    application_id: str = Path(..., description="The application ID the transaction was sent for")
+):
+    """Confirmation status of a submitted application transaction"""
+    tx = contract_client.tx_submitter.status(application_id)
+    if tx is None:
+        raise HTTPException(status_code=404, detail=f"No transaction tracked for {application_id}")
+    return tx
+
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus text exposition of request, node, LLM, RPC, transaction, cache and queue metrics"""
+    # Some collectors query SQLite under a lock (match cache size, work queue depths)
+    content = await asyncio.to_thread(metrics.render)
+    return Response(content=content, media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/indexer/status")
+async def get_indexer_status():
+    """Block watermark and row counts of the local contract mirror"""
+    return {
+        "enabled": CONTRACT_INDEXER_ENABLED,
+        "ready": contract_store.is_ready(),
+        "watermark": contract_store.get_watermark(),
+        "counts": contract_store.counts()
+    }
+
+def encode_cursor(job_id: str) -> str:
+    return base64.urlsafe_b64encode(job_id.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> str:
+    try:
+        return base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def project_job(raw_job: str, fields: Optional[List[str]]) -> bytes:
+    """Stored job JSON, optionally reduced to ``fields``; unprojected rows are passed through as-is"""
+    if not fields:
+        return raw_job.encode("utf-8")
+    job = json_loads(raw_job)
+    return json_dumps({field: job[field] for field in fields})
+
 @app.get("/jobs")
 async def get_jobs():
     """Get all available jobs"""
     try:
-        jobs = await get_available_jobs()
-        print(jobs, 'jobs')
-        return {"jobs": jobs, "count": len(jobs)}
+        jobs = await contract_client.fetch_all_jobs()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching jobs: {str(e)}")
+    return {"jobs": jobs, "count": len(jobs)}
+
+@app.get("/v2/jobs")
+async def get_jobs_page(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(JOBS_PAGE_SIZE, ge=1, le=JOBS_MAX_PAGE_SIZE),
+    location: Optional[Location] = Query(None),
+    job_type: Optional[JobType] = Query(None),
+    status: Optional[JobStatus] = Query(None),
+    company_id: Optional[str] = Query(None),
+    skill: Optional[List[str]] = Query(None, description="Jobs listing any of these skills"),
+    fields: Optional[str] = Query(None, description="Comma-separated Job fields to return"),
+    format: str = Query("json", pattern="^(json|ndjson)$", description="ndjson streams every matching job")
+):
+    """Jobs ordered by ID, filtered server-side and paginated by cursor"""
+    filters = {
+        "location": location.value if location else None,
+        "job_type": job_type.value if job_type else None,
+        "status": status.value if status else None,
+        "company_id": company_id,
+        "skills": skill,
+    }
+    selected = [field.strip() for field in fields.split(",") if field.strip()] if fields else None
+    unknown = [field for field in selected or [] if field not in Job.model_fields]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown job fields: {', '.join(unknown)}")
+    after_id = decode_cursor(cursor) if cursor else None
+
+    page_size = JOBS_STREAM_PAGE_SIZE if format == "ndjson" else limit
+    try:
+        page = await contract_client.query_jobs(filters, after_id, page_size)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching jobs: {str(e)}")
 
+    if format == "ndjson":
+        async def stream(page: List[str]):
+            # The first page is read before the response starts so failures still get a 500
+            while page:
+                yield b"".join(project_job(raw_job, selected) + b"\n" for raw_job in page)
+                if len(page) < JOBS_STREAM_PAGE_SIZE:
+                    break
+                page = await contract_client.query_jobs(filters, json_loads(page[-1])["jobId"], JOBS_STREAM_PAGE_SIZE)
+        return StreamingResponse(stream(page), media_type="application/x-ndjson")
+
+    next_cursor = encode_cursor(json_loads(page[-1])["jobId"]) if len(page) == limit else None
+    body = (
+        b'{"jobs":[' + b",".join(project_job(raw_job, selected) for raw_job in page) + b'],'
+        + b'"count":' + str(len(page)).encode() + b',"next_cursor":' + json_dumps(next_cursor) + b"}"
+    )
+    return Response(content=body, media_type="application/json")
+
 
 # Request body
 class MetadataUpdateRequest(BaseModel):
@@ -0,0 +1,201 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+MATCH_CACHE_ENABLED = os.getenv("MATCH_CACHE_ENABLED", "true").lower() == "true"
+MATCH_CACHE_PATH = os.getenv("MATCH_CACHE_PATH", ".cache/match_cache.sqlite3")
+MATCH_CACHE_MEMORY_SIZE = int(os.getenv("MATCH_CACHE_MEMORY_SIZE", "2048"))
+MATCH_CACHE_MAX_ROWS = int(os.getenv("MATCH_CACHE_MAX_ROWS", "50000"))
+MATCH_CACHE_TTL_SECONDS = float(os.getenv("MATCH_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+# How many writes between size checks on the on-disk tier
+_EVICTION_INTERVAL = 100
+# Disk hits whose access times are buffered before they are written in one transaction
+_TOUCH_BATCH_SIZE = 64
+
+
+def content_hash(*parts: Any) -> str:
+    """Stable SHA-256 over JSON-serializable parts (pydantic models are dumped first)"""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, BaseModel):
+            part = part.model_dump(mode="json")
+        digest.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+class MatchCache:
+    """Two-tier cache of parsed job match evaluations
+
+    An in-memory LRU sits in front of a SQLite table. Both tiers honour the TTL;
+    the SQLite tier is trimmed to ``max_rows`` by least-recent access. Access times
+    of disk hits are buffered and written in batches. Calls do blocking SQLite IO;
+    run them off the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str = MATCH_CACHE_PATH,
+        memory_size: int = MATCH_CACHE_MEMORY_SIZE,
+        max_rows: int = MATCH_CACHE_MAX_ROWS,
+        ttl_seconds: float = MATCH_CACHE_TTL_SECONDS
+    ):
+        self.path = path
+        self.memory_size = memory_size
+        self.max_rows = max_rows
+        self.ttl_seconds = ttl_seconds
+        self._memory: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._touched: Dict[str, float] = {}
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS match_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS match_cache_accessed ON match_cache (accessed_at)")
+        self._conn.commit()
+
+    def make_key(self, *parts: Any) -> str:
+        return content_hash(*parts)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._get(key, time.time())
+            if len(self._touched) >= _TOUCH_BATCH_SIZE:
+                self._flush_touched()
+                self._conn.commit()
+            return value
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Cached values for the keys that have one"""
+        now = time.time()
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._get(key, now)
+                if value is not None:
+                    found[key] = value
+            if self._touched:
+                self._flush_touched()
+                self._conn.commit()
+        return found
+
+    def _get(self, key: str, now: float) -> Optional[Dict[str, Any]]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            del self._memory[key]
+
+        row = self._conn.execute(
+            "SELECT value, expires_at FROM match_cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or row[1] <= now:
+            if row is not None:
+                self._conn.execute("DELETE FROM match_cache WHERE key = ?", (key,))
+                self._conn.commit()
+            self.misses += 1
+            return None
+
+        self._touched[key] = now
+        value = json.loads(row[0])
+        self._remember(key, row[1], value)
+        self.disk_hits += 1
+        return value
+
+    def set(self, key: str, value: Dict[str, Any]):
+        self.set_many([(key, value)])
+
+    def set_many(self, items: List[Tuple[str, Dict[str, Any]]]):
+        """Store several values in one transaction"""
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with self._lock:
+            for key, value in items:
+                self._remember(key, expires_at, value)
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO match_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, json.dumps(value), expires_at, now)
+                )
+                self._touched.pop(key, None)
+                self._writes += 1
+                if self._writes % _EVICTION_INTERVAL == 0:
+                    self._flush_touched()
+                    self._evict(now)
+            self._conn.commit()
+
+    def _flush_touched(self):
+        self._conn.executemany(
+            "UPDATE match_cache SET accessed_at = ? WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in self._touched.items()]
+        )
+        self._touched.clear()
+
+    def _remember(self, key: str, expires_at: float, value: Dict[str, Any]):
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _evict(self, now: float):
+        """Drop expired rows, then the least recently used rows above ``max_rows``"""
+        self._conn.execute("DELETE FROM match_cache WHERE expires_at <= ?", (now,))
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM match_cache").fetchone()
+        excess = count - self.max_rows
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM match_cache WHERE key IN "
+                "(SELECT key FROM match_cache ORDER BY accessed_at ASC LIMIT ?)",
+                (excess,)
+            )
+            logger.info(f"Evicted {excess} match cache rows over the {self.max_rows} row limit")
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            self._touched.clear()
+            self._conn.execute("DELETE FROM match_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        with self._lock:
+            (disk_entries,) = self._conn.execute("SELECT COUNT(*) FROM match_cache").fetchone()
+            memory_entries = len(self._memory)
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+            "memory_entries": memory_entries,
+            "disk_entries": disk_entries,
+        }
+
+
+# Global match cache instance
+match_cache = MatchCache()
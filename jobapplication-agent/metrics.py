@@ -0,0 +1,275 @@
+import math
+import time
+import bisect
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Label values are passed positionally in the order of a metric's label names
+LabelValues = Tuple[str, ...]
+Collect = Callable[[], Dict[LabelValues, float]]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), collect: Optional[Collect] = None):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        # Metrics with a collect callback read their values from elsewhere at scrape time
+        self.collect = collect
+        self._lock = threading.Lock()
+
+    def _header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def _values(self) -> Dict[LabelValues, float]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        if self.collect is not None:
+            try:
+                values = self.collect()
+            except Exception as e:
+                logger.warning(f"Could not collect metric {self.name}: {e}")
+                values = {}
+        else:
+            values = self._values()
+        lines = self._header()
+        for labels, value in sorted(values.items()):
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic total per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._totals: Dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._totals[labels] = self._totals.get(labels, 0.0) + amount
+
+    def _values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._totals)
+
+
+class Gauge(_Metric):
+    """Current value per label combination"""
+
+    kind = "gauge"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._current: Dict[LabelValues, float] = {}
+
+    def set(self, value: float, *labels: str):
+        with self._lock:
+            self._current[labels] = value
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._current[labels] = self._current.get(labels, 0.0) + amount
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def _values(self) -> Dict[LabelValues, float]:
+        with self._lock:
+            return dict(self._current)
+
+
+class Histogram(_Metric):
+    """Observations per label combination, counted into fixed buckets"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, label_names)
+        self.buckets = tuple(sorted(buckets))
+        # Per label combination: [count per bucket (last is +Inf, not cumulative), sum]
+        self._series: Dict[LabelValues, List[Any]] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def time(self, *labels: str) -> "_Timer":
+        """Context manager observing the seconds its block takes"""
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        with self._lock:
+            series = {labels: ([*counts], total) for labels, (counts, total) in self._series.items()}
+        lines = self._header()
+        names = self.label_names + ("le",)
+        for labels, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                lines.append(f"{self.name}_bucket{_format_labels(names, labels + (_format_value(bound),))} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, labels: LabelValues):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.started, *self.labels)
+        return False
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, label_names: Sequence[str] = (), collect: Optional[Collect] = None) -> Counter:
+        return self.register(Counter(name, documentation, label_names, collect))
+
+    def gauge(self, name: str, documentation: str, label_names: Sequence[str] = (), collect: Optional[Collect] = None) -> Gauge:
+        return self.register(Gauge(name, documentation, label_names, collect))
+
+    def histogram(
+        self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, label_names, buckets))
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+class HTTPMetricsMiddleware:
+    """ASGI middleware timing every HTTP request by method, route template and status
+
+    Requests that match no route are labelled "unmatched" so arbitrary paths cannot
+    create new series. Streaming responses are timed until their last chunk is sent.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter()
+        status = ["500"]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = str(message["status"])
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_in_flight.dec()
+            route = scope.get("route")
+            path = getattr(route, "path", None) or "unmatched"
+            labels = (scope.get("method", ""), path, status[0])
+            http_requests.inc(*labels)
+            http_request_seconds.observe(time.perf_counter() - started, *labels)
+
+
+# Global registry served by GET /metrics, and the metrics recorded in-process
+metrics = MetricsRegistry()
+
+http_requests = metrics.counter("agent_http_requests_total", "HTTP requests handled", ("method", "route", "status"))
+http_request_seconds = metrics.histogram(
+    "agent_http_request_seconds", "HTTP request duration until the response is fully sent", ("method", "route", "status")
+)
+http_in_flight = metrics.gauge("agent_http_requests_in_flight", "HTTP requests being handled")
+
+graph_node_seconds = metrics.histogram(
+    "agent_graph_node_seconds", "LangGraph node duration", ("node", "outcome"),
+    (0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+)
+
+llm_request_seconds = metrics.histogram(
+    "agent_llm_request_seconds", "Duration of each LLM request attempt", ("outcome",),
+    (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 15.0, 30.0, 60.0, 120.0)
+)
+llm_queue_seconds = metrics.histogram(
+    "agent_llm_queue_seconds", "Time LLM requests wait for the scheduler to admit them",
+    buckets=(0.001, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+llm_tokens = metrics.counter("agent_llm_tokens_total", "LLM tokens used", ("kind",))
+
+rpc_seconds = metrics.histogram(
+    "agent_rpc_seconds", "Duration of each RPC call", ("method", "function", "outcome"),
+    (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+
+tx_confirmation_seconds = metrics.histogram(
+    "agent_tx_confirmation_seconds", "Time from sending a transaction until its receipt settles it", ("outcome",),
+    (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+)
+
+queue_wait_seconds = metrics.histogram(
+    "agent_work_queue_wait_seconds", "Time work queue jobs wait before a worker claims them", ("queue",),
+    (0.01, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0)
+)
+queue_run_seconds = metrics.histogram(
+    "agent_work_queue_run_seconds", "Work queue handler duration", ("queue", "outcome"),
+    (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 900.0)
+)
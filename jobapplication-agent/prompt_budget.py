@@ -0,0 +1,278 @@
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Set, Tuple
+from models import Job
+from job_index import skill_tokens
+from match_cache import content_hash
+
+logger = logging.getLogger(__name__)
+
+PROMPT_COMPACTION_ENABLED = os.getenv("PROMPT_COMPACTION_ENABLED", "true").lower() == "true"
+# Total tokens a single-job evaluation prompt may use
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "1200"))
+# Upper bound for the resume excerpt; the excerpt never shrinks below PROMPT_RESUME_MIN_TOKENS
+PROMPT_RESUME_TOKENS = int(os.getenv("PROMPT_RESUME_TOKENS", "400"))
+PROMPT_RESUME_MIN_TOKENS = int(os.getenv("PROMPT_RESUME_MIN_TOKENS", "120"))
+# Length of the cached job description summaries sent in place of full descriptions
+JOB_SUMMARY_TOKENS = int(os.getenv("JOB_SUMMARY_TOKENS", "120"))
+JOB_SUMMARY_CACHE_SIZE = int(os.getenv("JOB_SUMMARY_CACHE_SIZE", "4096"))
+TOKENIZER_MODEL = os.getenv("TOKENIZER_MODEL", "gpt-4o-mini")
+
+# Resume excerpt used when compaction is off (the original fixed-length slice)
+LEGACY_RESUME_CHARS = 800
+
+RESUME_HEADINGS = {
+    "summary", "profile", "objective", "experience", "work experience", "employment",
+    "professional experience", "work history", "education", "skills", "technical skills",
+    "projects", "certifications", "publications", "awards", "achievements", "languages",
+    "volunteering", "interests",
+}
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+_encoding = None
+_encoding_loaded = False
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    """tiktoken encoding for TOKENIZER_MODEL, or None when tiktoken or its data is unavailable"""
+    global _encoding, _encoding_loaded
+    if not _encoding_loaded:
+        with _encoding_lock:
+            if not _encoding_loaded:
+                try:
+                    import tiktoken
+                    _encoding = tiktoken.encoding_for_model(TOKENIZER_MODEL)
+                except Exception as e:  # tiktoken is optional and downloads its BPE files on first use
+                    logger.warning(f"tiktoken unavailable ({e}); estimating tokens from character counts")
+                    _encoding = None
+                _encoding_loaded = True
+    return _encoding
+
+
+def tokenizer_name() -> str:
+    encoding = _get_encoding()
+    return encoding.name if encoding is not None else "estimate"
+
+
+def count_tokens(text: str) -> int:
+    """Token count of ``text`` for the configured model (about four characters per token without tiktoken)"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+
+def truncate_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` to at most ``max_tokens`` tokens"""
+    if max_tokens <= 0:
+        return ""
+    encoding = _get_encoding()
+    if encoding is not None:
+        tokens = encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+    return text[:max_tokens * 4]
+
+
+def _terms(text: str) -> Set[str]:
+    return {word.rstrip(".") for word in _WORD_RE.findall(text.lower())}
+
+
+def job_terms(job: Job) -> Set[str]:
+    """Skill and title tokens used to judge which text is relevant to a job"""
+    return skill_tokens(job.requirements + job.skills + [job.title])
+
+
+def select_within_budget(chunks: List[str], terms: Set[str], max_tokens: int, min_tokens: int = 0) -> str:
+    """Chunks that mention ``terms`` (plus the opening chunk for context), most relevant first
+    while they fit ``max_tokens``, joined in their original order
+
+    When that comes to less than ``min_tokens``, the remaining chunks are added in order
+    until it does not.
+    """
+    chunks = list(dict.fromkeys(chunk for chunk in chunks if chunk))
+    if not chunks:
+        return ""
+
+    scores = [len(_terms(chunk) & terms) for chunk in chunks]
+    # Relevant chunks first, earlier chunks breaking ties; filler that mentions no term is left out
+    ranked = sorted((i for i in range(len(chunks)) if scores[i] or i == 0), key=lambda i: (-scores[i], i))
+    chosen, used = [], 0
+    for i in ranked:
+        cost = count_tokens(chunks[i])
+        if used + cost <= max_tokens:
+            chosen.append(i)
+            used += cost
+    for i in range(len(chunks)):
+        if used >= min_tokens:
+            break
+        cost = count_tokens(chunks[i])
+        if i not in chosen and used + cost <= max_tokens:
+            chosen.append(i)
+            used += cost
+    if not chosen:
+        return truncate_tokens(chunks[ranked[0]], max_tokens)
+    return "\n".join(chunks[i] for i in sorted(chosen))
+
+
+def split_resume_sections(resume: str, max_section_lines: int = 6) -> List[str]:
+    """Split a resume into sections at headings and blank lines, and long sections into line groups"""
+    sections: List[List[str]] = []
+    current: List[str] = []
+    for raw_line in resume.splitlines():
+        line = raw_line.strip()
+        is_heading = line.lower().rstrip(":") in RESUME_HEADINGS
+        if not line or is_heading or len(current) >= max_section_lines:
+            if current:
+                sections.append(current)
+            current = []
+        if line:
+            current.append(line)
+    if current:
+        sections.append(current)
+    return [" ".join(lines) if len(lines) == 1 else "\n".join(lines) for lines in sections]
+
+
+def resume_excerpt(resume: str, terms: Set[str], max_tokens: int) -> str:
+    """The resume sections most relevant to ``terms`` within ``max_tokens``"""
+    return select_within_budget(
+        split_resume_sections(resume), terms, max_tokens, min(PROMPT_RESUME_MIN_TOKENS, max_tokens)
+    )
+
+
+def summarize_job(job: Job, max_tokens: int = JOB_SUMMARY_TOKENS) -> str:
+    """Extractive summary of a job description: its most skill-relevant sentences within ``max_tokens``"""
+    sentences = [sentence.strip() for sentence in _SENTENCE_RE.split(job.description or "") if sentence.strip()]
+    return select_within_budget(sentences, job_terms(job), max_tokens)
+
+
+class JobSummaryCache:
+    """LRU of job description summaries, rebuilt when the job's content changes"""
+
+    def __init__(self, max_entries: int = JOB_SUMMARY_CACHE_SIZE, max_tokens: int = JOB_SUMMARY_TOKENS):
+        self.max_entries = max_entries
+        self.max_tokens = max_tokens
+        self._entries: "OrderedDict[str, Tuple[str, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, job: Job) -> str:
+        fingerprint = content_hash(job)
+        with self._lock:
+            entry = self._entries.get(job.jobId)
+            if entry is not None and entry[0] == fingerprint:
+                self._entries.move_to_end(job.jobId)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                self.invalidations += 1
+            self.misses += 1
+
+        summary = summarize_job(job, self.max_tokens)
+        with self._lock:
+            self._entries[job.jobId] = (fingerprint, summary)
+            self._entries.move_to_end(job.jobId)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return summary
+
+    def warm(self, jobs: List[Job]):
+        """Precompute summaries so scoring does not pay for them"""
+        for job in jobs:
+            self.get(job)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
+
+
+class PromptTokenStats:
+    """Running input-token totals per prompt kind, for comparing compaction settings"""
+
+    def __init__(self):
+        self._totals: Dict[str, List[int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, kind: str, tokens: int, jobs: int = 1):
+        with self._lock:
+            totals = self._totals.setdefault(kind, [0, 0, 0])
+            totals[0] += 1
+            totals[1] += jobs
+            totals[2] += tokens
+
+    def reset(self):
+        with self._lock:
+            self._totals.clear()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            return {
+                kind: {
+                    "prompts": prompts,
+                    "jobs": jobs,
+                    "input_tokens": tokens,
+                    "input_tokens_per_prompt": tokens / prompts if prompts else 0.0,
+                    "input_tokens_per_job": tokens / jobs if jobs else 0.0,
+                }
+                for kind, (prompts, jobs, tokens) in self._totals.items()
+            }
+
+
+class MatchPromptBuilder:
+    """Chooses the job text and resume excerpt for match prompts within a token budget
+
+    ``fixed_text`` is everything in a single-job prompt that does not depend on the
+    job or resume (template, candidate skills, format instructions). With
+    compaction off, prompts get full descriptions and the first 800 resume characters.
+    """
+
+    def __init__(
+        self,
+        resume: str,
+        fixed_text: str,
+        enabled: bool = PROMPT_COMPACTION_ENABLED,
+        token_budget: int = PROMPT_TOKEN_BUDGET,
+        resume_tokens: int = PROMPT_RESUME_TOKENS
+    ):
+        self.resume = resume
+        self.enabled = enabled
+        self.token_budget = token_budget
+        self.resume_tokens = resume_tokens
+        self.fixed_tokens = count_tokens(fixed_text) if enabled else 0
+
+    def describe(self, job: Job) -> str:
+        return job_summaries.get(job) if self.enabled else job.description
+
+    def job_resume(self, job: Job) -> str:
+        """Resume excerpt for a single-job prompt: whatever budget the job text leaves, up to resume_tokens"""
+        if not self.enabled:
+            return self.resume[:LEGACY_RESUME_CHARS]
+        job_text = " ".join([job.title, self.describe(job), ", ".join(job.requirements)])
+        available = self.token_budget - self.fixed_tokens - count_tokens(job_text)
+        budget = max(PROMPT_RESUME_MIN_TOKENS, min(self.resume_tokens, available))
+        return resume_excerpt(self.resume, job_terms(job), budget)
+
+    def shared_resume(self, jobs: List[Job]) -> str:
+        """One resume excerpt relevant to all of ``jobs``, for batched prompts"""
+        if not self.enabled:
+            return self.resume[:LEGACY_RESUME_CHARS]
+        terms: Set[str] = set()
+        for job in jobs:
+            terms |= job_terms(job)
+        return resume_excerpt(self.resume, terms, self.resume_tokens)
+
+
+# Global caches used by the match prompts
+job_summaries = JobSummaryCache()
+prompt_stats = PromptTokenStats()
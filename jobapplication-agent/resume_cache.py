@@ -0,0 +1,198 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+RESUME_CACHE_PATH = os.getenv("RESUME_CACHE_PATH", ".cache/resume_cache.sqlite3")
+# How long extractions are reused; "invalid" verdicts expire sooner so a wrong rejection corrects itself
+RESUME_CACHE_TTL_SECONDS = float(os.getenv("RESUME_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+RESUME_CACHE_INVALID_TTL_SECONDS = float(os.getenv("RESUME_CACHE_INVALID_TTL_SECONDS", "3600"))
+
+# Kept in PRAGMA user_version; version 1 keys extractions by mode and validator version
+_SCHEMA_VERSION = 1
+
+
+class CachedResume(BaseModel):
+    content_hash: str
+    mode: str
+    validator_version: str
+    text: str
+    pages: Optional[List[Dict[str, Any]]] = None
+    is_valid: bool
+    reason: str
+
+
+def file_sha256(path: str, chunk_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ResumeCache:
+    """Extracted and validated resume text, keyed by the file's content hash, the
+    extraction mode and the validator version
+
+    A second table remembers (path, mtime, size) -> hash so unchanged files are
+    not re-hashed on every lookup. Entries expire after ``ttl`` seconds, or
+    ``invalid_ttl`` for rejected resumes. Calls do blocking file and SQLite IO;
+    run them off the event loop.
+    """
+
+    def __init__(
+        self,
+        path: str = RESUME_CACHE_PATH,
+        ttl: float = RESUME_CACHE_TTL_SECONDS,
+        invalid_ttl: float = RESUME_CACHE_INVALID_TTL_SECONDS
+    ):
+        self.path = path
+        self.ttl = ttl
+        self.invalid_ttl = invalid_ttl
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        (schema_version,) = self._conn.execute("PRAGMA user_version").fetchone()
+        if schema_version < 1:
+            # Entries from before the mode and validator version were part of the key
+            self._conn.execute("DROP TABLE IF EXISTS resume_content")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS resume_extractions (
+                content_hash TEXT NOT NULL,
+                mode TEXT NOT NULL,
+                validator_version TEXT NOT NULL,
+                text TEXT NOT NULL,
+                pages TEXT,
+                is_valid INTEGER NOT NULL,
+                reason TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (content_hash, mode, validator_version)
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS resume_files (
+                path TEXT PRIMARY KEY,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT NOT NULL
+            )
+        """)
+        self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        self._conn.commit()
+
+    def content_hash(self, file_path: str) -> Optional[str]:
+        """Hash of the file's bytes, reusing the stored hash while mtime and size are unchanged"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT mtime_ns, size, content_hash FROM resume_files WHERE path = ?", (file_path,)
+            ).fetchone()
+        if row is not None and row[0] == stat.st_mtime_ns and row[1] == stat.st_size:
+            return row[2]
+
+        try:
+            digest = file_sha256(file_path)
+        except OSError:
+            return None
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resume_files (path, mtime_ns, size, content_hash) VALUES (?, ?, ?, ?)",
+                (file_path, stat.st_mtime_ns, stat.st_size, digest)
+            )
+            self._conn.commit()
+        return digest
+
+    def get(self, file_path: str, mode: str, validator_version: str) -> Optional[CachedResume]:
+        digest = self.content_hash(file_path)
+        if digest is None:
+            return None
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, pages, is_valid, reason, created_at FROM resume_extractions "
+                "WHERE content_hash = ? AND mode = ? AND validator_version = ?",
+                (digest, mode, validator_version)
+            ).fetchone()
+        if row is None or time.time() - row[4] > (self.ttl if row[2] else self.invalid_ttl):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return CachedResume(
+            content_hash=digest, mode=mode, validator_version=validator_version, text=row[0],
+            pages=json.loads(row[1]) if row[1] is not None else None, is_valid=bool(row[2]), reason=row[3]
+        )
+
+    def put(
+        self,
+        file_path: str,
+        mode: str,
+        validator_version: str,
+        text: str,
+        pages: Optional[List[Dict[str, Any]]],
+        is_valid: bool,
+        reason: str
+    ) -> Optional[CachedResume]:
+        digest = self.content_hash(file_path)
+        if digest is None:
+            return None
+
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO resume_extractions "
+                "(content_hash, mode, validator_version, text, pages, is_valid, reason, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (digest, mode, validator_version, text, json.dumps(pages) if pages is not None else None,
+                 int(is_valid), reason, now)
+            )
+            self._conn.execute(
+                "DELETE FROM resume_extractions WHERE created_at < ? OR (is_valid = 0 AND created_at < ?)",
+                (now - self.ttl, now - self.invalid_ttl)
+            )
+            self._conn.commit()
+        return CachedResume(
+            content_hash=digest, mode=mode, validator_version=validator_version, text=text,
+            pages=pages, is_valid=is_valid, reason=reason
+        )
+
+    def invalidate(self, file_path: str) -> int:
+        """Forget every cached extraction of this file's current content; returns how many"""
+        digest = self.content_hash(file_path)
+        if digest is None:
+            return 0
+        with self._lock:
+            deleted = self._conn.execute(
+                "DELETE FROM resume_extractions WHERE content_hash = ?", (digest,)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+# Global resume cache instance
+resume_cache = ResumeCache()
@@ -0,0 +1,134 @@
+import os
+import re
+import logging
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Minimum confidence (0-1) for the local validator to decide without the LLM
+RESUME_VALIDATOR_CONFIDENCE = float(os.getenv("RESUME_VALIDATOR_CONFIDENCE", "0.6"))
+# Bump when the rules below change so cached verdicts are not reused
+RESUME_VALIDATOR_VERSION = "1"
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|sept|oct|nov|dec)[a-z]*\.?"
+
+SECTION_HEADER_RE = re.compile(
+    r"^[\s#*•\-]*(work experience|professional experience|experience|employment history|work history|"
+    r"education|academic background|technical skills|skills|projects|summary|professional summary|"
+    r"profile|objective|certifications|achievements|awards|publications|languages|volunteering|interests)"
+    r"\s*:?\s*$",
+    re.IGNORECASE | re.MULTILINE
+)
+EMAIL_RE = re.compile(r"[\w.+-]+@[\w-]+\.[\w.-]+")
+PHONE_RE = re.compile(r"(?:\+?\d{1,3}[\s.-]?)?(?:\(\d{2,4}\)|\d{2,4})[\s.-]?\d{3,4}[\s.-]?\d{3,4}")
+PROFILE_LINK_RE = re.compile(r"(linkedin\.com/|github\.com/|gitlab\.com/|portfolio)", re.IGNORECASE)
+DATE_RANGE_RE = re.compile(
+    rf"(?:{_MONTH}\s*|\d{{1,2}}/)?(?:19|20)\d{{2}}\s*(?:-|–|—|to)\s*"
+    rf"(?:present|current|now|(?:{_MONTH}\s*|\d{{1,2}}/)?(?:19|20)\d{{2}})",
+    re.IGNORECASE
+)
+
+RESUME_LEXICON = {
+    "developed", "designed", "implemented", "managed", "led", "built", "delivered", "improved",
+    "collaborated", "responsible", "engineer", "developer", "analyst", "intern", "internship",
+    "manager", "consultant", "university", "college", "bachelor", "master", "b.s", "m.s", "b.tech",
+    "gpa", "degree", "certified", "certification", "experience", "skills", "projects", "team",
+    "stakeholders", "python", "java", "javascript", "sql", "aws", "docker", "react",
+}
+_WORD_RE = re.compile(r"[a-z][a-z.+#]*")
+
+# Relative weight of each signal in the overall score
+SIGNAL_WEIGHTS = {
+    "sections": 0.35,
+    "contact": 0.2,
+    "dates": 0.2,
+    "lexicon": 0.25,
+}
+
+
+class ResumeAssessment(BaseModel):
+    score: float
+    confidence: float
+    signals: Dict[str, float]
+
+
+class ResumeValidator:
+    """Heuristic resume detector that only escalates ambiguous documents to an LLM
+
+    The score combines section headers, contact details, date-range density and
+    a keyword lexicon. Documents whose confidence (distance of the score from 0.5,
+    scaled to 0-1) reaches ``confidence_threshold`` are decided locally.
+    """
+
+    def __init__(
+        self,
+        confidence_threshold: float = RESUME_VALIDATOR_CONFIDENCE,
+        escalate: Optional[Callable[[str], Awaitable[Tuple[bool, str]]]] = None
+    ):
+        self.confidence_threshold = confidence_threshold
+        self.escalate = escalate
+        self.total = 0
+        self.accepted_locally = 0
+        self.rejected_locally = 0
+        self.escalated = 0
+        self.escalation_errors = 0
+
+    @property
+    def version(self) -> str:
+        """Identifies the rules and threshold behind a verdict, for caching it"""
+        return f"{RESUME_VALIDATOR_VERSION}:{self.confidence_threshold}"
+
+    def assess(self, text: str) -> ResumeAssessment:
+        sample = text[:20000]
+        sections = {match.lower() for match in SECTION_HEADER_RE.findall(sample)}
+        contact_hits = (
+            bool(EMAIL_RE.search(sample))
+            + bool(PHONE_RE.search(sample))
+            + bool(PROFILE_LINK_RE.search(sample))
+        )
+        date_ranges = len(DATE_RANGE_RE.findall(sample))
+        per_thousand_chars = date_ranges / max(len(sample) / 1000, 1)
+        lexicon_hits = len(RESUME_LEXICON.intersection(_WORD_RE.findall(sample.lower())))
+
+        signals = {
+            "sections": min(len(sections) / 3, 1.0),
+            "contact": min(contact_hits / 2, 1.0),
+            "dates": min(per_thousand_chars / 1.5, 1.0),
+            "lexicon": min(lexicon_hits / 8, 1.0),
+        }
+        score = sum(SIGNAL_WEIGHTS[name] * value for name, value in signals.items())
+        return ResumeAssessment(score=score, confidence=abs(score - 0.5) * 2, signals=signals)
+
+    async def validate(self, text: str) -> Tuple[bool, str]:
+        """Decide locally when confident, otherwise defer to the escalation callback"""
+        self.total += 1
+        if not text or len(text.strip()) < 50:
+            self.rejected_locally += 1
+            return False, "Text too short or empty"
+
+        assessment = self.assess(text)
+        if assessment.confidence >= self.confidence_threshold or self.escalate is None:
+            if assessment.score >= 0.5:
+                self.accepted_locally += 1
+                return True, f"Valid resume content detected (local score {assessment.score:.2f})"
+            self.rejected_locally += 1
+            return False, f"Content doesn't appear to be resume-related (local score {assessment.score:.2f})"
+
+        self.escalated += 1
+        logger.info(f"Escalating ambiguous resume to LLM (score {assessment.score:.2f}, signals {assessment.signals})")
+        try:
+            return await self.escalate(text)
+        except Exception as e:
+            self.escalation_errors += 1
+            return False, f"Validation error: {str(e)}"
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "total": self.total,
+            "accepted_locally": self.accepted_locally,
+            "rejected_locally": self.rejected_locally,
+            "escalated": self.escalated,
+            "escalation_errors": self.escalation_errors,
+            "escalation_rate": self.escalated / self.total if self.total else 0.0,
+        }
@@ -0,0 +1,165 @@
+import os
+import time
+import uuid
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+from pydantic import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Searches allowed to run workflows at the same time; the rest wait as "queued"
+SEARCH_MAX_CONCURRENT = int(os.getenv("SEARCH_MAX_CONCURRENT", "4"))
+# Finished searches are kept this long (and at most SEARCH_MAX_RETAINED of them) for polling
+SEARCH_RESULT_TTL_SECONDS = float(os.getenv("SEARCH_RESULT_TTL_SECONDS", "3600"))
+SEARCH_MAX_RETAINED = int(os.getenv("SEARCH_MAX_RETAINED", "1000"))
+
+FINISHED_STATES = ("completed", "failed", "cancelled")
+
+
+class SearchRun(BaseModel):
+    search_id: str
+    candidate_id: str
+    state: str = "queued"  # queued | running | completed | failed | cancelled
+    current_node: Optional[str] = None
+    completed_nodes: List[str] = []
+    progress: float = 0.0
+    jobs_total: int = 0
+    jobs_scored: int = 0
+    eta_seconds: Optional[float] = None
+    matched_jobs: List[Dict[str, Any]] = []
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    version: int = 0
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+
+
+class SearchRunManager:
+    """Runs job searches as background tasks and keeps their progress for polling
+
+    At most ``max_concurrent`` workflows run at once. Every update bumps the run's
+    ``version`` and wakes long-pollers waiting for a newer version.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = SEARCH_MAX_CONCURRENT,
+        ttl_seconds: float = SEARCH_RESULT_TTL_SECONDS,
+        max_retained: int = SEARCH_MAX_RETAINED
+    ):
+        self.max_concurrent = max_concurrent
+        self.ttl_seconds = ttl_seconds
+        self.max_retained = max_retained
+        self.runs: "OrderedDict[str, SearchRun]" = OrderedDict()
+        self._tasks: Dict[str, asyncio.Task] = {}
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._finished_at: Dict[str, float] = {}
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def submit(self, candidate_id: str, runner: Callable[[SearchRun], Awaitable[Dict[str, Any]]]) -> SearchRun:
+        """Register a search and start it in the background; returns immediately"""
+        self._expire()
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent)
+        run = SearchRun(
+            search_id=uuid.uuid4().hex,
+            candidate_id=candidate_id,
+            created_at=datetime.now().isoformat()
+        )
+        self.runs[run.search_id] = run
+        self._changed[run.search_id] = asyncio.Event()
+        self._tasks[run.search_id] = asyncio.create_task(self._execute(run, runner))
+        return run
+
+    def update(self, run: SearchRun, **changes):
+        """Apply changes to a run and wake anyone long-polling it"""
+        for field, value in changes.items():
+            setattr(run, field, value)
+        run.version += 1
+        event = self._changed.get(run.search_id)
+        if event is not None:
+            event.set()
+            self._changed[run.search_id] = asyncio.Event()
+
+    async def _execute(self, run: SearchRun, runner: Callable[[SearchRun], Awaitable[Dict[str, Any]]]):
+        try:
+            async with self._semaphore:
+                self.update(run, state="running", started_at=datetime.now().isoformat())
+                result = await runner(run)
+            if result.get("error_message"):
+                self._finish(run, state="failed", error=result["error_message"], result=result)
+            else:
+                self._finish(run, state="completed", progress=1.0, result=result)
+        except asyncio.CancelledError:
+            self._finish(run, state="cancelled")
+        except Exception as e:
+            logger.error(f"Search {run.search_id} failed: {e}")
+            self._finish(run, state="failed", error=str(e))
+        finally:
+            self._tasks.pop(run.search_id, None)
+
+    def _finish(self, run: SearchRun, **changes):
+        self._finished_at[run.search_id] = time.monotonic()
+        self.update(run, finished_at=datetime.now().isoformat(), **changes)
+
+    def get(self, search_id: str) -> Optional[SearchRun]:
+        return self.runs.get(search_id)
+
+    async def wait(self, search_id: str, since_version: int, timeout: float) -> Optional[SearchRun]:
+        """Return the run once its version exceeds ``since_version``, it finishes, or ``timeout`` passes"""
+        run = self.runs.get(search_id)
+        deadline = time.monotonic() + timeout
+        while run is not None and run.version <= since_version and run.state not in FINISHED_STATES:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            changed = self._changed.get(search_id)
+            if changed is None:
+                # Expired while we waited; the run object still holds its final state
+                break
+            try:
+                await asyncio.wait_for(changed.wait(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+        return run
+
+    def cancel(self, search_id: str) -> bool:
+        task = self._tasks.get(search_id)
+        if task is None:
+            return False
+        task.cancel()
+        return True
+
+    def _expire(self):
+        now = time.monotonic()
+        for search_id, finished in list(self._finished_at.items()):
+            if now - finished > self.ttl_seconds:
+                self._forget(search_id)
+        while len(self.runs) >= self.max_retained and self._finished_at:
+            self._forget(next(iter(self._finished_at)))
+
+    def _forget(self, search_id: str):
+        self.runs.pop(search_id, None)
+        self._changed.pop(search_id, None)
+        self._finished_at.pop(search_id, None)
+
+    async def aclose(self):
+        """Cancel every running search"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        counts = {state: 0 for state in ("queued", "running") + FINISHED_STATES}
+        for run in self.runs.values():
+            counts[run.state] += 1
+        return counts
+
+
+# Global manager used by the /searches endpoints
+search_runs = SearchRunManager()
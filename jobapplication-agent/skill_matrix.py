@@ -0,0 +1,215 @@
+import os
+import logging
+import numpy as np
+from typing import Dict, List, Sequence, Set, Tuple
+from models import Job, Candidate
+from job_index import skill_tokens
+
+logger = logging.getLogger(__name__)
+
+# The tokens shared by the most candidate/job pairs go through one dense BLAS product;
+# the long tail is added from posting lists, which is far cheaper for rare tokens
+SKILL_MATRIX_DENSE_TOKENS = int(os.getenv("SKILL_MATRIX_DENSE_TOKENS", "128"))
+
+METRICS = ("overlap", "jaccard", "share", "coverage")
+
+
+def job_skill_tokens(job: Job) -> Set[str]:
+    return skill_tokens(job.requirements + job.skills)
+
+
+def job_requirement_tokens(job: Job) -> Set[str]:
+    return skill_tokens(job.requirements)
+
+
+def candidate_skill_tokens(candidate: Candidate) -> Set[str]:
+    return skill_tokens(candidate.skills)
+
+
+class _Postings:
+    """Rows of a binary row × vocabulary matrix in CSR form, plus the same entries by column"""
+
+    def __init__(self, token_sets: Sequence[Set[str]], vocabulary: Dict[str, int]):
+        lengths = np.fromiter((len(tokens) for tokens in token_sets), dtype=np.int64, count=len(token_sets))
+        self.sizes = lengths.astype(np.float32)
+        self.indptr = np.zeros(len(token_sets) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=self.indptr[1:])
+        self.indices = np.fromiter(
+            (vocabulary[token] for tokens in token_sets for token in tokens),
+            dtype=np.int64,
+            count=int(self.indptr[-1])
+        )
+        self.rows = np.repeat(np.arange(len(token_sets), dtype=np.int64), lengths)
+        # Column view: rows holding each token, grouped by token
+        order = np.argsort(self.indices, kind="stable")
+        self.column_rows = self.rows[order]
+        self.column_ptr = np.searchsorted(self.indices[order], np.arange(len(vocabulary) + 1))
+
+    def column(self, token: int) -> np.ndarray:
+        return self.column_rows[self.column_ptr[token]:self.column_ptr[token + 1]]
+
+    def frequencies(self) -> np.ndarray:
+        return np.diff(self.column_ptr).astype(np.float32)
+
+    def row(self, index: int) -> np.ndarray:
+        return self.indices[self.indptr[index]:self.indptr[index + 1]]
+
+
+class SkillMatrix:
+    """Skill overlap between every candidate and every job, computed in bulk with NumPy
+
+    Candidates and jobs are encoded over one shared vocabulary of normalized skill
+    tokens (see job_index.skill_tokens). Four scores are available:
+
+    - ``overlap``: number of shared tokens
+    - ``jaccard``: shared tokens over the union of both token sets
+    - ``share``: shared tokens over the job's tokens, unweighted
+    - ``coverage``: share of the job's tokens the candidate has, with each token
+      weighted by its IDF across jobs so rare skills count more than common ones
+    """
+
+    def __init__(
+        self,
+        candidate_ids: List[str],
+        candidate_tokens: Sequence[Set[str]],
+        job_ids: List[str],
+        job_tokens: Sequence[Set[str]]
+    ):
+        vocabulary: Dict[str, int] = {}
+        for tokens in list(job_tokens) + list(candidate_tokens):
+            for token in tokens:
+                vocabulary.setdefault(token, len(vocabulary))
+        self.vocabulary = vocabulary
+        self.candidate_ids = list(candidate_ids)
+        self.job_ids = list(job_ids)
+        self._candidate_rows = {candidate_id: i for i, candidate_id in enumerate(self.candidate_ids)}
+        self._job_rows = {job_id: i for i, job_id in enumerate(self.job_ids)}
+        self.candidates = _Postings(candidate_tokens, vocabulary)
+        self.jobs = _Postings(job_tokens, vocabulary)
+
+        job_frequency = self.jobs.frequencies()
+        self.idf = np.log1p(len(self.job_ids) / np.maximum(job_frequency, 1.0)).astype(np.float32)
+        # Total IDF weight of each job's tokens: the denominator of coverage
+        self.job_weights = np.zeros(len(self.job_ids), dtype=np.float32)
+        np.add.at(self.job_weights, self.jobs.rows, self.idf[self.jobs.indices])
+
+    @classmethod
+    def from_models(cls, candidates: List[Candidate], jobs: List[Job]) -> "SkillMatrix":
+        return cls(
+            [candidate.candidateId for candidate in candidates],
+            [candidate_skill_tokens(candidate) for candidate in candidates],
+            [job.jobId for job in jobs],
+            [job_skill_tokens(job) for job in jobs]
+        )
+
+    def _token_values(self, metric: str) -> np.ndarray:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}; expected one of {METRICS}")
+        if metric == "coverage":
+            return self.idf
+        return np.ones(len(self.vocabulary), dtype=np.float32)
+
+    def _cross(self, values: np.ndarray) -> np.ndarray:
+        """candidates × jobs matrix of summed ``values`` over shared tokens"""
+        n_candidates, n_jobs = len(self.candidate_ids), len(self.job_ids)
+        pair_counts = self.candidates.frequencies() * self.jobs.frequencies()
+        shared = np.flatnonzero(pair_counts)
+        ranked = shared[np.argsort(-pair_counts[shared], kind="stable")]
+        head, tail = ranked[:SKILL_MATRIX_DENSE_TOKENS], ranked[SKILL_MATRIX_DENSE_TOKENS:]
+
+        # Head tokens: dense incidence matrices over just those columns, one matmul
+        column = np.full(len(self.vocabulary), -1, dtype=np.int64)
+        column[head] = np.arange(len(head))
+        dense_candidates = np.zeros((n_candidates, len(head)), dtype=np.float32)
+        dense_jobs = np.zeros((n_jobs, len(head)), dtype=np.float32)
+        for postings, dense, weights in (
+            (self.candidates, dense_candidates, None),
+            (self.jobs, dense_jobs, values)
+        ):
+            columns = column[postings.indices]
+            in_head = columns >= 0
+            dense[postings.rows[in_head], columns[in_head]] = (
+                1.0 if weights is None else weights[postings.indices[in_head]]
+            )
+        result = dense_candidates @ dense_jobs.T
+
+        # Tail tokens: each touches few pairs, so add them block by block
+        for token in tail:
+            result[np.ix_(self.candidates.column(token), self.jobs.column(token))] += values[token]
+        return result
+
+    def _finish(self, scores: np.ndarray, candidate_sizes: np.ndarray, job_rows: slice, metric: str) -> np.ndarray:
+        """Turn summed overlaps into the requested metric, in place"""
+        if metric == "jaccard":
+            union = np.add.outer(candidate_sizes, self.jobs.sizes[job_rows])
+            union -= scores
+            np.divide(scores, union, out=scores, where=union > 0)
+        elif metric == "share":
+            sizes = np.broadcast_to(self.jobs.sizes[job_rows], scores.shape)
+            np.divide(scores, sizes, out=scores, where=sizes > 0)
+        elif metric == "coverage":
+            weights = self.job_weights[job_rows]
+            np.divide(scores, weights, out=scores, where=weights > 0)
+        return scores
+
+    def scores(self, metric: str = "coverage") -> np.ndarray:
+        """Full candidates × jobs score matrix (float32)"""
+        values = self._token_values(metric)
+        return self._finish(self._cross(values), self.candidates.sizes, slice(None), metric)
+
+    def candidate_scores(self, candidate_id: str, metric: str = "coverage") -> np.ndarray:
+        """Scores of one candidate against every job"""
+        values = self._token_values(metric)
+        row = self._candidate_rows[candidate_id]
+        scores = np.zeros(len(self.job_ids), dtype=np.float32)
+        for token in self.candidates.row(row):
+            scores[self.jobs.column(token)] += values[token]
+        return self._finish(scores[None, :], self.candidates.sizes[row:row + 1], slice(None), metric)[0]
+
+    def job_scores(self, job_id: str, metric: str = "coverage") -> np.ndarray:
+        """Scores of every candidate against one job"""
+        values = self._token_values(metric)
+        row = self._job_rows[job_id]
+        scores = np.zeros(len(self.candidate_ids), dtype=np.float32)
+        for token in self.jobs.row(row):
+            scores[self.candidates.column(token)] += values[token]
+        return self._finish(scores[:, None], self.candidates.sizes, slice(row, row + 1), metric)[:, 0]
+
+    @staticmethod
+    def _top(ids: List[str], scores: np.ndarray, top_k: int, min_score: float) -> List[Tuple[str, float]]:
+        eligible = np.flatnonzero(scores >= min_score) if min_score > 0 else np.arange(len(ids))
+        if 0 < top_k < len(eligible):
+            eligible = eligible[np.argpartition(-scores[eligible], top_k - 1)[:top_k]]
+        ordered = eligible[np.lexsort((eligible, -scores[eligible]))]
+        return [(ids[i], float(scores[i])) for i in ordered]
+
+    def rank_jobs(
+        self, candidate_id: str, top_k: int = 0, metric: str = "coverage", min_score: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """(jobId, score) best first for one candidate; ``top_k <= 0`` means all"""
+        return self._top(self.job_ids, self.candidate_scores(candidate_id, metric), top_k, min_score)
+
+    def rank_candidates(
+        self, job_id: str, top_k: int = 0, metric: str = "coverage", min_score: float = 0.0
+    ) -> List[Tuple[str, float]]:
+        """(candidateId, score) best first for one job; ``top_k <= 0`` means all"""
+        return self._top(self.candidate_ids, self.job_scores(job_id, metric), top_k, min_score)
+
+
+def skill_coverage(candidate: Candidate, jobs: List[Job]) -> Dict[str, float]:
+    """Share of each job's requirement tokens that the candidate has
+
+    Unweighted, so a job's score does not depend on which other jobs are in the
+    search; this is the fallback match score, compared against the threshold.
+    IDF-weighted ``coverage`` is for ranking only.
+    """
+    if not jobs:
+        return {}
+    matrix = SkillMatrix(
+        [candidate.candidateId],
+        [candidate_skill_tokens(candidate)],
+        [job.jobId for job in jobs],
+        [job_requirement_tokens(job) for job in jobs]
+    )
+    scores = matrix.candidate_scores(candidate.candidateId, "share")
+    return {job_id: float(score) for job_id, score in zip(matrix.job_ids, scores)}
@@ -0,0 +1,22 @@
+import os
+import sys
+
+# Keep module-level globals (contract store, indexer, caches) off disk and the network
+for name in ("CONTRACT_STORE_PATH", "MATCH_CACHE_PATH", "RESUME_CACHE_PATH", "WORK_QUEUE_PATH"):
+    os.environ.setdefault(name, ":memory:")
+os.environ.setdefault("CONTRACT_INDEXER_ENABLED", "false")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+import dev_chain
+
+
+@pytest.fixture(scope="session")
+def solc():
+    """Skip chain tests when the pinned solc cannot be installed (e.g. offline)"""
+    try:
+        dev_chain.compile_contract("Multicall3")
+    except Exception as e:
+        pytest.skip(f"solc {dev_chain.SOLC_VERSION} is not available: {e}")
@@ -0,0 +1,66 @@
+import asyncio
+from eth_account import Account
+import dev_chain
+from contract_factory import ContractClient, RECEIPT_TIMEOUT
+from contract_indexer import ContractIndexer, ContractStore
+from tx_submitter import TransactionSubmitter
+
+
+def test_batched_applications_are_preflighted_sent_and_indexed(solc):
+    async def scenario():
+        w3 = dev_chain.connect()
+        talent_address = await dev_chain.deploy(w3, "TalentAIApplications")
+        multicall_address = await dev_chain.deploy(w3, "Multicall3")
+        client = ContractClient(w3=w3, contract_address=talent_address, multicall_address=multicall_address)
+        created = await dev_chain.seed_platform(w3, client.contract, companies=1, jobs=4, candidates=1)
+        await client.contract.functions.submitApplication(
+            "taken", "job0", "candidate0", "2024-01-01"
+        ).transact({"from": (await w3.eth.accounts)[0]})
+
+        wallet = Account.create()
+        await dev_chain.fund(w3, wallet.address)
+        client.tx_submitter = TransactionSubmitter(client, private_key=wallet.key.hex(), receipt_timeout=RECEIPT_TIMEOUT)
+
+        store = ContractStore(":memory:", contract_address=talent_address)
+        indexer = ContractIndexer(client, store, confirmations=0, profile_refresh_blocks=0)
+        await indexer.sync_once()
+
+        items = [
+            {"application_id": f"batch_{job_id}", "job_id": job_id, "candidate_id": "candidate0",
+             "application_date": "2024-02-01"}
+            for job_id in created["jobs"]
+        ]
+        items.append({"application_id": "taken", "job_id": "job1", "candidate_id": "candidate0",
+                      "application_date": "2024-02-01"})
+        items.append({"application_id": "batch_missing", "job_id": "nope", "candidate_id": "candidate0",
+                      "application_date": "2024-02-01"})
+        try:
+            sent = await client.submit_applications(items, batch_size=10)
+            settled = {tx.application_id: tx for tx in await client.tx_submitter.wait_all(sent)}
+        finally:
+            await client.aclose()
+
+        # The preflight drops the calls that would revert; the rest share one aggregate3 transaction
+        assert settled["taken"].status == "failed" and settled["taken"].error == "Application already exists"
+        assert settled["batch_missing"].status == "failed" and settled["batch_missing"].error == "Job not found"
+        batched = [settled[f"batch_{job_id}"] for job_id in created["jobs"]]
+        assert {tx.status for tx in batched} == {"confirmed"}
+        assert len({tx.tx_hash for tx in batched}) == 1
+        assert batched[0].batch_size == len(batched)
+
+        calls = await indexer._calls_in_transaction(batched[0].tx_hash)
+        assert [(name, args["_applicationId"]) for name, args in calls] == [
+            ("submitApplication", f"batch_{job_id}") for job_id in created["jobs"]
+        ]
+
+        # IDs must come from the aggregate3 calldata, not from a snapshot fallback
+        async def no_snapshot(table, block_identifier):
+            raise AssertionError(f"unexpected snapshot of {table}")
+        indexer._snapshot_table = no_snapshot
+        await indexer.sync_once()
+        indexed = {application.applicationId: application for application in store.get_applications()}
+        assert sorted(indexed) == sorted(["taken"] + [tx.application_id for tx in batched])
+        assert indexed["batch_job2"].jobId == "job2"
+        assert store.count_by_status(candidate_id="candidate0") == {"PENDING": 5}
+
+    asyncio.run(scenario())
@@ -0,0 +1,76 @@
+import asyncio
+import dev_chain
+from contract_factory import ContractClient
+from contract_indexer import ContractIndexer, ContractStore
+
+
+async def deploy_platform(**seed):
+    w3 = dev_chain.connect()
+    address = await dev_chain.deploy(w3, "TalentAIApplications")
+    client = ContractClient(w3=w3, contract_address=address)
+    created = await dev_chain.seed_platform(w3, client.contract, **seed)
+    store = ContractStore(":memory:", contract_address=address)
+    client.attach_store(store)
+    sender = {"from": (await w3.eth.accounts)[0]}
+    return w3, client, store, created, sender
+
+
+def application_ids(store: ContractStore):
+    return sorted(application.applicationId for application in store.get_applications())
+
+
+def test_sync_follows_events_and_profile_score_updates(solc):
+    async def scenario():
+        w3, client, store, created, sender = await deploy_platform(companies=2, jobs=3, candidates=2)
+        indexer = ContractIndexer(client, store, confirmations=0, profile_refresh_blocks=3)
+
+        await indexer.sync_once()
+        assert store.counts() == {"jobs": 3, "candidates": 2, "companies": 2, "applications": 0}
+
+        functions = client.contract.functions
+        await functions.updateCandidateProfileScore("candidate0", "95").transact(sender)
+        await functions.updateCompanyProfileScore("company1", "42").transact(sender)
+        await indexer.sync_once()
+        # No event for score updates, and the refresh interval has not passed yet
+        assert store.get_candidate("candidate0").profileScore == "70"
+
+        await functions.submitApplication("app0", "job0", "candidate0", "2024-01-01").transact(sender)
+        await indexer.sync_once()
+        assert application_ids(store) == ["app0"]
+        assert store.get_candidate("candidate0").profileScore == "95"
+        assert store.get_company("company1").companyScore == "42"
+        assert {c.candidateId: c.profileScore for c in await client.get_all_candidates()}["candidate0"] == "95"
+
+        await functions.updateApplicationStatus("app0", 1).transact(sender)
+        await indexer.sync_once()
+        assert store.count_by_status(candidate_id="candidate0") == {"REVIEWED": 1}
+        assert store.get_watermark() == await w3.eth.block_number
+
+    asyncio.run(scenario())
+
+
+def test_reorg_rewinds_orphaned_applications(solc):
+    async def scenario():
+        w3, client, store, created, sender = await deploy_platform(companies=1, jobs=2, candidates=1)
+        indexer = ContractIndexer(client, store, confirmations=0, profile_refresh_blocks=0)
+        await indexer.sync_once()
+        fork_point = store.get_watermark()
+
+        snapshot = (await w3.provider.make_request("evm_snapshot", []))["result"]
+        functions = client.contract.functions
+        await functions.submitApplication("orphan", "job0", "candidate0", "2024-01-01").transact(sender)
+        await indexer.sync_once()
+        assert application_ids(store) == ["orphan"]
+
+        # Replace the indexed block with a different one at the same height, plus one more
+        await w3.provider.make_request("evm_revert", [snapshot])
+        await functions.submitApplication("kept0", "job0", "candidate0", "2024-01-02").transact(sender)
+        await functions.submitApplication("kept1", "job1", "candidate0", "2024-01-02").transact(sender)
+        assert await w3.eth.block_number == fork_point + 2
+
+        await indexer.sync_once()
+        assert application_ids(store) == ["kept0", "kept1"]
+        assert store.get_watermark() == fork_point + 2
+        assert store.checkpoints()[0] == (fork_point + 2, (await w3.eth.get_block(fork_point + 2))["hash"].hex())
+
+    asyncio.run(scenario())
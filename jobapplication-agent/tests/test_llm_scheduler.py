@@ -0,0 +1,146 @@
+import time
+import asyncio
+import pytest
+import llm_scheduler
+from llm_scheduler import LLMScheduler, TokenBucket
+
+
+class Reply:
+    def __init__(self, content: str):
+        self.content = content
+        self.usage_metadata = None
+
+
+class FakeModel:
+    """Answers after ``latency`` seconds, failing with the queued errors first"""
+
+    def __init__(self, latency: float = 0.0, errors=(), hang_first: int = 0):
+        self.latency = latency
+        self.errors = list(errors)
+        self.hang_first = hang_first
+        self.calls = []
+
+    async def ainvoke(self, messages, **kwargs):
+        self.calls.append((messages, time.monotonic()))
+        if self.hang_first:
+            self.hang_first -= 1
+            await asyncio.sleep(3600)
+        if self.errors:
+            raise self.errors.pop(0)
+        await asyncio.sleep(self.latency)
+        return Reply(f"answer to {messages}")
+
+
+class RateLimitError(Exception):
+    status_code = 429
+
+    def __init__(self, retry_after: str):
+        super().__init__("rate limited")
+        self.response = type("Response", (), {"headers": {"retry-after": retry_after}})()
+
+
+class BadRequestError(Exception):
+    status_code = 400
+
+
+def test_token_bucket_refills_and_caps_oversized_requests(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(llm_scheduler.time, "monotonic", lambda: now[0])
+    bucket = TokenBucket(per_minute=60)
+
+    assert bucket.delay(60) == 0
+    bucket.consume(60)
+    assert bucket.delay(1) == pytest.approx(1.0)
+    now[0] += 0.5
+    assert bucket.delay(1) == pytest.approx(0.5)
+    # Larger than the whole bucket: wait for a full bucket, not forever
+    assert bucket.delay(600) == pytest.approx(59.5)
+    now[0] += 120
+    assert bucket.tokens <= bucket.capacity and bucket.delay(60) == 0
+    bucket.drain()
+    assert bucket.delay(1) == pytest.approx(1.0)
+
+
+def test_requests_wait_for_tpm_budget(monkeypatch):
+    monkeypatch.setattr(llm_scheduler, "LLM_OUTPUT_TOKENS_ESTIMATE", 20)
+
+    async def scenario():
+        # 3000 tokens per minute = 50 per second; each request reserves its prompt plus the output estimate
+        scheduler = LLMScheduler(rpm_limit=1000, tpm_limit=3000, max_concurrency=8)
+        model = FakeModel()
+        reserved = scheduler.tokens_bucket.capacity - 10
+        scheduler.tokens_bucket.consume(reserved)
+        started = time.monotonic()
+        await scheduler.invoke(model, "hi", tenant="a")
+        waited = time.monotonic() - started
+        estimate = llm_scheduler.count_tokens("hi") + llm_scheduler.LLM_OUTPUT_TOKENS_ESTIMATE
+        expected = (estimate - 10) / 50
+        assert waited == pytest.approx(expected, abs=0.2)
+        assert scheduler.requests == 1 and scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_rate_limit_halves_concurrency_pauses_and_retries():
+    async def scenario():
+        scheduler = LLMScheduler(max_concurrency=8, backoff_seconds=0.001, backoff_max_seconds=0.001)
+        model = FakeModel(errors=[RateLimitError(retry_after="0.3")])
+        started = time.monotonic()
+        reply = await scheduler.invoke(model, "hi", tenant="a")
+
+        assert reply.content == "answer to hi"
+        assert scheduler.rate_limited == 1 and scheduler.retries == 1
+        # Halved by the 429, then nudged up by the successful retry
+        assert int(scheduler.concurrency_limit) == 4
+        # The retry is held back until Retry-After has passed
+        assert model.calls[1][1] - started >= 0.3
+
+    asyncio.run(scenario())
+
+
+def test_non_retryable_errors_are_raised_at_once():
+    async def scenario():
+        scheduler = LLMScheduler(backoff_seconds=0.001)
+        model = FakeModel(errors=[BadRequestError("bad prompt")])
+        with pytest.raises(BadRequestError):
+            await scheduler.invoke(model, "hi")
+        assert len(model.calls) == 1 and scheduler.failures == 1 and scheduler.in_flight == 0
+
+    asyncio.run(scenario())
+
+
+def test_tenants_are_served_round_robin():
+    async def scenario():
+        scheduler = LLMScheduler(min_concurrency=1, max_concurrency=1)
+        model = FakeModel(latency=0.01)
+        requests = [("big", f"big{i}") for i in range(5)] + [("small", f"small{i}") for i in range(2)]
+        await asyncio.gather(*(scheduler.invoke(model, message, tenant=tenant) for tenant, message in requests))
+        return [message for message, _ in model.calls]
+
+    order = asyncio.run(scenario())
+    assert order == ["big0", "small0", "big1", "small1", "big2", "big3", "big4"]
+
+
+def test_timeout_covers_each_attempt_not_the_queue():
+    async def scenario():
+        scheduler = LLMScheduler(min_concurrency=1, max_concurrency=1, backoff_seconds=0.001)
+        slow = FakeModel(latency=0.4)
+        fast = FakeModel(latency=0.01)
+        # The second request queues behind the first for longer than its own timeout
+        first = asyncio.create_task(scheduler.invoke(slow, "slow", tenant="a"))
+        await asyncio.sleep(0)
+        reply = await scheduler.invoke(fast, "fast", tenant="b", timeout=0.2)
+        assert reply.content == "answer to fast"
+        await first
+
+        hanging = FakeModel(hang_first=1)
+        reply = await scheduler.invoke(hanging, "retry", timeout=0.1)
+        assert reply.content == "answer to retry"
+        assert len(hanging.calls) == 2 and scheduler.retries == 1
+
+        scheduler.max_retries = 0
+        with pytest.raises(asyncio.TimeoutError):
+            await scheduler.invoke(FakeModel(hang_first=1), "give up", timeout=0.05)
+        assert scheduler.in_flight == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,395 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+from eth_account import Account
+from pydantic import BaseModel
+from web3.exceptions import TransactionNotFound
+from metrics import tx_confirmation_seconds
+
+logger = logging.getLogger(__name__)
+
+# Gas price and wallet balance are re-read at most this often
+TX_GAS_PRICE_TTL = float(os.getenv("TX_GAS_PRICE_TTL", "15"))
+TX_BALANCE_TTL = float(os.getenv("TX_BALANCE_TTL", "30"))
+TX_GAS_BUFFER = int(os.getenv("TX_GAS_BUFFER", "50000"))
+TX_DEFAULT_GAS = int(os.getenv("TX_DEFAULT_GAS", "300000"))
+TX_RECEIPT_POLL_SECONDS = float(os.getenv("TX_RECEIPT_POLL_SECONDS", "1"))
+# Number of finished transactions kept for status lookups
+TX_HISTORY_SIZE = int(os.getenv("TX_HISTORY_SIZE", "10000"))
+
+NONCE_ERRORS = ("nonce too low", "already known", "replacement transaction underpriced", "invalid nonce")
+
+
+class SubmittedTransaction(BaseModel):
+    application_id: str
+    tx_hash: Optional[str] = None
+    nonce: Optional[int] = None
+    status: str = "pending"  # pending | confirmed | failed | timeout
+    block_number: Optional[int] = None
+    gas_used: Optional[int] = None
+    error: Optional[str] = None
+    batch_size: int = 1
+    submitted_at: str
+    confirmed_at: Optional[str] = None
+    metadata: Dict[str, Any] = {}
+
+
+class TTLValue:
+    """Single cached value refreshed by an async loader once it is older than ``ttl``"""
+
+    def __init__(self, loader: Callable[[], Awaitable[Any]], ttl: float):
+        self.loader = loader
+        self.ttl = ttl
+        self.value = None
+        self.loaded_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def get(self) -> Any:
+        if self.value is not None and time.monotonic() - self.loaded_at < self.ttl:
+            return self.value
+        async with self._lock:
+            if self.value is None or time.monotonic() - self.loaded_at >= self.ttl:
+                self.value = await self.loader()
+                self.loaded_at = time.monotonic()
+        return self.value
+
+    def adjust(self, delta: int):
+        if self.value is not None:
+            self.value += delta
+
+    def invalidate(self):
+        self.value = None
+
+
+class NonceManager:
+    """Hands out consecutive nonces for one account without asking the node each time"""
+
+    def __init__(self, w3, address: str):
+        self.w3 = w3
+        self.address = address
+        self.next_nonce: Optional[int] = None
+        self.lock = asyncio.Lock()
+
+    async def peek(self) -> int:
+        """Next nonce to use; caller must hold ``lock``"""
+        if self.next_nonce is None:
+            self.next_nonce = await self.w3.eth.get_transaction_count(self.address, "pending")
+        return self.next_nonce
+
+    def advance(self):
+        self.next_nonce += 1
+
+    def reset(self):
+        self.next_nonce = None
+
+
+class TransactionSubmitter:
+    """Pipelines signed transactions from one wallet and tracks their receipts in the background
+
+    Transactions are sent back to back using a local nonce counter; a single poller
+    task checks receipts once per new block and resolves each transaction's future,
+    so N submissions cost about one confirmation latency instead of N.
+    """
+
+    def __init__(self, client, private_key: Optional[str] = None, receipt_timeout: float = 120.0):
+        self.client = client
+        self.w3 = client.w3
+        self.receipt_timeout = receipt_timeout
+        self._private_key = private_key
+        self.account = None
+        self.nonces: Optional[NonceManager] = None
+        self.gas_price: Optional[TTLValue] = None
+        self.balance: Optional[TTLValue] = None
+        self.transactions: "OrderedDict[str, SubmittedTransaction]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._pending_since: Dict[str, float] = {}
+        self._members: Dict[str, List[SubmittedTransaction]] = {}
+        self._confirmers: Dict[str, Callable[[Any], Set[str]]] = {}
+        self._poller: Optional[asyncio.Task] = None
+        self._last_polled_block: Optional[int] = None
+        self.sent = 0
+        self.confirmed = 0
+        self.failed = 0
+
+    def _ensure_account(self) -> bool:
+        if self.account is not None:
+            return True
+        private_key = self._private_key or os.getenv("PRIVATE_KEY")
+        if not private_key:
+            logger.error("PRIVATE_KEY not found in environment variables")
+            return False
+        if not private_key.startswith("0x"):
+            private_key = "0x" + private_key
+        self.account = Account.from_key(private_key)
+        self.nonces = NonceManager(self.w3, self.account.address)
+        self.gas_price = TTLValue(lambda: self.client._call(self.w3.eth.gas_price, method="eth_gasPrice"), TX_GAS_PRICE_TTL)
+        self.balance = TTLValue(lambda: self.client._call(self.w3.eth.get_balance(self.account.address), method="eth_getBalance"), TX_BALANCE_TTL)
+        logger.info(f"Using wallet address: {self.account.address}")
+        return True
+
+    def _record(self, tx: SubmittedTransaction):
+        existing = self.transactions.get(tx.application_id)
+        if existing is not None and existing.status == "pending" and tx.tx_hash is None:
+            # A rejected duplicate must not hide the transaction still in flight
+            return
+        self.transactions[tx.application_id] = tx
+        self.transactions.move_to_end(tx.application_id)
+        while len(self.transactions) > TX_HISTORY_SIZE:
+            oldest = next(iter(self.transactions))
+            if self.transactions[oldest].status == "pending":
+                break
+            self.transactions.popitem(last=False)
+
+    def _fail(self, tx: SubmittedTransaction, error: str) -> SubmittedTransaction:
+        tx.status = "failed"
+        tx.error = error
+        self.failed += 1
+        self._record(tx)
+        return tx
+
+    def _new_record(self, application_id: str, metadata: Optional[Dict[str, Any]] = None) -> SubmittedTransaction:
+        return SubmittedTransaction(
+            application_id=application_id,
+            submitted_at=datetime.now().isoformat(),
+            metadata=metadata or {}
+        )
+
+    def sender(self) -> Optional[str]:
+        """Wallet address transactions are sent from, if PRIVATE_KEY is configured"""
+        return self.account.address if self._ensure_account() else None
+
+    def reject(self, application_id: str, error: str, metadata: Optional[Dict[str, Any]] = None) -> SubmittedTransaction:
+        """Record an application that failed before anything was sent"""
+        return self._fail(self._new_record(application_id, metadata), error)
+
+    async def _send(
+        self,
+        function_call,
+        records: List[SubmittedTransaction],
+        default_gas: int,
+        confirm: Optional[Callable[[Any], Set[str]]] = None
+    ) -> List[SubmittedTransaction]:
+        """Sign and send one transaction carrying ``records`` without waiting for it to be mined"""
+        if not self._ensure_account():
+            return [self._fail(tx, "PRIVATE_KEY not configured") for tx in records]
+
+        try:
+            gas_estimate = await self.client._call(
+                function_call.estimate_gas({"from": self.account.address}),
+                method="eth_estimateGas", function=function_call.fn_name
+            )
+        except Exception as gas_error:
+            logger.warning(f"Gas estimation failed for {records[0].application_id}: {gas_error}")
+            gas_estimate = default_gas
+        gas_limit = gas_estimate + TX_GAS_BUFFER
+
+        try:
+            gas_price = await self.gas_price.get()
+            balance = await self.balance.get()
+        except Exception as e:
+            return [self._fail(tx, f"Could not read gas price or balance: {e}") for tx in records]
+        max_cost = gas_limit * gas_price
+        if balance < max_cost:
+            self.balance.invalidate()
+            error = (
+                f"Insufficient balance. Need: {self.w3.from_wei(max_cost, 'ether')} FLOW, "
+                f"Have: {self.w3.from_wei(balance, 'ether')} FLOW"
+            )
+            return [self._fail(tx, error) for tx in records]
+
+        # Only nonce assignment, signing and sending are serialised
+        async with self.nonces.lock:
+            for attempt in range(2):
+                try:
+                    nonce = await self.nonces.peek()
+                    transaction = await function_call.build_transaction({
+                        "from": self.account.address,
+                        "nonce": nonce,
+                        "gas": gas_limit,
+                        "gasPrice": gas_price,
+                    })
+                    signed_txn = self.account.sign_transaction(transaction)
+                    tx_hash = await self.client._call(
+                        self.w3.eth.send_raw_transaction(signed_txn.raw_transaction),
+                        method="eth_sendRawTransaction", function=function_call.fn_name
+                    )
+                    self.nonces.advance()
+                    break
+                except Exception as send_error:
+                    message = str(send_error).lower()
+                    if attempt == 0 and any(marker in message for marker in NONCE_ERRORS):
+                        logger.warning(f"Nonce {self.nonces.next_nonce} rejected, resyncing from node")
+                        self.nonces.reset()
+                        continue
+                    return [self._fail(tx, f"Error sending transaction: {send_error}") for tx in records]
+
+        # Reserve the worst-case cost locally until the balance is re-read
+        self.balance.adjust(-max_cost)
+        tx_hash_hex = "0x" + bytes(tx_hash).hex()
+        for tx in records:
+            tx.tx_hash = tx_hash_hex
+            tx.nonce = nonce
+            tx.batch_size = len(records)
+            self._record(tx)
+        self.sent += 1
+        self._pending[tx_hash_hex] = asyncio.get_running_loop().create_future()
+        self._pending_since[tx_hash_hex] = time.monotonic()
+        self._members[tx_hash_hex] = records
+        if confirm is not None:
+            self._confirmers[tx_hash_hex] = confirm
+        self._ensure_poller()
+        logger.info(f"Transaction {tx_hash_hex} sent for {len(records)} application(s) (nonce {nonce})")
+        return records
+
+    async def submit(self, function_call, application_id: str, metadata: Optional[Dict[str, Any]] = None) -> SubmittedTransaction:
+        """Sign and send a contract call without waiting for it to be mined"""
+        records = await self._send(function_call, [self._new_record(application_id, metadata)], TX_DEFAULT_GAS)
+        return records[0]
+
+    async def submit_batch(
+        self,
+        function_call,
+        items: List[Tuple[str, Dict[str, Any]]],
+        confirm: Callable[[Any], Set[str]]
+    ) -> List[SubmittedTransaction]:
+        """Send one transaction on behalf of several applications
+
+        ``items`` are (application_id, metadata) pairs and ``confirm`` maps the receipt
+        to the application IDs that actually went through, so a batch whose inner calls
+        may fail individually still settles per application.
+        """
+        records = [self._new_record(application_id, metadata) for application_id, metadata in items]
+        return await self._send(function_call, records, TX_DEFAULT_GAS * len(records), confirm)
+
+    async def submit_application(self, application_id: str, job_id: str, candidate_id: str, application_date: str) -> SubmittedTransaction:
+        function_call = self.client.contract.functions.submitApplication(
+            application_id, job_id, candidate_id, application_date
+        )
+        return await self.submit(
+            function_call, application_id,
+            {"job_id": job_id, "candidate_id": candidate_id}
+        )
+
+    async def wait(self, tx: SubmittedTransaction) -> SubmittedTransaction:
+        """Block until the poller has settled the transaction"""
+        future = self._pending.get(tx.tx_hash) if tx.tx_hash else None
+        if future is not None:
+            await asyncio.shield(future)
+        return tx
+
+    async def wait_all(self, transactions: List[SubmittedTransaction]) -> List[SubmittedTransaction]:
+        return list(await asyncio.gather(*(self.wait(tx) for tx in transactions)))
+
+    def status(self, application_id: str) -> Optional[SubmittedTransaction]:
+        return self.transactions.get(application_id)
+
+    def _ensure_poller(self):
+        if self._poller is None or self._poller.done():
+            self._poller = asyncio.create_task(self._poll_receipts())
+
+    def _settle(self, tx_hash: str, receipt=None, error: Optional[str] = None):
+        future = self._pending.pop(tx_hash, None)
+        since = self._pending_since.pop(tx_hash, None)
+        members = self._members.pop(tx_hash, [])
+        confirm = self._confirmers.pop(tx_hash, None)
+        succeeded = receipt is not None and receipt.status == 1
+        if since is not None:
+            if receipt is not None:
+                outcome = "mined" if succeeded else "reverted"
+            else:
+                outcome = "timeout" if error and "timed out" in error else "abandoned"
+            tx_confirmation_seconds.observe(time.monotonic() - since, outcome)
+        confirmed_ids = {tx.application_id for tx in members}
+        if succeeded and confirm is not None:
+            try:
+                confirmed_ids = confirm(receipt)
+            except Exception as confirm_error:
+                logger.warning(f"Could not read per-application results from {tx_hash}: {confirm_error}")
+
+        for tx in members:
+            tx.confirmed_at = datetime.now().isoformat()
+            if receipt is not None:
+                tx.block_number = receipt.blockNumber
+                tx.gas_used = receipt.gasUsed
+            if succeeded and tx.application_id in confirmed_ids:
+                tx.status = "confirmed"
+                self.confirmed += 1
+                continue
+            if succeeded:
+                tx.status = "failed"
+                tx.error = "Call failed inside the batch transaction"
+            else:
+                tx.status = "timeout" if error and "timed out" in error else "failed"
+                tx.error = error or f"Transaction reverted (status {receipt.status})"
+            self.failed += 1
+        if future is not None and not future.done():
+            future.set_result(receipt)
+
+    async def _fetch_receipt(self, tx_hash: str):
+        try:
+            return await self.client._call(self.w3.eth.get_transaction_receipt(tx_hash), method="eth_getTransactionReceipt")
+        except TransactionNotFound:
+            return None
+
+    async def _poll_receipts(self):
+        """Check all pending receipts once per new block until nothing is pending"""
+        while self._pending:
+            try:
+                block_number = await self.client._call(self.w3.eth.block_number, method="eth_blockNumber")
+                if block_number != self._last_polled_block:
+                    self._last_polled_block = block_number
+                    hashes = list(self._pending)
+                    receipts = await asyncio.gather(
+                        *(self._fetch_receipt(tx_hash) for tx_hash in hashes),
+                        return_exceptions=True
+                    )
+                    for tx_hash, receipt in zip(hashes, receipts):
+                        if isinstance(receipt, Exception):
+                            logger.warning(f"Receipt lookup failed for {tx_hash}: {receipt}")
+                        elif receipt is not None:
+                            self._settle(tx_hash, receipt)
+                    if any(receipt is not None and not isinstance(receipt, Exception) for receipt in receipts):
+                        # Gas was actually spent, so the reserved balance is stale
+                        self.balance.invalidate()
+            except Exception as e:
+                logger.warning(f"Receipt poller error: {e}")
+
+            now = time.monotonic()
+            timed_out = False
+            for tx_hash, since in list(self._pending_since.items()):
+                if now - since > self.receipt_timeout:
+                    logger.error(f"Transaction {tx_hash} not mined after {self.receipt_timeout}s")
+                    self._settle(tx_hash, error=f"Receipt wait timed out after {self.receipt_timeout}s")
+                    timed_out = True
+            if timed_out:
+                # A stuck transaction leaves a nonce gap; start again from the node's view.
+                # Wait for any in-progress send so its peek()/advance() pair is not split.
+                async with self.nonces.lock:
+                    self.nonces.reset()
+            if self._pending:
+                await asyncio.sleep(TX_RECEIPT_POLL_SECONDS)
+
+    async def aclose(self):
+        if self._poller is not None:
+            self._poller.cancel()
+            try:
+                await self._poller
+            except asyncio.CancelledError:
+                pass
+            self._poller = None
+        for tx_hash in list(self._pending):
+            self._settle(tx_hash, error="Submitter closed before the transaction was mined")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "wallet": self.account.address if self.account else None,
+            "next_nonce": self.nonces.next_nonce if self.nonces else None,
+            "sent": self.sent,
+            "pending": len(self._pending),
+            "confirmed": self.confirmed,
+            "failed": self.failed,
+        }
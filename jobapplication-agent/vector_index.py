@@ -0,0 +1,217 @@
+import os
+import re
+import zlib
+import logging
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Tuple
+from models import Job, Candidate
+
+logger = logging.getLogger(__name__)
+
+# Number of hashed feature buckets per vector
+VECTOR_DIM = int(os.getenv("JOB_VECTOR_DIM", "2048"))
+
+# Common abbreviations expanded so "ML" and "Machine Learning" share features
+TERM_ALIASES = {
+    "ml": "machine learning",
+    "ai": "artificial intelligence",
+    "dl": "deep learning",
+    "nlp": "natural language processing",
+    "cv": "computer vision",
+    "llm": "large language model",
+    "llms": "large language model",
+    "js": "javascript",
+    "ts": "typescript",
+    "py": "python",
+    "k8s": "kubernetes",
+    "golang": "go",
+    "postgres": "postgresql",
+    "aws": "amazon web services",
+    "gcp": "google cloud platform",
+    "reactjs": "react",
+    "react.js": "react",
+    "nodejs": "node",
+    "node.js": "node",
+    "ci/cd": "continuous integration continuous delivery",
+}
+
+# Relative weight of each job field in its vector
+FIELD_WEIGHTS = {
+    "title": 2.0,
+    "skills": 2.0,
+    "requirements": 1.5,
+    "description": 1.0,
+}
+
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9+#./]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase words with known abbreviations expanded"""
+    words = []
+    for word in _WORD_RE.findall(text.lower()):
+        word = word.rstrip("./")
+        alias = TERM_ALIASES.get(word)
+        words.append(word)
+        if alias:
+            words.extend(alias.split())
+    return words
+
+
+def _bucket(feature: str, dim: int) -> int:
+    return zlib.crc32(feature.encode("utf-8")) % dim
+
+
+def hash_features(fields: Iterable[Tuple[str, float]], dim: int = VECTOR_DIM) -> np.ndarray:
+    """Sublinear term-frequency vector over hashed unigrams and bigrams"""
+    counts = np.zeros(dim, dtype=np.float32)
+    for text, weight in fields:
+        words = tokenize(text)
+        for word in words:
+            counts[_bucket(word, dim)] += weight
+        for first, second in zip(words, words[1:]):
+            counts[_bucket(f"{first} {second}", dim)] += weight
+    np.log1p(counts, out=counts)
+    return counts
+
+
+def job_fields(job: Job) -> List[Tuple[str, float]]:
+    return [
+        (job.title, FIELD_WEIGHTS["title"]),
+        (job.description, FIELD_WEIGHTS["description"]),
+        (" ; ".join(job.requirements), FIELD_WEIGHTS["requirements"]),
+        (" ; ".join(job.skills), FIELD_WEIGHTS["skills"]),
+    ]
+
+
+def candidate_fields(candidate: Candidate, resume_text: Optional[str] = None) -> List[Tuple[str, float]]:
+    fields = [
+        (" ; ".join(candidate.skills), FIELD_WEIGHTS["skills"]),
+        (" ; ".join(candidate.description), FIELD_WEIGHTS["description"]),
+        (" ; ".join(candidate.education), FIELD_WEIGHTS["description"]),
+    ]
+    if resume_text:
+        fields.append((resume_text, FIELD_WEIGHTS["description"]))
+    return fields
+
+
+class JobVectorIndex:
+    """Hashed TF-IDF vectors for jobs with cosine top-K queries
+
+    Raw term-frequency rows are appended or overwritten in place as jobs change.
+    The IDF-weighted, L2-normalized matrix is rebuilt lazily on the next query.
+    """
+
+    def __init__(self, dim: int = VECTOR_DIM):
+        self.dim = dim
+        self._tf = np.zeros((0, dim), dtype=np.float32)
+        self._df = np.zeros(dim, dtype=np.float32)
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._jobs: Dict[str, Job] = {}
+        self._weighted: Optional[np.ndarray] = None
+        self._idf: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def _ensure_capacity(self, rows: int):
+        if rows <= self._tf.shape[0]:
+            return
+        capacity = max(rows, 2 * self._tf.shape[0], 64)
+        grown = np.zeros((capacity, self.dim), dtype=np.float32)
+        grown[:len(self._ids)] = self._tf[:len(self._ids)]
+        self._tf = grown
+
+    def add_job(self, job: Job):
+        """Add or update a single job vector"""
+        existing = self._jobs.get(job.jobId)
+        if existing is not None and existing == job:
+            return
+
+        vector = hash_features(job_fields(job), self.dim)
+        row = self._rows.get(job.jobId)
+        if row is None:
+            row = len(self._ids)
+            self._ensure_capacity(row + 1)
+            self._ids.append(job.jobId)
+            self._rows[job.jobId] = row
+        else:
+            self._df -= self._tf[row] > 0
+
+        self._tf[row] = vector
+        self._df += vector > 0
+        self._jobs[job.jobId] = job
+        self._weighted = None
+
+    def remove_job(self, job_id: str):
+        """Drop a job by moving the last row into its slot"""
+        row = self._rows.pop(job_id, None)
+        if row is None:
+            return
+        self._df -= self._tf[row] > 0
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._tf[row] = self._tf[last]
+            self._ids[row] = moved_id
+            self._rows[moved_id] = row
+        self._tf[last] = 0
+        self._ids.pop()
+        self._jobs.pop(job_id, None)
+        self._weighted = None
+
+    def sync(self, jobs: List[Job]):
+        """Bring the index in line with the given job list"""
+        current_ids = {job.jobId for job in jobs}
+        for job_id in list(self._rows):
+            if job_id not in current_ids:
+                self.remove_job(job_id)
+        for job in jobs:
+            self.add_job(job)
+
+    def _matrix(self) -> np.ndarray:
+        if self._weighted is None:
+            n = len(self._ids)
+            self._idf = np.log((1.0 + n) / (1.0 + self._df)).astype(np.float32) + 1.0
+            weighted = self._tf[:n] * self._idf
+            norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            self._weighted = weighted / norms
+        return self._weighted
+
+    def query(self, vector: np.ndarray, top_k: int = 10, min_score: float = 0.0) -> List[Tuple[Job, float]]:
+        """Return up to ``top_k`` jobs by cosine similarity to a raw term-frequency vector"""
+        if not self._ids or top_k <= 0:
+            return []
+
+        matrix = self._matrix()
+        weighted = vector * self._idf
+        norm = np.linalg.norm(weighted)
+        if norm == 0:
+            return []
+        scores = matrix @ (weighted / norm)
+
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (self._jobs[self._ids[row]], float(scores[row]))
+            for row in top
+            if scores[row] >= min_score
+        ]
+
+    def query_candidate(
+        self,
+        candidate: Candidate,
+        resume_text: Optional[str] = None,
+        top_k: int = 10,
+        min_score: float = 0.0
+    ) -> List[Tuple[Job, float]]:
+        """Top-K jobs for a candidate profile and optional resume text"""
+        vector = hash_features(candidate_fields(candidate, resume_text), self.dim)
+        return self.query(vector, top_k=top_k, min_score=min_score)
+
+
+# Global vector index shared across searches
+job_vector_index = JobVectorIndex()
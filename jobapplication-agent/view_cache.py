@@ -0,0 +1,160 @@
+import os
+import time
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+VIEW_CACHE_ENABLED = os.getenv("VIEW_CACHE_ENABLED", "true").lower() == "true"
+VIEW_CACHE_SIZE = int(os.getenv("VIEW_CACHE_SIZE", "256"))
+# How long a fetched block number is trusted before asking the node again
+VIEW_CACHE_HEAD_TTL = float(os.getenv("VIEW_CACHE_HEAD_TTL", "1.0"))
+
+
+class _LoadCancelled(Exception):
+    """Set on a shared future when the caller running the load was cancelled; waiters retry"""
+
+
+class BlockViewCache:
+    """Read-through cache of contract view results, scoped to a block number
+
+    Entries are keyed by (function, arguments, block), so a new block makes older
+    entries unreachable; they are dropped as soon as the head moves. Concurrent
+    misses for the same key share one in-flight load, and the cache holds at most
+    ``max_entries`` results in LRU order.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = VIEW_CACHE_SIZE,
+        head_ttl: float = VIEW_CACHE_HEAD_TTL,
+        enabled: bool = VIEW_CACHE_ENABLED
+    ):
+        self.max_entries = max_entries
+        self.head_ttl = head_ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, Hashable, int], Any]" = OrderedDict()
+        self._inflight: Dict[Tuple[str, Hashable, int], asyncio.Future] = {}
+        self._head: Optional[int] = None
+        self._head_checked_at = 0.0
+        self._head_fetch: Optional[asyncio.Future] = None
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    async def head(self, fetch_head: Callable[[], Awaitable[int]]) -> int:
+        """Latest block number, re-read from the node at most once per ``head_ttl``"""
+        while True:
+            if self._head is not None and time.monotonic() - self._head_checked_at < self.head_ttl:
+                return self._head
+            if self._head_fetch is None:
+                break
+            try:
+                return await asyncio.shield(self._head_fetch)
+            except _LoadCancelled:
+                continue
+
+        future = self._head_fetch = asyncio.get_running_loop().create_future()
+        try:
+            block_number = await fetch_head()
+            self.observe_block(block_number)
+            future.set_result(block_number)
+            return block_number
+        except asyncio.CancelledError:
+            # Only this caller was cancelled; let the others fetch again
+            future.set_exception(_LoadCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()
+            raise
+        finally:
+            self._head_fetch = None
+
+    def observe_block(self, block_number: int):
+        """Record a new head (e.g. from the indexer) and drop entries for older blocks"""
+        self._head_checked_at = time.monotonic()
+        if self._head is not None and block_number <= self._head:
+            return
+        self._head = block_number
+        stale = [key for key in self._entries if key[2] < block_number]
+        for key in stale:
+            del self._entries[key]
+
+    def invalidate(self, function_names: Optional[Iterable[str]] = None):
+        """Forget cached results for the given functions, or everything including the head when None"""
+        names = set(function_names) if function_names is not None else None
+        stale = [key for key in self._entries if names is None or key[0] in names]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        self._head_checked_at = 0.0
+        if names is None:
+            # The head may move backwards after a reorg
+            self._head = None
+
+    async def get(self, function_name: str, args: Hashable, block: int, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Cached result of ``loader`` for this call at ``block``"""
+        if not self.enabled:
+            return await loader()
+
+        key = (function_name, args, block)
+        while True:
+            if key in self._entries:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return self._entries[key]
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(inflight)
+            except _LoadCancelled:
+                continue
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            # Only this caller was cancelled; let the others load again
+            future.set_exception(_LoadCancelled())
+            future.exception()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved when nobody else was waiting
+            future.exception()
+            raise
+        finally:
+            self._inflight.pop(key, None)
+
+        # Results for a block the head has already moved past are not worth keeping
+        if self._head is None or block >= self._head:
+            self._entries[key] = value
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        future.set_result(value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "enabled": self.enabled,
+            "head": self._head,
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+        }
@@ -0,0 +1,438 @@
+import os
+import json
+import time
+import uuid
+import random
+import sqlite3
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+from pydantic import BaseModel
+from metrics import queue_run_seconds, queue_wait_seconds
+
+logger = logging.getLogger(__name__)
+
+WORK_QUEUE_PATH = os.getenv("WORK_QUEUE_PATH", ".cache/work_queue.sqlite3")
+# Workers per queue; each worker runs one job at a time
+WORK_QUEUE_SEARCH_WORKERS = int(os.getenv("WORK_QUEUE_SEARCH_WORKERS", "2"))
+WORK_QUEUE_APPLY_WORKERS = int(os.getenv("WORK_QUEUE_APPLY_WORKERS", "4"))
+WORK_QUEUE_MAX_ATTEMPTS = int(os.getenv("WORK_QUEUE_MAX_ATTEMPTS", "3"))
+# Retry delay is backoff * 2^(attempt - 1) with +/-25% jitter, capped at the max
+WORK_QUEUE_BACKOFF_SECONDS = float(os.getenv("WORK_QUEUE_BACKOFF_SECONDS", "5"))
+WORK_QUEUE_BACKOFF_MAX_SECONDS = float(os.getenv("WORK_QUEUE_BACKOFF_MAX_SECONDS", "300"))
+# A claimed job whose worker stops heartbeating for this long is handed to another worker
+WORK_QUEUE_VISIBILITY_TIMEOUT = float(os.getenv("WORK_QUEUE_VISIBILITY_TIMEOUT", "300"))
+# Idle workers re-check the table this often, in case jobs were enqueued by another process
+WORK_QUEUE_POLL_SECONDS = float(os.getenv("WORK_QUEUE_POLL_SECONDS", "1.0"))
+# Succeeded jobs are kept this long for status lookups; dead jobs stay until retried
+WORK_QUEUE_RETENTION_SECONDS = float(os.getenv("WORK_QUEUE_RETENTION_SECONDS", str(24 * 3600)))
+# Recent jobs per queue used for the latency figures in stats()
+WORK_QUEUE_LATENCY_SAMPLES = int(os.getenv("WORK_QUEUE_LATENCY_SAMPLES", "500"))
+
+# Seconds between sweeps for succeeded jobs past their retention
+_PURGE_INTERVAL = 60
+
+JOB_STATES = ("queued", "running", "succeeded", "dead")
+
+Handler = Callable[[Dict[str, Any]], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class PermanentJobError(Exception):
+    """Raised by a handler when retrying cannot help; the job is dead-lettered at once"""
+
+
+class QueuedJob(BaseModel):
+    job_id: str
+    queue: str
+    payload: Dict[str, Any]
+    priority: int = 0
+    state: str = "queued"  # queued | running | succeeded | dead
+    attempts: int = 0
+    max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS
+    available_at: float
+    enqueued_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+
+
+_COLUMNS = (
+    "job_id, queue, payload, priority, state, attempts, max_attempts, available_at, "
+    "enqueued_at, started_at, finished_at, result, error"
+)
+
+
+def _row_to_job(row: Tuple) -> QueuedJob:
+    (job_id, queue, payload, priority, state, attempts, max_attempts, available_at,
+     enqueued_at, started_at, finished_at, result, error) = row
+    return QueuedJob(
+        job_id=job_id,
+        queue=queue,
+        payload=json.loads(payload),
+        priority=priority,
+        state=state,
+        attempts=attempts,
+        max_attempts=max_attempts,
+        available_at=available_at,
+        enqueued_at=enqueued_at,
+        started_at=started_at,
+        finished_at=finished_at,
+        result=json.loads(result) if result else None,
+        error=error
+    )
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))], 3)
+
+
+class WorkQueue:
+    """Durable SQLite-backed job queue with an asyncio worker pool per queue
+
+    Jobs survive restarts: a claimed job holds a lease that its worker keeps
+    extending, and a job whose lease runs out (the process died mid-run) becomes
+    claimable again. Higher ``priority`` runs first, then oldest. Failures are
+    retried with exponential backoff up to ``max_attempts``, after which the job
+    is dead-lettered and kept until retried by hand.
+    """
+
+    def __init__(
+        self,
+        path: str = WORK_QUEUE_PATH,
+        visibility_timeout: float = WORK_QUEUE_VISIBILITY_TIMEOUT,
+        max_attempts: int = WORK_QUEUE_MAX_ATTEMPTS,
+        backoff_seconds: float = WORK_QUEUE_BACKOFF_SECONDS,
+        backoff_max_seconds: float = WORK_QUEUE_BACKOFF_MAX_SECONDS,
+        poll_seconds: float = WORK_QUEUE_POLL_SECONDS,
+        retention_seconds: float = WORK_QUEUE_RETENTION_SECONDS
+    ):
+        self.path = path
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.poll_seconds = poll_seconds
+        self.retention_seconds = retention_seconds
+        self._handlers: Dict[str, Tuple[Handler, int]] = {}
+        self._workers: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._wait_samples: Dict[str, Deque[float]] = {}
+        self._run_samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self._purged_at = 0.0
+        self.retries = 0
+        self.dead_lettered = 0
+        self.lease_expiries = 0
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS work_queue (
+                job_id TEXT PRIMARY KEY,
+                queue TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                state TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                max_attempts INTEGER NOT NULL,
+                available_at REAL NOT NULL,
+                lease_expires_at REAL,
+                enqueued_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                result TEXT,
+                error TEXT
+            )
+        """)
+        # Claim order: highest priority, then earliest available
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS work_queue_ready ON work_queue (queue, state, priority DESC, available_at)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS work_queue_leases ON work_queue (state, lease_expires_at)"
+        )
+        self._conn.commit()
+
+    # Storage, all synchronous and called through asyncio.to_thread
+
+    def enqueue(
+        self,
+        queue: str,
+        payload: Dict[str, Any],
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+        delay: float = 0.0
+    ) -> QueuedJob:
+        """Persist a job; it runs once a worker for ``queue`` is free"""
+        now = time.time()
+        job = QueuedJob(
+            job_id=uuid.uuid4().hex,
+            queue=queue,
+            payload=payload,
+            priority=priority,
+            max_attempts=max_attempts or self.max_attempts,
+            available_at=now + delay,
+            enqueued_at=now
+        )
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO work_queue (job_id, queue, payload, priority, state, attempts, max_attempts, "
+                "available_at, enqueued_at) VALUES (?, ?, ?, ?, 'queued', 0, ?, ?, ?)",
+                (job.job_id, queue, json.dumps(payload), priority, job.max_attempts, job.available_at, now)
+            )
+            self._conn.commit()
+        self._wake(queue)
+        return job
+
+    def _wake(self, queue: str):
+        """Wake an idle worker for ``queue``; safe to call from any thread"""
+        wakeup = self._wakeups.get(queue)
+        if wakeup is not None and self._loop is not None:
+            self._loop.call_soon_threadsafe(wakeup.set)
+
+    def get(self, job_id: str) -> Optional[QueuedJob]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT {_COLUMNS} FROM work_queue WHERE job_id = ?", (job_id,)).fetchone()
+        return _row_to_job(row) if row else None
+
+    def claim(self, queue: str) -> Optional[QueuedJob]:
+        """Lease the next ready job on ``queue``, or None when nothing is ready"""
+        now = time.time()
+        with self._lock:
+            self._expire_leases(now)
+            row = self._conn.execute(
+                "UPDATE work_queue SET state = 'running', attempts = attempts + 1, started_at = ?, "
+                "lease_expires_at = ? WHERE job_id = ("
+                "  SELECT job_id FROM work_queue WHERE queue = ? AND state = 'queued' AND available_at <= ?"
+                "  ORDER BY priority DESC, available_at LIMIT 1"
+                f") RETURNING {_COLUMNS}",
+                (now, now + self.visibility_timeout, queue, now)
+            ).fetchone()
+            self._conn.commit()
+        return _row_to_job(row) if row else None
+
+    def _expire_leases(self, now: float):
+        """Hand back running jobs whose worker stopped heartbeating, dead-lettering exhausted ones"""
+        expired = self._conn.execute(
+            "UPDATE work_queue SET state = CASE WHEN attempts >= max_attempts THEN 'dead' ELSE 'queued' END, "
+            "available_at = ?, lease_expires_at = NULL, "
+            "finished_at = CASE WHEN attempts >= max_attempts THEN ? ELSE NULL END, "
+            "error = 'Visibility timeout expired' "
+            "WHERE state = 'running' AND lease_expires_at <= ? RETURNING job_id, state",
+            (now, now, now)
+        ).fetchall()
+        for job_id, state in expired:
+            self.lease_expiries += 1
+            self.dead_lettered += state == "dead"
+            logger.warning(f"Lease expired for queued job {job_id}; now {state}")
+
+    def heartbeat(self, job_id: str):
+        """Extend a running job's lease by another visibility timeout"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE work_queue SET lease_expires_at = ? WHERE job_id = ? AND state = 'running'",
+                (time.time() + self.visibility_timeout, job_id)
+            )
+            self._conn.commit()
+
+    def complete(self, job: QueuedJob, result: Optional[Dict[str, Any]]):
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE work_queue SET state = 'succeeded', finished_at = ?, lease_expires_at = NULL, "
+                "result = ?, error = NULL WHERE job_id = ?",
+                (now, json.dumps(result, default=str) if result is not None else None, job.job_id)
+            )
+            self._conn.commit()
+        self._record_latency(job, now, "succeeded")
+
+    def fail(self, job: QueuedJob, error: str, permanent: bool = False) -> str:
+        """Schedule a retry with backoff, or dead-letter the job; returns its new state"""
+        now = time.time()
+        if permanent or job.attempts >= job.max_attempts:
+            state, available_at, finished_at = "dead", now, now
+            self.dead_lettered += 1
+        else:
+            delay = min(self.backoff_seconds * 2 ** (job.attempts - 1), self.backoff_max_seconds)
+            state, available_at, finished_at = "queued", now + delay * random.uniform(0.75, 1.25), None
+            self.retries += 1
+        with self._lock:
+            self._conn.execute(
+                "UPDATE work_queue SET state = ?, available_at = ?, finished_at = ?, lease_expires_at = NULL, "
+                "error = ? WHERE job_id = ?",
+                (state, available_at, finished_at, error, job.job_id)
+            )
+            self._conn.commit()
+        if state == "dead":
+            self._record_latency(job, now, "dead")
+        return state
+
+    def release(self, job: QueuedJob):
+        """Return an interrupted job to the queue without counting the attempt"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE work_queue SET state = 'queued', attempts = MAX(attempts - 1, 0), available_at = ?, "
+                "lease_expires_at = NULL WHERE job_id = ? AND state = 'running'",
+                (time.time(), job.job_id)
+            )
+            self._conn.commit()
+
+    def retry_dead(self, job_id: str) -> bool:
+        """Move a dead-lettered job back onto its queue with a fresh attempt budget"""
+        with self._lock:
+            row = self._conn.execute(
+                "UPDATE work_queue SET state = 'queued', attempts = 0, available_at = ?, finished_at = NULL "
+                "WHERE job_id = ? AND state = 'dead' RETURNING queue",
+                (time.time(), job_id)
+            ).fetchone()
+            self._conn.commit()
+        if row:
+            self._wake(row[0])
+        return row is not None
+
+    def purge(self) -> int:
+        """Delete succeeded jobs older than the retention period"""
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM work_queue WHERE state = 'succeeded' AND finished_at < ?",
+                (time.time() - self.retention_seconds,)
+            )
+            self._conn.commit()
+        return cursor.rowcount
+
+    def list_jobs(self, queue: Optional[str] = None, state: Optional[str] = None, limit: int = 50) -> List[QueuedJob]:
+        clauses, params = [], []
+        if queue:
+            clauses.append("queue = ?")
+            params.append(queue)
+        if state:
+            clauses.append("state = ?")
+            params.append(state)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM work_queue {where} ORDER BY enqueued_at DESC LIMIT ?",
+                (*params, limit)
+            ).fetchall()
+        return [_row_to_job(row) for row in rows]
+
+    def _record_latency(self, job: QueuedJob, finished_at: float, outcome: str):
+        waits = self._wait_samples.setdefault(job.queue, deque(maxlen=WORK_QUEUE_LATENCY_SAMPLES))
+        runs = self._run_samples.setdefault(job.queue, deque(maxlen=WORK_QUEUE_LATENCY_SAMPLES))
+        waits.append((job.started_at or finished_at) - job.enqueued_at)
+        runs.append(finished_at - (job.started_at or finished_at))
+        queue_wait_seconds.observe(waits[-1], job.queue)
+        queue_run_seconds.observe(runs[-1], job.queue, outcome)
+
+    # Worker pool
+
+    def register(self, queue: str, handler: Handler, workers: int = 1):
+        """Run ``handler(payload)`` for jobs on ``queue`` with this many workers once started"""
+        self._handlers[queue] = (handler, max(1, workers))
+
+    def start(self):
+        """Start the worker pool on the running event loop"""
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        for queue, (handler, workers) in self._handlers.items():
+            self._wakeups[queue] = asyncio.Event()
+            for index in range(workers):
+                self._workers.append(asyncio.create_task(self._worker(queue, handler, index)))
+        logger.info(f"Work queue started: {', '.join(f'{q}={w}' for q, (_, w) in self._handlers.items())} workers")
+
+    async def stop(self):
+        """Stop the workers; jobs they were running go back on the queue"""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        self._wakeups.clear()
+
+    async def _worker(self, queue: str, handler: Handler, index: int):
+        while True:
+            job = await asyncio.to_thread(self.claim, queue)
+            if job is None:
+                wakeup = self._wakeups[queue]
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=self.poll_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                wakeup.clear()
+                if index == 0 and time.monotonic() - self._purged_at > _PURGE_INTERVAL:
+                    self._purged_at = time.monotonic()
+                    await asyncio.to_thread(self.purge)
+                continue
+            await self._run(job, handler)
+
+    async def _run(self, job: QueuedJob, handler: Handler):
+        heartbeat = asyncio.create_task(self._heartbeat(job.job_id))
+        try:
+            result = await handler(job.payload)
+        except asyncio.CancelledError:
+            await asyncio.shield(asyncio.to_thread(self.release, job))
+            raise
+        except PermanentJobError as e:
+            await asyncio.to_thread(self.fail, job, str(e), True)
+            logger.error(f"{job.queue} job {job.job_id} dead-lettered: {e}")
+        except Exception as e:
+            state = await asyncio.to_thread(self.fail, job, str(e))
+            logger.warning(f"{job.queue} job {job.job_id} attempt {job.attempts}/{job.max_attempts} failed ({state}): {e}")
+        else:
+            await asyncio.to_thread(self.complete, job, result)
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            await asyncio.to_thread(self.heartbeat, job_id)
+
+    def stats(self) -> Dict[str, Any]:
+        """Depth, state counts and wait/run latency for every queue"""
+        now = time.time()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT queue, state, COUNT(*), SUM(state = 'queued' AND available_at <= ?), "
+                "MIN(CASE WHEN state = 'queued' THEN enqueued_at END) FROM work_queue GROUP BY queue, state",
+                (now,)
+            ).fetchall()
+        queues: Dict[str, Dict[str, Any]] = {}
+        for queue in set(self._handlers) | {row[0] for row in rows}:
+            waits = list(self._wait_samples.get(queue, ()))
+            runs = list(self._run_samples.get(queue, ()))
+            queues[queue] = {
+                **{state: 0 for state in JOB_STATES},
+                "ready": 0,
+                "oldest_queued_seconds": None,
+                "workers": self._handlers.get(queue, (None, 0))[1],
+                "wait_p50_seconds": _percentile(waits, 0.5),
+                "wait_p95_seconds": _percentile(waits, 0.95),
+                "run_p50_seconds": _percentile(runs, 0.5),
+                "run_p95_seconds": _percentile(runs, 0.95),
+            }
+        for queue, state, count, ready, oldest in rows:
+            queues[queue][state] = count
+            if state == "queued":
+                queues[queue]["ready"] = ready or 0
+                queues[queue]["oldest_queued_seconds"] = round(now - oldest, 3) if oldest else None
+        return {
+            "queues": queues,
+            "retries": self.retries,
+            "dead_lettered": self.dead_lettered,
+            "lease_expiries": self.lease_expiries,
+            "running_workers": len(self._workers),
+        }
+
+
+# Global queue for background search and apply work
+work_queue = WorkQueue()